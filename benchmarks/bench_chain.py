@@ -0,0 +1,52 @@
+"""Per-call overhead of chainable methods on Transform and Path
+
+Run with: python -m benchmarks.bench_chain
+
+"direct" calls the command function and the updater without going
+through the descriptor, so the difference is what chaining costs per call.
+"""
+from timeit import Timer
+
+from benchmarks.common import report
+from delicacy.svglib.elements.peripheral.transform import Transform
+from delicacy.svglib.elements.shapes import Path
+
+# calls per fresh object, few enough that Transform's storage stays short
+CALLS = 20
+ROUNDS = 2000
+
+CASES = (
+    ("transform.translate", Transform, "translate", (1, 2)),
+    ("transform.scale", Transform, "scale", (0.5,)),
+    ("path.l", Path, "l", (1, 2)),
+)
+
+
+def per_call(stmt: str, namespace: dict) -> float:
+    """best time per call in nanoseconds, on a fresh object each round"""
+
+    timer = Timer(stmt, "obj = cls()", globals=namespace)
+    return min(timer.repeat(repeat=ROUNDS, number=CALLS)) / CALLS * 1e9
+
+
+def main() -> None:
+    rows = []
+    for name, cls, method, args in CASES:
+        chained = cls.__dict__[method]
+        namespace = dict(
+            cls=cls,
+            args=args,
+            target=chained.target,
+            update=chained.managed_updater.target,
+        )
+
+        chained_ns = per_call(f"obj.{method}(*args)", namespace)
+        direct_ns = per_call("update(obj, target(obj, *args))", namespace)
+        rows.append((name, chained_ns, direct_ns, chained_ns - direct_ns))
+
+    header = ("method", "chained ns", "direct ns", "overhead ns")
+    report("chainable per-call overhead", rows, header)
+
+
+if __name__ == "__main__":
+    main()
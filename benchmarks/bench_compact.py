@@ -0,0 +1,57 @@
+"""Bytes and parse time saved by compact serialization, per maker
+
+Run with: python -m benchmarks.bench_compact
+"""
+from lxml.etree import fromstring
+from lxml.etree import tostring
+
+from benchmarks.common import best_of
+from benchmarks.common import make_canvases
+from benchmarks.common import PHRASES
+from benchmarks.common import report
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.compact import compact
+from delicacy.svglib.utils.compact import Compaction
+from delicacy.svglib.utils.utils import materialize
+
+BACKGROUND = "#09132b"
+OPTIONS = Compaction()
+
+
+def main() -> None:
+    sizes, timings = [], []
+    for name, maker in MakerDict.items():
+        canvases = make_canvases(maker)
+        plain = [tostring(c) for c in canvases]
+        compacted = [compact(c, OPTIONS) for c in canvases]
+
+        plain_bytes = sum(map(len, plain)) // len(plain)
+        compact_bytes = sum(map(len, compacted)) // len(compacted)
+        saved = 1 - compact_bytes / plain_bytes
+        sizes.append((name, plain_bytes, compact_bytes, saved))
+
+        parse_plain = best_of(lambda: [fromstring(svg) for svg in plain])
+        parse_compact = best_of(lambda: [fromstring(svg) for svg in compacted])
+        raster_plain = best_of(lambda: [materialize(c, BACKGROUND) for c in canvases])
+        raster_compact = best_of(
+            lambda: [materialize(c, BACKGROUND, compaction=OPTIONS) for c in canvases]
+        )
+        timings.append(
+            (
+                name,
+                parse_plain * 1000,
+                parse_compact * 1000,
+                raster_plain * 1000,
+                raster_compact * 1000,
+            )
+        )
+
+    header = ("maker", "plain bytes", "compact bytes", "saved")
+    report("average document size", sizes, header)
+
+    header = ("maker", "parse ms", "parse ms (c)", "raster ms", "raster ms (c)")
+    report(f"time for {len(PHRASES)} canvases", timings, header)
+
+
+if __name__ == "__main__":
+    main()
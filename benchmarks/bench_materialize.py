@@ -0,0 +1,31 @@
+"""Throughput of materialize_many against a materialize loop, per maker
+
+Run with: python -m benchmarks.bench_materialize
+"""
+from benchmarks.common import best_of
+from benchmarks.common import make_canvases
+from benchmarks.common import report
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import materialize_many
+
+BACKGROUND = "#09132b"
+
+
+def main() -> None:
+    rows = []
+    for name, maker in MakerDict.items():
+        canvases = make_canvases(maker)
+        n = len(canvases)
+
+        loop = best_of(lambda: [materialize(c, BACKGROUND) for c in canvases])
+        batch = best_of(lambda: materialize_many(canvases, BACKGROUND))
+
+        rows.append((name, n / loop, n / batch, loop / batch))
+
+    header = ("maker", "loop img/s", "batch img/s", "speedup")
+    report("materialize vs materialize_many", rows, header)
+
+
+if __name__ == "__main__":
+    main()
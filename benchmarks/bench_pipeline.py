@@ -0,0 +1,77 @@
+"""Per-stage breakdown of /make before and after the raw-pixel pipeline
+
+The former pipeline decoded the background from a PNG blob, pasted into
+a copy of it and encoded again in the endpoint; create_png composites
+raw pixels into a reused frame and encodes once.
+
+Run with: python -m benchmarks.bench_pipeline
+"""
+from io import BytesIO
+
+from PIL import Image as PILImage
+
+from benchmarks.common import report
+from delicacy.config import COLLECTION_DIR
+from delicacy.create import create_png
+from delicacy.create import make_background
+from delicacy.igen.collection import Collection
+from delicacy.igen.igen import ImageGenerator
+from delicacy.saturn.saturn import MakerDict
+from delicacy.timing import Timings
+
+PHRASES = tuple(f"phrase-{i}" for i in range(16))
+SIZE = 320
+BACKGROUND = "#09132b"
+
+
+def former(phrase, maker, gen, timings: Timings) -> bytes:
+    with timings.stage("character"):
+        character = gen.generate(phrase, size=(SIZE, SIZE))
+
+    background = make_background(phrase, maker, SIZE, SIZE, BACKGROUND, timings=timings)
+
+    with background, timings.stage("decode"):
+        img = PILImage.open(BytesIO(background.make_blob("png")))
+        img.load()
+
+    with timings.stage("composite"):
+        img.paste(character, (0, 0), character)
+
+    with timings.stage("encode"), BytesIO() as buffer:
+        img.save(buffer, "png")
+        return buffer.getvalue()
+
+
+def current(phrase, maker, gen, timings: Timings) -> bytes:
+    return create_png(phrase, maker, gen, SIZE, SIZE, BACKGROUND, timings=timings)
+
+
+def main() -> None:
+    gen = ImageGenerator(Collection("Cat", COLLECTION_DIR / "cat"))
+    maker = MakerDict["dione"]
+
+    results = {}
+    for name, pipeline in (("former", former), ("current", current)):
+        timings = Timings()
+        for phrase in PHRASES:
+            pipeline(phrase, maker, gen, timings)
+        results[name] = timings.stages
+
+    stages = dict.fromkeys(k for stages in results.values() for k in stages)
+    rows = [
+        (
+            stage,
+            results["former"].get(stage, 0) * 1000 / len(PHRASES),
+            results["current"].get(stage, 0) * 1000 / len(PHRASES),
+        )
+        for stage in stages
+    ]
+    rows.append(
+        ("total", *(sum(r.values()) * 1000 / len(PHRASES) for r in results.values()))
+    )
+
+    report("/make stages, ms per request", rows, ("stage", "former", "current"))
+
+
+if __name__ == "__main__":
+    main()
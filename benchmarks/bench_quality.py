@@ -0,0 +1,59 @@
+"""Latency and image difference of each quality tier, per maker
+
+The difference is the mean absolute per-channel error (0-255) against a
+reference rendered with 4x supersampling and a lanczos filter, so lower
+is closer to an ideal render. Draft trades visible aliasing on thin
+strokes for the cheapest read; high pays for rasterizing four times the
+pixels and a resize, which matters most for the path-heavy makers.
+
+Run with: python -m benchmarks.bench_quality, on a host with ImageMagick;
+the numbers depend on its build and SVG reader, which the title names.
+"""
+from PIL import ImageChops
+from PIL import ImageStat
+
+from benchmarks.common import best_of
+from benchmarks.common import report
+from delicacy.raster.delegates import select_delegate
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.quality import QUALITIES
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import svg_format
+from delicacy.svglib.utils.utils import wand2pil
+
+SIZE = 320
+BACKGROUND = "#09132b"
+REFERENCE = Quality("reference", supersample=4, filter="lanczos")
+
+
+def render(canvas, quality: Quality):
+    with materialize(canvas, BACKGROUND, quality=quality) as wand_img:
+        return wand2pil(wand_img).convert("RGB")
+
+
+def mean_diff(image, reference) -> float:
+    diff = ImageChops.difference(image, reference)
+    return sum(ImageStat.Stat(diff).mean) / 3
+
+
+def main() -> None:
+    # read with the delegate the server would pick
+    select_delegate()
+    rows = []
+    for name, maker in MakerDict.items():
+        canvas = BackgroundMaker(maker, seed=0).make(SIZE, SIZE)
+        reference = render(canvas, REFERENCE)
+
+        for quality in QUALITIES.values():
+            seconds = best_of(lambda: render(canvas, quality))
+            diff = mean_diff(render(canvas, quality), reference)
+            rows.append((name, quality.name, seconds * 1000, diff))
+
+    header = ("maker", "tier", "ms", "mean diff")
+    report(f"quality tiers at {SIZE}x{SIZE}, read as {svg_format()}", rows, header)
+
+
+if __name__ == "__main__":
+    main()
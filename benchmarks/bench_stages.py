@@ -0,0 +1,62 @@
+"""End-to-end create() latency with the character and background stages
+run one after the other and concurrently
+
+Run with: python -m benchmarks.bench_stages
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import best_of
+from benchmarks.common import report
+from delicacy.config import COLLECTION_DIR
+from delicacy.create import create
+from delicacy.create import InlineExecutor
+from delicacy.create import make_background
+from delicacy.igen.collection import Collection
+from delicacy.igen.igen import ImageGenerator
+from delicacy.saturn.saturn import MakerDict
+
+SIZE = 320
+BACKGROUND = "#09132b"
+
+
+def main() -> None:
+    gen = ImageGenerator(Collection("Cat", COLLECTION_DIR / "cat"))
+
+    rows = []
+    with ThreadPoolExecutor(1) as threads:
+        for name, maker in MakerDict.items():
+            character = best_of(lambda: gen.generate("phrase", size=(SIZE, SIZE)))
+            background = best_of(
+                lambda: make_background("phrase", maker, SIZE, SIZE, BACKGROUND).close()
+            )
+
+            def run(executor):
+                return create(
+                    "phrase", maker, gen, SIZE, SIZE, BACKGROUND, executor=executor
+                )
+
+            sequential = best_of(lambda: run(InlineExecutor()))
+            concurrent = best_of(lambda: run(threads))
+
+            rows.append(
+                (
+                    name,
+                    character * 1000,
+                    background * 1000,
+                    sequential * 1000,
+                    concurrent * 1000,
+                )
+            )
+
+    header = (
+        "maker",
+        "character ms",
+        "background ms",
+        "sequential ms",
+        "concurrent ms",
+    )
+    report(f"create() at {SIZE}x{SIZE}", rows, header)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Time saved per request by wand2pil's raw handoff over a PNG round trip
+
+Run with: python -m benchmarks.bench_wand2pil
+"""
+from io import BytesIO
+
+from PIL import Image as PILImage
+
+from benchmarks.common import best_of
+from benchmarks.common import report
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import wand2pil
+
+SIZES = (128, 320, 512, 1024)
+BACKGROUND = "#09132b"
+
+
+def png_roundtrip(wand_img) -> PILImage.Image:
+    # the former wand2pil; load() forces the lazy PNG decode
+    img = PILImage.open(BytesIO(wand_img.make_blob("png")))
+    img.load()
+    return img
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        canvas = BackgroundMaker(MakerDict["dione"], seed=0).make(size, size)
+
+        with materialize(canvas, BACKGROUND) as wand_img:
+            png = best_of(lambda: png_roundtrip(wand_img), repeat=10)
+            raw = best_of(lambda: wand2pil(wand_img).load(), repeat=10)
+
+        rows.append((f"{size}x{size}", png * 1000, raw * 1000, (png - raw) * 1000))
+
+    header = ("size", "png ms", "raw ms", "saved ms")
+    report("wand2pil: PNG round trip vs raw pixels", rows, header)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Canvas build plus serialize time: lxml against SVGWriter, end to end
+
+For every maker with a writer-backed emit path, the lxml side runs the
+maker and serializes its canvas, the writer side runs the emit path into
+an SVGWriter and reads its bytes. Both draw from the same seed and
+produce identical output.
+
+Run with: python -m benchmarks.bench_writer
+"""
+from random import Random
+
+from lxml.etree import tostring
+
+from benchmarks.common import best_of
+from benchmarks.common import report
+from delicacy.saturn.saturn import EMITTERS
+from delicacy.svglib.colors.palette import PaletteGenerator
+from delicacy.svglib.colors.palette import tint
+from delicacy.svglib.writer import SVGWriter
+
+SIZE = 512
+
+
+def main() -> None:
+    colors = PaletteGenerator(tint, 0).generate(4, to_hex=True)
+    rows = []
+
+    for maker, emit in EMITTERS.items():
+
+        def lxml() -> bytes:
+            return tostring(maker(SIZE, SIZE, colors, Random(0)))
+
+        def writer() -> bytes:
+            svg = SVGWriter(SIZE, SIZE)
+            emit(svg, SIZE, SIZE, colors, Random(0))
+            return svg.getvalue()
+
+        name = maker.__name__.lower()
+        assert lxml() == writer(), name
+
+        lxml_time, writer_time = best_of(lxml), best_of(writer)
+        rows.append(
+            (name, lxml_time * 1000, writer_time * 1000, lxml_time / writer_time)
+        )
+
+    header = ("maker", "lxml ms", "writer ms", "speedup")
+    report("build + serialize per canvas", rows, header)
+
+
+if __name__ == "__main__":
+    main()
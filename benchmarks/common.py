@@ -0,0 +1,39 @@
+from collections.abc import Callable
+from time import perf_counter
+
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import Canvas
+from delicacy.saturn.saturn import MakerFunc
+
+PHRASES = tuple(f"phrase-{i}" for i in range(16))
+
+
+def make_canvases(
+    maker: MakerFunc, phrases=PHRASES, width: float = 320, height: float = 320
+) -> list[Canvas]:
+    return [
+        BackgroundMaker.from_phrase(phrase, maker).make(width, height)
+        for phrase in phrases
+    ]
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """best wall-clock time of func over a number of runs, in seconds"""
+
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def report(title: str, rows: list[tuple], header: tuple[str, ...]) -> None:
+    print(f"\n{title}")
+    print(" | ".join(f"{h:>14}" for h in header))
+    for row in rows:
+        print(
+            " | ".join(
+                f"{c:>14.4f}" if isinstance(c, float) else f"{c:>14}" for c in row
+            )
+        )
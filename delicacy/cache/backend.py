@@ -0,0 +1,59 @@
+"""
+Cache backends shared by the nodes serving /make.
+
+A backend maps string keys to bytes. Lookups that fail for any reason
+(unreachable, slow, refused by a circuit breaker) read as misses, so the
+caller renders instead. backend_from_url picks the backend for a URL
+such as config.CACHE_URL.
+"""
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Sequence
+from urllib.parse import urlsplit
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        """store value, expiring after ttl seconds if given"""
+
+    async def close(self) -> None:
+        pass
+
+
+class NullBackend(CacheBackend):
+    """A backend that stores nothing, used when no shared cache is set up"""
+
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        return [None] * len(keys)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        pass
+
+
+def backend_from_url(url: str) -> CacheBackend:
+    """the backend for url, NullBackend when url is empty"""
+
+    scheme = urlsplit(url).scheme
+
+    match scheme:
+        case "" if not url:
+            return NullBackend()
+        case "redis":
+            # imported here, delicacy.cache.redis depends on this module
+            from delicacy.cache.redis import RedisBackend
+
+            return RedisBackend.from_url(url)
+
+    raise ValueError(f"unsupported cache backend: {scheme}")
@@ -0,0 +1,83 @@
+"""
+A circuit breaker for calls to a dependency that may be slow or down.
+
+After a number of consecutive failures the breaker opens and refuses
+calls, so callers fall back (e.g. to rendering) at once instead of
+waiting for timeouts. Once reset_after seconds have passed, a single
+trial call is let through: success closes the breaker, failure opens it
+again for another reset_after seconds.
+"""
+from collections.abc import Callable
+from time import monotonic
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitBreaker:
+    """Guard calls to a dependency
+
+    breaker = CircuitBreaker(threshold=5, reset_after=30)
+    if breaker.allow():
+        try:
+            call()
+        except OSError:
+            breaker.failure()
+        except BaseException:
+            breaker.abandon()
+            raise
+        else:
+            breaker.success()
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_after: float = 30,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self.clock() - self._opened_at < self.reset_after:
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self) -> bool:
+        match self.state:
+            case "closed":
+                return True
+            case "half-open" if not self._trial:
+                self._trial = True
+                return True
+
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def abandon(self) -> None:
+        """the call was given up before its outcome was known (e.g. it was
+        cancelled), so it counts neither way; a half-open breaker lets
+        another trial through
+        """
+        self._trial = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        self._trial = False
+
+        if self._opened_at is not None or self.failures >= self.threshold:
+            self._opened_at = self.clock()
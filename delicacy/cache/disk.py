@@ -0,0 +1,198 @@
+"""
+A content-addressed on-disk cache shared by the processes of a host.
+
+Each key is hashed to a file under two levels of shard directories.
+Writes go to a temporary file in the target directory and are renamed
+into place, so readers (in this or any other process) only ever see
+complete files. A file's modification time is its last use: hits touch
+it, and eviction removes the least recently used files once the store
+exceeds its byte budget. Only one process evicts at a time, guarded by
+a lock file; a file evicted by another process is simply a miss.
+"""
+import fcntl
+import logging
+import os
+import threading
+from collections.abc import Hashable
+from collections.abc import Iterator
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+
+from delicacy.cache.lru import hits_total
+from delicacy.cache.lru import misses_total
+from delicacy.cache.lru import weight
+from delicacy.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+# layout of the store, bump when paths or file contents change meaning
+STORE_VERSION = 1
+
+# eviction brings the store down to this fraction of its budget,
+# so it does not run again after every write
+LOW_WATER = 0.9
+
+# temporary files older than this, in seconds, belong to a dead writer
+STALE_TEMP = 3600
+
+TEMP_PREFIX = ".tmp-"
+
+evictions_total = Counter(
+    "delicacy_disk_cache_evictions_total", "files evicted from a disk cache", "cache"
+)
+
+
+def digest(key: tuple[Hashable, ...]) -> str:
+    """a stable hex digest of key, the same in every process"""
+    return sha256("\x1f".join(map(repr, key)).encode("utf8")).hexdigest()
+
+
+class DiskCache:
+    """A byte-bounded file store, keyed by tuples of plain values
+
+    cache = DiskCache(Path("/var/cache/delicacy"), 2**30)
+    if (path := cache.get(key)) is None:
+        path = cache.put(key, render())
+    """
+
+    def __init__(
+        self, root: Path, capacity: int, name: str = "disk", suffix: str = ""
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.root = Path(root) / f"v{STORE_VERSION}"
+        self.capacity = capacity
+        self.name = name
+        self.suffix = suffix
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def path(self, key: tuple[Hashable, ...]) -> Path:
+        name = digest(key)
+        return self.root / name[:2] / name[2:4] / f"{name}{self.suffix}"
+
+    def get(self, key: tuple[Hashable, ...]) -> Path | None:
+        """the file holding key's value, marked as just used"""
+
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            misses_total.inc(self.name)
+            return None
+
+        hits_total.inc(self.name)
+        return path
+
+    def put(self, key: tuple[Hashable, ...], data: bytes) -> Path:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(
+            dir=path.parent, prefix=TEMP_PREFIX, delete=False
+        ) as tmp:
+            try:
+                tmp.write(data)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+
+        os.replace(tmp.name, path)
+        return path
+
+    def _files(self) -> Iterator[os.DirEntry]:
+        for outer in os.scandir(self.root):
+            if not outer.is_dir():
+                continue
+            for inner in os.scandir(outer.path):
+                if inner.is_dir():
+                    yield from os.scandir(inner.path)
+
+    def evict(self) -> int:
+        """remove least recently used files until the store fits its budget,
+        return the number of bytes freed
+        """
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        with open(self.root / ".lock", "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0  # another process is evicting
+
+            try:
+                return self._evict()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _evict(self) -> int:
+        now = time()
+        files = []
+        freed = 0
+
+        for entry in self._files():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if entry.name.startswith(TEMP_PREFIX):
+                if now - stat.st_mtime > STALE_TEMP:
+                    freed += _unlink(entry.path, stat.st_size)
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        target = self.capacity * LOW_WATER if total > self.capacity else total
+
+        files.sort()
+        for _, size, path in files:
+            if total <= target:
+                break
+            removed = _unlink(path, size)
+            total -= size
+            freed += removed
+            if removed:
+                evictions_total.inc(self.name)
+
+        weight.set(total, self.name)
+        return freed
+
+    def start_eviction(self, interval: float) -> None:
+        """evict every interval seconds in a daemon thread"""
+
+        if self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.evict()
+                except Exception:
+                    logger.exception("disk cache eviction failed")
+
+        self._thread = threading.Thread(target=run, name=f"{self.name}-evict")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop_eviction(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._stop.clear()
+
+
+def _unlink(path: str, size: int) -> int:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return 0  # evicted by another process
+    return size
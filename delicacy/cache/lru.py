@@ -0,0 +1,127 @@
+"""
+A thread-safe least-recently-used cache bounded by a weight budget.
+
+Entries are weighed (by default each weighs 1, usually their size in
+bytes is used) and the least recently used ones are evicted once the
+total exceeds the capacity. Every cache has a name under which its
+hits, misses, hit ratio, evictions and current weight are exported on
+/metrics.
+"""
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from threading import Lock
+from typing import Generic
+from typing import TypeVar
+
+from delicacy.metrics import Counter
+from delicacy.metrics import Gauge
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+hits_total = Counter("delicacy_cache_hits_total", "lookups answered", "cache")
+misses_total = Counter("delicacy_cache_misses_total", "lookups not answered", "cache")
+evictions_total = Counter(
+    "delicacy_cache_evictions_total", "entries evicted to stay in budget", "cache"
+)
+weight = Gauge("delicacy_cache_weight", "total weight of cached entries", "cache")
+hit_ratio = Gauge("delicacy_cache_hit_ratio", "hits over lookups", "cache")
+
+_MISSING = object()
+
+
+def _unit(value: object) -> int:
+    return 1
+
+
+class LRUCache(Generic[K, V]):
+    """A named cache holding at most capacity worth of entries
+
+    cache = LRUCache("thumbnails", 64 * 2**20, weigh=len)
+    data = cache.get_or_create(key, lambda: render(key))
+    """
+
+    def __init__(
+        self, name: str, capacity: int, weigh: Callable[[V], int] = _unit
+    ) -> None:
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+
+        self.name = name
+        self.capacity = capacity
+        self.weigh = weigh
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                misses_total.inc(self.name)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hits_total.inc(self.name)
+
+            hit_ratio.set(self.hit_ratio, self.name)
+            return default if entry is None else entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """cache value, unless it alone weighs more than the capacity"""
+
+        cost = self.weigh(value)
+        if cost > self.capacity:
+            return
+
+        with self._lock:
+            if (old := self._entries.pop(key, None)) is not None:
+                self.weight -= old[1]
+
+            self._entries[key] = value, cost
+            self.weight += cost
+
+            while self.weight > self.capacity:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.weight -= evicted
+                evictions_total.inc(self.name)
+
+            weight.set(self.weight, self.name)
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """the cached value for key, calling factory and caching on a miss
+
+        factory runs outside the lock, so concurrent misses on the same
+        key may each call it; the last result is kept.
+        """
+
+        value = self.get(key, _MISSING)  # type: ignore
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value  # type: ignore
+
+    def clear(self) -> None:
+        """drop every entry and reset hits and misses"""
+
+        with self._lock:
+            self._entries.clear()
+            self.weight = self.hits = self.misses = 0
+            weight.set(0, self.name)
+            hit_ratio.set(0, self.name)
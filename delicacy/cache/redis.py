@@ -0,0 +1,218 @@
+"""
+A cache backend speaking the Redis protocol, with pooled connections.
+
+Every call runs under a deadline (config.CACHE_TIMEOUT); a call that
+times out or fails on the connection counts against a circuit breaker,
+and while the breaker is open calls are skipped entirely, so a slow or
+unreachable server costs at most one timeout per reset period instead
+of one per request.
+"""
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from delicacy import config
+from delicacy.cache.backend import CacheBackend
+from delicacy.cache.breaker import CircuitBreaker
+from delicacy.cache.lru import hits_total
+from delicacy.cache.lru import misses_total
+from delicacy.cache.resp import encode_command
+from delicacy.cache.resp import read_reply
+from delicacy.cache.resp import Reply
+from delicacy.cache.resp import RESPError
+from delicacy.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 6379
+
+failures_total = Counter(
+    "delicacy_cache_backend_failures_total",
+    "shared cache calls that failed or timed out",
+    "reason",
+)
+skipped_total = Counter(
+    "delicacy_cache_backend_skipped_total",
+    "shared cache calls skipped while the circuit breaker was open",
+    "cache",
+)
+
+
+class Connection:
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int, db: int = 0) -> "Connection":
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = cls(reader, writer)
+
+        if db:
+            (reply,) = await connection.call(("SELECT", db))
+            if isinstance(reply, RESPError):
+                connection.close()
+                raise reply
+
+        return connection
+
+    async def call(self, *commands: Sequence[bytes | str | int | float]) -> list:
+        """send commands in one write and read their replies in order"""
+
+        self.writer.write(b"".join(encode_command(*command) for command in commands))
+        await self.writer.drain()
+        return [await read_reply(self.reader) for _ in commands]
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """At most size connections, reused most recently released first"""
+
+    def __init__(self, host: str, port: int, db: int = 0, size: int = 8) -> None:
+        if size <= 0:
+            raise ValueError("pool size must be positive")
+
+        self.host = host
+        self.port = port
+        self.db = db
+        self.size = size
+        self._idle: deque[Connection] = deque()
+        self._slots = asyncio.Semaphore(size)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Connection]:
+        async with self._slots:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = await Connection.open(self.host, self.port, self.db)
+
+            try:
+                yield connection
+            except BaseException:
+                # a reply may still be on its way, the connection is unusable
+                connection.close()
+                raise
+
+            self._idle.append(connection)
+
+    async def close(self) -> None:
+        while self._idle:
+            connection = self._idle.pop()
+            connection.close()
+            await connection.writer.wait_closed()
+
+
+class RedisBackend(CacheBackend):
+    """A shared cache on a Redis server
+
+    backend = RedisBackend.from_url("redis://cache:6379/0")
+    await backend.set("key", b"value", ttl=3600)
+    value = await backend.get("key")
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        timeout: float = 0.05,
+        breaker: CircuitBreaker | None = None,
+        prefix: str = "delicacy:",
+        name: str = "shared",
+    ) -> None:
+        self.pool = pool
+        self.timeout = timeout
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.prefix = prefix
+        self.name = name
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        parts = urlsplit(url)
+        db = int(parts.path.lstrip("/") or 0)
+        pool = ConnectionPool(
+            parts.hostname or "localhost",
+            parts.port or DEFAULT_PORT,
+            db,
+            config.CACHE_POOL_SIZE,
+        )
+        breaker = CircuitBreaker(
+            config.CACHE_BREAKER_FAILURES, config.CACHE_BREAKER_RESET
+        )
+        return cls(pool, config.CACHE_TIMEOUT, breaker)
+
+    async def _call(self, *commands: Sequence) -> list[Reply] | None:
+        """replies to commands, or None if the server could not be used"""
+
+        if not self.breaker.allow():
+            skipped_total.inc(self.name)
+            return None
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.pool.connection() as connection:
+                    replies = await connection.call(*commands)
+        except (OSError, EOFError, RESPError, asyncio.TimeoutError) as err:
+            failures_total.inc(type(err).__name__)
+            self.breaker.failure()
+            logger.debug("shared cache call failed: %r", err)
+            return None
+        except Exception as err:
+            # unexpected, e.g. asyncio.LimitOverrunError on an oversized reply
+            failures_total.inc(type(err).__name__)
+            self.breaker.failure()
+            raise
+        except BaseException:
+            # cancelled, which says nothing about the server
+            self.breaker.abandon()
+            raise
+
+        self.breaker.success()
+        return replies
+
+    def _value(self, reply: Reply) -> bytes | None:
+        if isinstance(reply, bytes):
+            hits_total.inc(self.name)
+            return reply
+
+        misses_total.inc(self.name)
+        return None
+
+    async def get(self, key: str) -> bytes | None:
+        (value,) = await self.get_many([key])
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """look keys up in one pipelined round trip"""
+
+        if not keys:
+            return []
+
+        replies = await self._call(*(("GET", self.prefix + key) for key in keys))
+        if replies is None:
+            misses_total.inc(self.name, len(keys))
+            return [None] * len(keys)
+
+        return [self._value(reply) for reply in replies]
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        command: tuple = ("SET", self.prefix + key, value)
+        if ttl is not None:
+            command += ("PX", max(1, round(ttl * 1000)))
+
+        replies = await self._call(command)
+        # the server answered, but refused the value (e.g. out of memory)
+        if replies is not None and isinstance(error := replies[0], RESPError):
+            failures_total.inc(type(error).__name__)
+            self.breaker.failure()
+            logger.debug("shared cache set failed: %r", error)
+
+    async def close(self) -> None:
+        await self.pool.close()
@@ -0,0 +1,77 @@
+"""
+The Redis serialization protocol (RESP2), as much as the cache uses.
+
+Commands are arrays of bulk strings. Replies are read one at a time, so
+several commands can be written at once and their replies read back in
+order (pipelining). Error replies are returned as RESPError values
+rather than raised, so one failing command does not desynchronize the
+replies that follow it.
+"""
+import asyncio
+from typing import TypeAlias
+
+CRLF = b"\r\n"
+
+Reply: TypeAlias = "bytes | str | int | None | RESPError | list[Reply]"
+
+
+class RESPError(Exception):
+    """an error reply"""
+
+
+class ProtocolError(ConnectionError):
+    """the peer sent something that is not RESP, the connection is unusable"""
+
+
+def _bulk(arg: bytes | str | int | float) -> bytes:
+    data = arg if isinstance(arg, bytes) else str(arg).encode("utf8")
+    return b"$%d\r\n%b\r\n" % (len(data), data)
+
+
+def encode_command(*args: bytes | str | int | float) -> bytes:
+    return b"*%d\r\n" % len(args) + b"".join(map(_bulk, args))
+
+
+def encode_reply(reply: Reply) -> bytes:
+    match reply:
+        case None:
+            return b"$-1\r\n"
+        case bytes():
+            return _bulk(reply)
+        case str():
+            return b"+%b\r\n" % reply.encode("utf8")
+        case bool() | int():
+            return b":%d\r\n" % reply
+        case RESPError():
+            return b"-%b\r\n" % str(reply).encode("utf8")
+        case list():
+            return b"*%d\r\n" % len(reply) + b"".join(map(encode_reply, reply))
+        case _:
+            raise ValueError(f"cannot encode {type(reply).__name__}")
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Reply:
+    line = await reader.readuntil(CRLF)
+    kind, rest = line[:1], line[1:-2]
+
+    try:
+        match kind:
+            case b"+":
+                return rest.decode("utf8")
+            case b"-":
+                return RESPError(rest.decode("utf8"))
+            case b":":
+                return int(rest)
+            case b"$":
+                if (length := int(rest)) < 0:
+                    return None
+                data = await reader.readexactly(length + 2)
+                return data[:-2]
+            case b"*":
+                if (length := int(rest)) < 0:
+                    return None
+                return [await read_reply(reader) for _ in range(length)]
+    except ValueError as err:
+        raise ProtocolError(f"malformed reply: {line!r}") from err
+
+    raise ProtocolError(f"unexpected reply: {line!r}")
@@ -0,0 +1,235 @@
+"""
+A fixed-size hash table in shared memory, read and written by every
+worker process of a host.
+
+The table lives in a memory-mapped file (by default under /dev/shm), so
+workers started independently by uvicorn find it by path. It is split
+into buckets of a few fixed-size slots; a key hashes to one bucket and
+may live in any of its slots. When a bucket is full, its least recently
+used slot is overwritten.
+
+Readers take no lock. Each slot starts with a sequence number that a
+writer makes odd before changing the slot and even again afterwards, and
+a checksum of the value; a reader that sees an odd or changed sequence
+number, or a checksum mismatch, treats the slot as a miss. A writer that
+dies half way leaves an odd sequence number (and a bad checksum) behind,
+so its partial entry is never read and is the first to be reused.
+
+Writers lock their bucket with a byte-range lock on the file. The lock
+is never waited for: if another writer holds it, the value is simply
+not cached. The kernel releases the lock of a process that dies.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Hashable
+from hashlib import blake2b
+from pathlib import Path
+from time import time_ns
+
+from delicacy import config
+from delicacy.cache.lru import hits_total
+from delicacy.cache.lru import misses_total
+from delicacy.metrics import Counter
+
+MAGIC = b"DLCYSHM1"
+# magic, buckets, ways, slot size
+HEADER = struct.Struct("<8sIII")
+HEADER_SIZE = 64
+# sequence number, last use, key digest, value length, value crc32
+SLOT = struct.Struct("<QQ16sII")
+
+evictions_total = Counter(
+    "delicacy_shm_cache_evictions_total", "entries overwritten to make room", "cache"
+)
+contended_total = Counter(
+    "delicacy_shm_cache_contended_total",
+    "writes skipped because another worker held the bucket",
+    "cache",
+)
+
+
+def key_digest(key: tuple[Hashable, ...]) -> bytes:
+    return blake2b("\x1f".join(map(repr, key)).encode("utf8"), digest_size=16).digest()
+
+
+class SharedTable:
+    """A hash table of bytes values shared by the processes of a host
+
+    table = SharedTable(Path("/dev/shm/delicacy"), buckets=256)
+    table.put(key, png)
+    png = table.get(key)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        buckets: int,
+        ways: int = 4,
+        slot_size: int = 256 * 2**10,
+        name: str = "shm",
+    ) -> None:
+        if buckets <= 0 or ways <= 0:
+            raise ValueError("buckets and ways must be positive")
+        if slot_size <= SLOT.size:
+            raise ValueError(f"slot size must be larger than {SLOT.size}")
+
+        self.path = Path(path)
+        self.buckets = buckets
+        self.ways = ways
+        self.slot_size = slot_size
+        self.name = name
+        self.size = HEADER_SIZE + buckets * ways * slot_size
+
+        # byte-range locks are held per process, this orders our own threads
+        self._write_lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._initialize()
+            self._map = mmap.mmap(self._fd, self.size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    @classmethod
+    def from_config(cls) -> "SharedTable":
+        slot_size = config.SHM_CACHE_SLOT_KB * 2**10
+        ways = 4
+        buckets = max(1, config.SHM_CACHE_MB * 2**20 // (ways * slot_size))
+        return cls(Path(config.SHM_CACHE_PATH), buckets, ways, slot_size)
+
+    @property
+    def max_value_size(self) -> int:
+        return self.slot_size - SLOT.size
+
+    def _initialize(self) -> None:
+        """size and stamp a new table file, or check an existing one"""
+
+        expected = HEADER.pack(MAGIC, self.buckets, self.ways, self.slot_size)
+
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0, os.SEEK_SET)
+        try:
+            header = os.pread(self._fd, HEADER.size, 0)
+            if header == expected:
+                return
+            if header[: len(MAGIC)] == MAGIC:
+                raise ValueError(
+                    f"{self.path} holds a table of another geometry, remove it first"
+                )
+
+            # new file: zeroed slots are empty
+            os.ftruncate(self._fd, self.size)
+            os.pwrite(self._fd, expected, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0, os.SEEK_SET)
+
+    def _bucket(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.buckets
+
+    def _slot(self, bucket: int, way: int) -> int:
+        return HEADER_SIZE + (bucket * self.ways + way) * self.slot_size
+
+    def _read(self, offset: int, digest: bytes) -> bytes | None:
+        view = self._map
+        seq, _, slot_digest, length, crc = SLOT.unpack_from(view, offset)
+
+        if seq % 2 or slot_digest != digest or length > self.max_value_size:
+            return None
+
+        start = offset + SLOT.size
+        value = view[start : start + length]
+
+        # a writer got to the slot while it was being copied
+        if SLOT.unpack_from(view, offset)[0] != seq or zlib.crc32(value) != crc:
+            return None
+
+        return value
+
+    def get(self, key: tuple[Hashable, ...]) -> bytes | None:
+        digest = key_digest(key)
+        bucket = self._bucket(digest)
+
+        for way in range(self.ways):
+            offset = self._slot(bucket, way)
+            if (value := self._read(offset, digest)) is not None:
+                # last use, only a hint for eviction, so written without a lock
+                struct.pack_into("<Q", self._map, offset + 8, time_ns())
+                hits_total.inc(self.name)
+                return value
+
+        misses_total.inc(self.name)
+        return None
+
+    def _victim(self, bucket: int, digest: bytes) -> int:
+        """the way to write digest to: its own, a free one or the least recent"""
+
+        slots = [
+            SLOT.unpack_from(self._map, self._slot(bucket, way))
+            for way in range(self.ways)
+        ]
+
+        for way, (_, _, slot_digest, _, _) in enumerate(slots):
+            if slot_digest == digest:
+                return way
+        for way, (seq, _, _, _, _) in enumerate(slots):
+            if seq == 0 or seq % 2:
+                return way  # never written, or left behind by a dead writer
+
+        evictions_total.inc(self.name)
+        stamps: list[int] = [slot[1] for slot in slots]
+        return min(range(self.ways), key=stamps.__getitem__)
+
+    def put(self, key: tuple[Hashable, ...], value: bytes) -> bool:
+        """store value, return whether it was stored
+
+        Values larger than a slot are not stored, nor are values whose
+        bucket another worker is writing to at the same time.
+        """
+
+        if len(value) > self.max_value_size:
+            return False
+
+        digest = key_digest(key)
+        bucket = self._bucket(digest)
+        start = self._slot(bucket, 0)
+        length = self.ways * self.slot_size
+
+        with self._write_lock:
+            try:
+                fcntl.lockf(
+                    self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, length, start, os.SEEK_SET
+                )
+            except OSError:
+                contended_total.inc(self.name)
+                return False
+
+            try:
+                offset = self._slot(bucket, self._victim(bucket, digest))
+                (seq,) = struct.unpack_from("<Q", self._map, offset)
+                # odd while writing, also if a dead writer left it odd
+                seq = seq if seq % 2 else seq + 1
+
+                struct.pack_into("<Q", self._map, offset, seq)
+                SLOT.pack_into(
+                    self._map,
+                    offset,
+                    seq,
+                    time_ns(),
+                    digest,
+                    len(value),
+                    zlib.crc32(value),
+                )
+                data = offset + SLOT.size
+                self._map[data : data + len(value)] = value
+                struct.pack_into("<Q", self._map, offset, seq + 1)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start, os.SEEK_SET)
+
+        return True
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,124 @@
+"""
+An in-process server speaking enough of the Redis protocol for the cache.
+
+It supports PING, SELECT, GET, MGET, SET (with EX/PX), DEL and FLUSHDB on
+a single in-memory keyspace, and can delay every reply to stand in for
+a slow server. It lets RedisBackend be tested, or run locally, without a
+Redis installation.
+"""
+import asyncio
+from collections.abc import Callable
+from time import monotonic
+
+from delicacy.cache.resp import encode_reply
+from delicacy.cache.resp import ProtocolError
+from delicacy.cache.resp import read_reply
+from delicacy.cache.resp import Reply
+from delicacy.cache.resp import RESPError
+
+
+class StandInServer:
+    """A Redis stand-in listening on localhost
+
+    async with StandInServer() as server:
+        backend = RedisBackend.from_url(server.url)
+    """
+
+    def __init__(
+        self, delay: float = 0, clock: Callable[[], float] = monotonic
+    ) -> None:
+        self.delay = delay
+        self.clock = clock
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None
+        port: int = self._server.sockets[0].getsockname()[1]
+        return port
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request = await read_reply(reader)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(encode_reply(self.handle(request)))
+                await writer.drain()
+        except (EOFError, ConnectionError, ProtocolError):
+            pass
+        except asyncio.CancelledError:
+            # the loop is shutting down; asyncio (3.11) reports handlers
+            # that end cancelled as unhandled exceptions
+            pass
+        finally:
+            writer.close()
+
+    def _get(self, key: bytes) -> bytes | None:
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def handle(self, request: Reply) -> Reply:
+        if not isinstance(request, list) or not request:
+            return RESPError("ERR expected a command")
+
+        # commands are arrays of bulk strings
+        parts = [part for part in request if isinstance(part, bytes)]
+        if len(parts) != len(request):
+            return RESPError("ERR expected a command")
+
+        self.commands.append(parts)
+        name, *args = parts
+        command = name.upper()
+
+        match command, args:
+            case b"PING", []:
+                return "PONG"
+            case b"SELECT", [_]:
+                return "OK"
+            case b"GET", [key]:
+                return self._get(key)
+            case b"MGET", [_, *_]:
+                return [self._get(key) for key in args]
+            case b"SET", [key, value]:
+                self.data[key] = value, None
+                return "OK"
+            case b"SET", [key, value, unit, amount] if unit.upper() in (b"EX", b"PX"):
+                seconds = int(amount) / (1 if unit.upper() == b"EX" else 1000)
+                self.data[key] = value, self.clock() + seconds
+                return "OK"
+            case b"DEL", [_, *_]:
+                return sum(self.data.pop(key, None) is not None for key in args)
+            case b"FLUSHDB", []:
+                self.data.clear()
+                return "OK"
+
+        return RESPError(f"ERR unsupported command '{command.decode()}'")
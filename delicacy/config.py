@@ -1,4 +1,68 @@
+import os
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parents[1]
 COLLECTION_DIR = ROOT_DIR / "images"
+
+# per-request render budget of the /make endpoint, in seconds
+RENDER_BUDGET = float(os.environ.get("DELICACY_RENDER_BUDGET", 10))
+# how often the /make endpoint checks whether its client has disconnected
+DISCONNECT_POLL = float(os.environ.get("DELICACY_DISCONNECT_POLL", 0.1))
+# ImageMagick reader used for SVG (e.g. "msvg", "rsvg", "svg"),
+# or "auto" to pick the fastest correct one at startup
+SVG_DELEGATE = os.environ.get("DELICACY_SVG_DELEGATE", "auto")
+# fraction of maker calls whose scene complexity is recorded (delicacy.scene)
+SCENE_SAMPLE_RATE = float(os.environ.get("DELICACY_SCENE_SAMPLE_RATE", 0.01))
+
+# uvicorn workers sharing this host, the raster slots are divided among them
+WORKERS_PER_HOST = int(os.environ.get("DELICACY_WORKERS_PER_HOST", 1))
+# concurrent rasterizations per process (delicacy.raster.pool)
+RASTER_SLOTS = int(
+    os.environ.get(
+        "DELICACY_RASTER_SLOTS", max(1, (os.cpu_count() or 1) // WORKERS_PER_HOST)
+    )
+)
+# ImageMagick limits per slot: OpenMP threads, pixel cache memory in MiB
+# and the largest image area, in megapixels, kept in memory
+RASTER_THREADS = int(os.environ.get("DELICACY_RASTER_THREADS", 1))
+RASTER_MEMORY_MB = int(os.environ.get("DELICACY_RASTER_MEMORY_MB", 256))
+RASTER_AREA_MP = int(os.environ.get("DELICACY_RASTER_AREA_MP", 16))
+
+# rasterizer processes per server process (delicacy.raster.client),
+# 0 rasterizes in-process
+RASTER_WORKERS = int(os.environ.get("DELICACY_RASTER_WORKERS", 0))
+
+# threads drawing the character while the background is made and rasterized,
+# 0 runs the two stages of a request one after the other
+STAGE_WORKERS = int(os.environ.get("DELICACY_STAGE_WORKERS", RASTER_SLOTS))
+
+# memory budgets, in MiB, of the rendered characters and backgrounds
+# reused across requests sharing a phrase (delicacy.create), 0 disables
+CHARACTER_CACHE_MB = int(os.environ.get("DELICACY_CHARACTER_CACHE_MB", 32))
+BACKGROUND_CACHE_MB = int(os.environ.get("DELICACY_BACKGROUND_CACHE_MB", 64))
+# memory budget, in MiB, of encoded /make responses kept for repeated requests
+AVATAR_CACHE_MB = int(os.environ.get("DELICACY_AVATAR_CACHE_MB", 64))
+# file backing the avatar table in shared memory used by every worker of a host,
+# unset disables it; its size in MiB and the largest avatar it holds in KiB
+SHM_CACHE_PATH = os.environ.get("DELICACY_SHM_CACHE_PATH", "")
+SHM_CACHE_MB = int(os.environ.get("DELICACY_SHM_CACHE_MB", 256))
+SHM_CACHE_SLOT_KB = int(os.environ.get("DELICACY_SHM_CACHE_SLOT_KB", 256))
+# directory of the on-disk avatar cache shared by the workers of a host,
+# unset disables it; its budget in MiB and how often it evicts, in seconds
+DISK_CACHE_DIR = os.environ.get("DELICACY_DISK_CACHE_DIR", "")
+DISK_CACHE_MB = int(os.environ.get("DELICACY_DISK_CACHE_MB", 1024))
+DISK_CACHE_EVICT_INTERVAL = float(
+    os.environ.get("DELICACY_DISK_CACHE_EVICT_INTERVAL", 60)
+)
+
+# cache shared by every node (delicacy.cache.backend), e.g. redis://host:6379/0,
+# unset disables it; how long entries live there, in seconds
+CACHE_URL = os.environ.get("DELICACY_CACHE_URL", "")
+CACHE_TTL = float(os.environ.get("DELICACY_CACHE_TTL", 7 * 24 * 3600))
+# deadline of a shared cache call in seconds and the connections per process
+CACHE_TIMEOUT = float(os.environ.get("DELICACY_CACHE_TIMEOUT", 0.05))
+CACHE_POOL_SIZE = int(os.environ.get("DELICACY_CACHE_POOL_SIZE", 8))
+# failed calls in a row before the shared cache is skipped,
+# and for how many seconds it is skipped
+CACHE_BREAKER_FAILURES = int(os.environ.get("DELICACY_CACHE_BREAKER_FAILURES", 5))
+CACHE_BREAKER_RESET = float(os.environ.get("DELICACY_CACHE_BREAKER_RESET", 30))
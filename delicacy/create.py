@@ -14,20 +14,125 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from io import BytesIO
+from threading import local
+from time import perf_counter
+from typing import NamedTuple
+
 from PIL import Image as PILImage
 from wand import image as WandImage
 
+from delicacy import config
+from delicacy import scene
+from delicacy.cache.lru import LRUCache
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
 from delicacy.igen.igen import ImageGenerator
+from delicacy.raster.client import RasterClient
+from delicacy.raster.pool import default_pool
 from delicacy.saturn.saturn import BackgroundMaker
 from delicacy.saturn.saturn import MakerFunc
-from delicacy.svglib.utils.utils import materialize
-from delicacy.svglib.utils.utils import wand2pil
+from delicacy.svglib.utils.complexity import scene_stats
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.utils import tile_image
+from delicacy.svglib.utils.utils import tile_raster
+from delicacy.svglib.utils.utils import wand_pixels
+from delicacy.timing import Timings
+
+
+# bump whenever the same arguments start producing different images,
+# it invalidates every cached rendering keyed on it
+PIPELINE_VERSION = 1
+
+# one composite frame per thread, reused across create_png calls
+_frames = local()
+
+
+class InlineExecutor(Executor):
+    """An executor running each call in the submitting thread"""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as err:
+            future.set_exception(err)
+        return future
+
+
+@cache
+def stage_executor() -> Executor:
+    """the process-wide executor drawing characters, see config.STAGE_WORKERS"""
+
+    if config.STAGE_WORKERS <= 0:
+        return InlineExecutor()
+    return ThreadPoolExecutor(config.STAGE_WORKERS, thread_name_prefix="character")
+
+
+class Pixels(NamedTuple):
+    """raw 8-bit pixels of a raster, independent of any wand image"""
+
+    mode: str
+    size: tuple[int, int]
+    data: bytes
 
+    @classmethod
+    def from_wand(cls, image: WandImage.Image) -> "Pixels":
+        mode, data = wand_pixels(image)
+        return cls(mode, image.size, data)
+
+    def load(self, frame: PILImage.Image | None = None) -> PILImage.Image:
+        """the pixels in frame when it has the right mode and size,
+        otherwise in a new image
+        """
+
+        if frame is None or (frame.mode, frame.size) != (self.mode, self.size):
+            return PILImage.frombytes(self.mode, self.size, self.data)
+
+        frame.frombytes(self.data)
+        return frame
+
+
+def image_bytes(image: PILImage.Image) -> int:
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+def pixels_bytes(pixels: Pixels) -> int:
+    return len(pixels.data)
+
+
+character_cache: LRUCache[tuple, PILImage.Image] = LRUCache(
+    "character", config.CHARACTER_CACHE_MB * 2**20, image_bytes
+)
+background_cache: LRUCache[tuple, Pixels] = LRUCache(
+    "background", config.BACKGROUND_CACHE_MB * 2**20, pixels_bytes
+)
+
+
+def combine(
+    foreground: PILImage.Image,
+    background: WandImage.Image | Pixels,
+    frame: PILImage.Image | None = None,
+) -> PILImage.Image:
+    """composite foreground over background's raw pixels
 
-def combine(foreground: PILImage.Image, background: WandImage.Image) -> PILImage.Image:
-    img = wand2pil(background)
-    img.paste(foreground, (0, 0), foreground)
-    return img
+    The pixels are loaded into frame when it has the right mode and
+    size, so a caller can keep reusing one buffer.
+    """
+
+    if not isinstance(background, Pixels):
+        background = Pixels.from_wand(background)
+
+    image: PILImage.Image = background.load(frame)
+    image.paste(foreground, (0, 0), foreground)
+    return image
 
 
 def make_background(
@@ -36,11 +141,105 @@ def make_background(
     width: float = 320,
     height: float = 320,
     background: str | None = None,
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
 ) -> WandImage.Image:
+    timings = Timings() if timings is None else timings
     bgmaker = BackgroundMaker.from_phrase(phrase, maker)
+    sample = scene.should_sample()
+
+    start = perf_counter()
+    canvas = bgmaker.make(width, height, deadline=deadline, tile=tile)
+    made = perf_counter()
+    raster = default_pool().materialize(canvas, background, deadline, quality=quality)
+    rasterized = perf_counter()
+
+    timings.add("scene", made - start)
+    timings.add("raster", rasterized - made)
+
+    if sample:
+        stats = scene_stats(canvas)
+        scene.record(maker.__name__.lower(), stats, made - start, rasterized - made)
+
+    if tile is None:
+        return raster
+
+    with raster, timings.stage("tile"):
+        return tile_raster(raster, width, height)
+
+
+def draw_character(
+    gen: ImageGenerator,
+    phrase: str,
+    width: float,
+    height: float,
+    deadline: Deadline,
+    timings: Timings,
+    overlapped: bool = False,
+) -> PILImage.Image:
+    key = (gen.collection.name, gen.hash_func, phrase, (width, height))
+    with timings.stage("character", overlapped):
+        return character_cache.get_or_create(
+            key,
+            lambda: gen.generate(
+                phrase, size=(int(width), int(height)), deadline=deadline
+            ),
+        )
 
-    canvas = bgmaker.make(width, height)
-    return materialize(canvas, background)
+
+def _compose(
+    phrase: str,
+    maker: MakerFunc,
+    gen: ImageGenerator,
+    width: float,
+    height: float,
+    background_color: str,
+    deadline: Deadline,
+    tile: float | None,
+    quality: Quality,
+    timings: Timings,
+    executor: Executor | None,
+    frame: PILImage.Image | None = None,
+) -> PILImage.Image:
+    size = (width, height)
+
+    def draw_background() -> Pixels:
+        with make_background(
+            phrase,
+            maker,
+            width,
+            height,
+            background_color,
+            deadline,
+            tile,
+            quality,
+            timings,
+        ) as raster, timings.stage("pixels"):
+            return Pixels.from_wand(raster)
+
+    # the stages share nothing but the phrase, the character is drawn
+    # on the executor while this thread makes and rasterizes the scene
+    executor = stage_executor() if executor is None else executor
+    overlapped = not isinstance(executor, InlineExecutor)
+    character = executor.submit(
+        draw_character, gen, phrase, width, height, deadline, timings, overlapped
+    )
+
+    try:
+        key = (phrase, maker, size, background_color, tile, quality)
+        background = background_cache.get_or_create(key, draw_background)
+    except BaseException:
+        character.cancel()
+        raise
+
+    with timings.stage("join"):
+        foreground = character.result()
+
+    deadline.check()
+    with timings.stage("composite"):
+        return combine(foreground, background, frame)
 
 
 def create(
@@ -50,7 +249,198 @@ def create(
     width: float = 320,
     height: float = 320,
     background_color: str = "#09132b",
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
+    executor: Executor | None = None,
+) -> PILImage.Image:
+    timings = Timings() if timings is None else timings
+    return _compose(
+        phrase,
+        maker,
+        gen,
+        width,
+        height,
+        background_color,
+        deadline,
+        tile,
+        quality,
+        timings,
+        executor,
+    )
+
+
+def create_png(
+    phrase: str,
+    maker: MakerFunc,
+    gen: ImageGenerator,
+    width: float = 320,
+    height: float = 320,
+    background_color: str = "#09132b",
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
+    executor: Executor | None = None,
+) -> bytes:
+    """create, encoded as PNG
+
+    Compositing goes into this thread's reused frame, which is encoded
+    before returning, so no image outlives the call.
+    """
+
+    timings = Timings() if timings is None else timings
+    frame = _compose(
+        phrase,
+        maker,
+        gen,
+        width,
+        height,
+        background_color,
+        deadline,
+        tile,
+        quality,
+        timings,
+        executor,
+        getattr(_frames, "frame", None),
+    )
+    _frames.frame = frame
+
+    return encode_png(frame, timings)
+
+
+def encode_png(image: PILImage.Image, timings: Timings) -> bytes:
+    with timings.stage("encode"), BytesIO() as buffer:
+        image.save(buffer, "png")
+        return buffer.getvalue()
+
+
+async def make_remote_background(
+    phrase: str,
+    maker: MakerFunc,
+    client: RasterClient,
+    width: float = 320,
+    height: float = 320,
+    background: str | None = None,
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
+) -> Pixels:
+    """make_background, rasterized by client's workers"""
+
+    timings = Timings() if timings is None else timings
+    bgmaker = BackgroundMaker.from_phrase(phrase, maker)
+    sample = scene.should_sample()
+
+    start = perf_counter()
+    canvas = await asyncio.to_thread(
+        bgmaker.make, width, height, deadline=deadline, tile=tile
+    )
+    made = perf_counter()
+    raster = await client.rasterize(canvas, background, quality)
+    rasterized = perf_counter()
+
+    timings.add("scene", made - start)
+    timings.add("raster", rasterized - made)
+
+    if sample:
+        stats = scene_stats(canvas)
+        scene.record(maker.__name__.lower(), stats, made - start, rasterized - made)
+
+    deadline.check()
+
+    if tile is None:
+        return Pixels("RGBA", (raster.width, raster.height), raster.pixels)
+
+    with timings.stage("tile"):
+        filled = tile_image(raster.to_pil(), width, height)
+        return Pixels(filled.mode, filled.size, filled.tobytes())
+
+
+async def create_remote(
+    phrase: str,
+    maker: MakerFunc,
+    gen: ImageGenerator,
+    client: RasterClient,
+    width: float = 320,
+    height: float = 320,
+    background_color: str = "#09132b",
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
 ) -> PILImage.Image:
-    character = gen.generate(phrase, size=(width, height))
-    background = make_background(phrase, maker, width, height, background_color)
-    return combine(character, background)
+    """create, with the background rasterized by out-of-process workers
+
+    The character is drawn and the scene made in threads, the event
+    loop only awaits them. Characters and backgrounds are shared with
+    create through its caches.
+    """
+
+    timings = Timings() if timings is None else timings
+    character = asyncio.ensure_future(
+        asyncio.to_thread(
+            draw_character, gen, phrase, width, height, deadline, timings, True
+        )
+    )
+
+    try:
+        key = (phrase, maker, (width, height), background_color, tile, quality)
+        if (background := background_cache.get(key)) is None:
+            background = await make_remote_background(
+                phrase,
+                maker,
+                client,
+                width,
+                height,
+                background_color,
+                deadline,
+                tile,
+                quality,
+                timings,
+            )
+            background_cache.put(key, background)
+    except BaseException:
+        character.cancel()
+        raise
+
+    with timings.stage("join"):
+        foreground = await character
+
+    deadline.check()
+    with timings.stage("composite"):
+        return combine(foreground, background)
+
+
+async def create_remote_png(
+    phrase: str,
+    maker: MakerFunc,
+    gen: ImageGenerator,
+    client: RasterClient,
+    width: float = 320,
+    height: float = 320,
+    background_color: str = "#09132b",
+    deadline: Deadline = NO_DEADLINE,
+    tile: float | None = None,
+    quality: Quality = STANDARD,
+    timings: Timings | None = None,
+) -> bytes:
+    """create_remote, encoded as PNG in a thread"""
+
+    timings = Timings() if timings is None else timings
+    image = await create_remote(
+        phrase,
+        maker,
+        gen,
+        client,
+        width,
+        height,
+        background_color,
+        deadline,
+        tile,
+        quality,
+        timings,
+    )
+    return await asyncio.to_thread(encode_png, image, timings)
@@ -0,0 +1,44 @@
+from time import monotonic
+
+
+class RenderCancelled(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"render cancelled: {reason}")
+        self.reason = reason
+
+
+class Deadline:
+    """A cooperative cancellation token for the render pipeline.
+
+    Stages call check() between steps and inside their loops,
+    which raises RenderCancelled once the token is cancelled
+    or its time budget (in seconds) is exhausted.
+    """
+
+    __slots__ = ("expires", "reason")
+
+    def __init__(self, budget: float | None = None) -> None:
+        self.expires = None if budget is None else monotonic() + budget
+        self.reason: str | None = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if self.reason is None:
+            self.reason = reason
+
+    @property
+    def remaining(self) -> float | None:
+        if self.expires is None:
+            return None
+        return max(self.expires - monotonic(), 0)
+
+    def check(self) -> None:
+        if self.reason is None and self.expires is not None:
+            if monotonic() >= self.expires:
+                self.reason = "timeout"
+
+        if self.reason is not None:
+            raise RenderCancelled(self.reason)
+
+
+# a token that is never cancelled, used as the default for every stage
+NO_DEADLINE = Deadline()
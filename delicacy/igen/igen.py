@@ -26,6 +26,8 @@ from unicodedata import normalize
 from bitstring import BitArray
 from PIL import Image
 
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
 from delicacy.igen.collection import Collection
 from delicacy.igen.collection import PathType
 
@@ -90,6 +92,7 @@ class ImageGenerator:
         layers: Iterator[PathType],
         size: tuple[int, int] = (300, 300),
         factor: float = 0.8,
+        deadline: Deadline = NO_DEADLINE,
     ) -> Image.Image:
         fx, fy = size
         lx, ly = int(fx * factor), int(fy * factor)
@@ -99,6 +102,7 @@ class ImageGenerator:
 
         with Image.open(next(layers)) as base:
             for item in layers:
+                deadline.check()
                 with Image.open(item) as img:
                     base.paste(img, box=(0, 0), mask=img)
 
@@ -108,11 +112,19 @@ class ImageGenerator:
             frame.paste(base, box, mask=base)
             return frame
 
-    def generate(self, phrase: str, *args, **kwds) -> Image.Image:
+    def generate(
+        self,
+        phrase: str,
+        *,
+        size: tuple[int, int] = (300, 300),
+        factor: float = 0.8,
+        deadline: Deadline = NO_DEADLINE,
+    ) -> Image.Image:
         if len(phrase) > 128:
             raise ValueError("phrase length must be less than 128")
 
+        deadline.check()
         seed = self._hash(normalize("NFC", phrase))
         layers = self._pick_layers(seed)
 
-        return self._assemble(layers, *args, **kwds)
+        return self._assemble(layers, size, factor, deadline)
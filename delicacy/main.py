@@ -14,21 +14,114 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import asyncio
+import os
 from enum import Enum
-from io import BytesIO
+from functools import partial
+from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi import HTTPException
 from fastapi import Query
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
 from fastapi.responses import Response
+from starlette.background import BackgroundTask
+from starlette.background import BackgroundTasks
 
+from delicacy import config
+from delicacy.cache.backend import backend_from_url
+from delicacy.cache.disk import digest
+from delicacy.cache.disk import DiskCache
+from delicacy.cache.lru import LRUCache
+from delicacy.cache.shm import SharedTable
 from delicacy.config import COLLECTION_DIR
-from delicacy.create import create
+from delicacy.create import create_png
+from delicacy.create import create_remote_png
+from delicacy.create import PIPELINE_VERSION
+from delicacy.deadline import Deadline
+from delicacy.deadline import RenderCancelled
 from delicacy.igen.collection import Collection
 from delicacy.igen.igen import ImageGenerator
+from delicacy.metrics import Counter
+from delicacy.metrics import exposition
+from delicacy.raster.client import RasterClient
+from delicacy.raster.delegates import select_delegate
+from delicacy.raster.pool import default_pool
 from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.quality import QUALITIES
+from delicacy.timing import Timings
 
 app = FastAPI()
 
+# encoded avatars by request, a hit skips rendering and encoding
+avatar_cache: LRUCache[tuple, bytes] = LRUCache(
+    "avatar", config.AVATAR_CACHE_MB * 2**20, weigh=len
+)
+
+# the same, in memory and on disk, shared by every worker of the host
+shm_cache = SharedTable.from_config() if config.SHM_CACHE_PATH else None
+disk_cache = (
+    DiskCache(
+        Path(config.DISK_CACHE_DIR), config.DISK_CACHE_MB * 2**20, suffix=".png"
+    )
+    if config.DISK_CACHE_DIR
+    else None
+)
+
+# and shared by every node
+shared_cache = backend_from_url(config.CACHE_URL)
+
+# backgrounds are rasterized in-process unless workers are configured
+raster_client = RasterClient(config.RASTER_WORKERS) if config.RASTER_WORKERS else None
+
+cancellations = Counter(
+    "delicacy_render_cancelled_total",
+    "renders stopped before completion",
+    label="reason",
+)
+
+
+@app.on_event("startup")
+def pick_svg_delegate() -> None:
+    select_delegate()
+
+
+@app.on_event("startup")
+def configure_raster_pool() -> None:
+    default_pool()
+
+
+@app.on_event("startup")
+async def start_raster_workers() -> None:
+    if raster_client is not None:
+        await raster_client.start()
+
+
+@app.on_event("startup")
+def start_disk_cache_eviction() -> None:
+    if disk_cache is not None:
+        disk_cache.start_eviction(config.DISK_CACHE_EVICT_INTERVAL)
+
+
+@app.on_event("shutdown")
+def stop_disk_cache_eviction() -> None:
+    if disk_cache is not None:
+        disk_cache.stop_eviction()
+
+
+@app.on_event("shutdown")
+async def stop_raster_workers() -> None:
+    if raster_client is not None:
+        await raster_client.close()
+
+
+@app.on_event("shutdown")
+async def close_shared_cache() -> None:
+    await shared_cache.close()
+
 
 robot_path = COLLECTION_DIR / "robot"
 robot_collection = Collection("Robot", robot_path)
@@ -44,6 +137,9 @@ cat_gen = ImageGenerator(cat_collection)
 MakerEnum = Enum("MakerEnum", {k: k for k in MakerDict.keys()})  # type: ignore
 
 
+QualityEnum = Enum("QualityEnum", {k: k for k in QUALITIES.keys()})  # type: ignore
+
+
 class ThemeEnum(str, Enum):
     Dark = "dark"
     Light = "light"
@@ -59,24 +155,152 @@ def get_theme(theme: ThemeEnum):
             raise ValueError("Invalid theme")
 
 
+def disk_hit(key: tuple) -> tuple[Path, os.stat_result] | None:
+    """key's file in the disk cache and its stat, None on a miss
+
+    A file evicted between the lookup and the stat is a miss as well.
+    """
+
+    assert disk_cache is not None
+    if (path := disk_cache.get(key)) is None:
+        return None
+
+    try:
+        return path, os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def promote(key: tuple, path: Path) -> None:
+    """copy a disk hit into the caches checked before the disk"""
+
+    try:
+        png = path.read_bytes()
+    except FileNotFoundError:
+        return  # evicted since it was served
+
+    avatar_cache.put(key, png)
+    if shm_cache is not None:
+        shm_cache.put(key, png)
+
+
+async def render(request: Request, deadline: Deadline, func, *args, **kwds):
+    """run a render off the event loop, in a thread unless func is a
+    coroutine function, cancelling its deadline as soon as the client
+    disconnects
+    """
+
+    if asyncio.iscoroutinefunction(func):
+        job = func(*args, deadline=deadline, **kwds)
+    else:
+        job = run_in_threadpool(partial(func, *args, deadline=deadline, **kwds))
+    task = asyncio.ensure_future(job)
+
+    while not task.done():
+        await asyncio.wait((task,), timeout=config.DISCONNECT_POLL)
+        if not task.done() and await request.is_disconnected():
+            deadline.cancel("disconnected")
+
+    try:
+        return task.result()
+    except RenderCancelled as err:
+        cancellations.inc(err.reason)
+        raise HTTPException(status_code=503, detail=str(err)) from err
+
+
 @app.get("/make/{maker_type}")
 async def make(
+    request: Request,
     maker_type: MakerEnum,
     phrase: str = Query(max_length=128),
     theme: ThemeEnum = ThemeEnum.Dark,
+    tile: int | None = Query(default=None, ge=16, le=512),
+    quality: QualityEnum = QualityEnum.standard,  # type: ignore
 ):
     try:
         maker = MakerDict[maker_type.name]
     except KeyError:
         raise ValueError("Invalid maker type")
 
-    img = create(
+    background_color = get_theme(theme)
+    # the phrase is kept byte for byte, backgrounds are seeded from its bytes
+    key = (
+        PIPELINE_VERSION,
+        maker_type.name,
         phrase,
-        maker,
-        cat_gen,
-        background_color=get_theme(theme),
+        background_color,
+        tile,
+        quality.name,
+    )
+
+    if (png := avatar_cache.get(key)) is not None:
+        return Response(content=png, media_type="image/png", headers={"X-Cache": "hit"})
+
+    if shm_cache is not None and (png := shm_cache.get(key)) is not None:
+        avatar_cache.put(key, png)
+        return Response(content=png, media_type="image/png", headers={"X-Cache": "shm"})
+
+    if disk_cache is not None and (hit := await run_in_threadpool(disk_hit, key)):
+        # served from the file, with the stat taken above so the response
+        # does not look the file up again; it was just marked as used,
+        # which puts it last in line for eviction
+        path, stat_result = hit
+        return FileResponse(
+            path,
+            stat_result=stat_result,
+            media_type="image/png",
+            headers={"X-Cache": "disk"},
+            background=BackgroundTask(promote, key, path),
+        )
+
+    shared_key = f"avatar:{digest(key)}"
+    if (png := await shared_cache.get(shared_key)) is not None:
+        avatar_cache.put(key, png)
+        if shm_cache is not None:
+            shm_cache.put(key, png)
+        return Response(
+            content=png, media_type="image/png", headers={"X-Cache": "shared"}
+        )
+
+    timings = Timings()
+    options = dict(
+        background_color=background_color,
+        tile=tile,
+        quality=QUALITIES[quality.name],
+        timings=timings,
+    )
+    deadline = Deadline(config.RENDER_BUDGET)
+    if raster_client is None:
+        png = await render(
+            request, deadline, create_png, phrase, maker, cat_gen, **options
+        )
+    else:
+        png = await render(
+            request,
+            deadline,
+            create_remote_png,
+            phrase,
+            maker,
+            cat_gen,
+            raster_client,
+            **options,
+        )
+    avatar_cache.put(key, png)
+    if shm_cache is not None:
+        shm_cache.put(key, png)
+
+    headers = {"Server-Timing": timings.server_timing(), "X-Cache": "miss"}
+    # written once the response is sent
+    store = BackgroundTasks()
+    store.add_task(shared_cache.set, shared_key, png, config.CACHE_TTL)
+    if disk_cache is not None:
+        store.add_task(disk_cache.put, key, png)
+
+    return Response(
+        content=png, media_type="image/png", headers=headers, background=store
     )
 
-    with BytesIO() as imgbytes:
-        img.save(imgbytes, "png")
-        return Response(content=imgbytes.getvalue(), media_type="image/png")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return exposition()
@@ -0,0 +1,56 @@
+from collections import defaultdict
+from threading import Lock
+
+Metrics: dict[str, "Counter"] = dict()
+
+
+class Counter:
+    """A thread-safe monotonic counter, optionally split by a label"""
+
+    def __init__(self, name: str, description: str = "", label: str = "label") -> None:
+        if name in Metrics:
+            raise ValueError(f"metric {name} already exists")
+
+        self.name = name
+        self.description = description
+        self.label = label
+        self._values: dict[str, float] = defaultdict(float)
+        self._lock = Lock()
+        Metrics[name] = self
+
+    def inc(self, label: str = "", amount: float = 1) -> None:
+        with self._lock:
+            self._values[label] += amount
+
+    def value(self, label: str = "") -> float:
+        return self._values.get(label, 0)
+
+    def samples(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Counter):
+    """A thread-safe value that can go up and down, optionally split by a label"""
+
+    def dec(self, label: str = "", amount: float = 1) -> None:
+        self.inc(label, -amount)
+
+    def set(self, value: float, label: str = "") -> None:
+        with self._lock:
+            self._values[label] = value
+
+
+def exposition() -> str:
+    """render every metric in the Prometheus text format"""
+
+    lines = []
+    for name, metric in Metrics.items():
+        lines.append(f"# HELP {name} {metric.description}")
+        lines.append(f"# TYPE {name} {type(metric).__name__.lower()}")
+
+        for label, value in sorted(metric.samples().items()):
+            labels = f'{{{metric.label}="{label}"}}' if label else ""
+            lines.append(f"{name}{labels} {value:g}")
+
+    return "\n".join(lines) + "\n"
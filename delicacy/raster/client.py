@@ -0,0 +1,224 @@
+"""
+An asyncio client for a pool of rasterizer processes (delicacy.raster.worker).
+
+Rasterization runs outside the server process, so a crash while rendering
+only takes down one worker: its in-flight jobs fail with RasterizerCrashed
+and the worker is replaced. Each worker accepts several requests before
+answering (pipelining) and is recycled after a number of jobs.
+"""
+import asyncio
+import os
+import sys
+from asyncio.subprocess import PIPE
+from asyncio.subprocess import Process
+from collections import deque
+from collections.abc import Sequence
+
+from lxml.etree import _Element
+from lxml.etree import tostring
+
+from delicacy.raster.protocol import encode_request
+from delicacy.raster.protocol import OK
+from delicacy.raster.protocol import Raster
+from delicacy.raster.protocol import RESPONSE
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.quality import supersampled
+from delicacy.svglib.utils.utils import svg_format
+
+WORKER_ARGV = (sys.executable, "-m", "delicacy.raster.worker")
+
+
+class RasterizerCrashed(Exception):
+    pass
+
+
+class RasterError(Exception):
+    pass
+
+
+class Worker:
+    def __init__(self, argv: Sequence[str], max_jobs: int) -> None:
+        self.argv = argv
+        self.max_jobs = max_jobs
+        self.jobs = 0
+        self.pending: deque[asyncio.Future[Raster]] = deque()
+        self.proc: Process | None = None
+        self.reader: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    @property
+    def retiring(self) -> bool:
+        return self.jobs >= self.max_jobs
+
+    @property
+    def available(self) -> bool:
+        return self.alive and not self.retiring
+
+    async def start(self) -> None:
+        # the worker reads SVG with the reader pinned in this process
+        env = dict(os.environ, DELICACY_SVG_DELEGATE=svg_format())
+        self.proc = await asyncio.create_subprocess_exec(
+            *self.argv, stdin=PIPE, stdout=PIPE, env=env
+        )
+        self.reader = asyncio.create_task(self._read())
+
+    def submit(
+        self, svg: bytes, background: str | None, quality: str = STANDARD.name
+    ) -> "asyncio.Future[Raster]":
+        """send a request, whose response resolves the returned future;
+        call drain before awaiting it
+        """
+
+        assert self.proc is not None and self.proc.stdin is not None
+
+        future: asyncio.Future[Raster] = asyncio.get_running_loop().create_future()
+        # write and enqueue without awaiting in between,
+        # so responses always match the order of pending futures
+        self.proc.stdin.write(encode_request(svg, background, quality))
+        self.pending.append(future)
+        self.jobs += 1
+
+        if self.retiring:
+            # the worker exits once it has answered everything written so far
+            self.proc.stdin.close()
+
+        return future
+
+    async def drain(self) -> None:
+        """wait until the requests written so far fit the pipe's buffer"""
+
+        assert self.proc is not None and self.proc.stdin is not None
+
+        # a retiring worker's stdin is closed, it flushes by itself
+        if self.proc.stdin.is_closing():
+            return
+
+        try:
+            await self.proc.stdin.drain()
+        except ConnectionError:
+            # the worker is gone, its reader fails the pending futures
+            pass
+
+    async def _read(self) -> None:
+        assert self.proc is not None and self.proc.stdout is not None
+        stdout = self.proc.stdout
+
+        try:
+            while True:
+                header = await stdout.readexactly(RESPONSE.size)
+                status, width, height, length = RESPONSE.unpack(header)
+                payload = await stdout.readexactly(length)
+
+                future = self.pending.popleft()
+                if future.done():
+                    continue
+                if status == OK:
+                    future.set_result(Raster(width, height, payload))
+                else:
+                    future.set_exception(RasterError(payload.decode("utf8")))
+        except asyncio.IncompleteReadError:
+            pass
+
+        await self.proc.wait()
+
+        while self.pending:
+            future = self.pending.popleft()
+            if not future.done():
+                msg = f"rasterizer exited with code {self.proc.returncode}"
+                future.set_exception(RasterizerCrashed(msg))
+
+    async def close(self) -> None:
+        if self.proc is None:
+            return
+
+        if self.proc.stdin is not None and not self.proc.stdin.is_closing():
+            self.proc.stdin.close()
+
+        if self.reader is not None:
+            await self.reader
+
+
+class RasterClient:
+    """A pool of rasterizer processes
+
+    async with RasterClient(workers=2) as client:
+        raster = await client.rasterize(canvas, "#09132b")
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_jobs: int = 1000,
+        argv: Sequence[str] = WORKER_ARGV,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("number of workers must be positive")
+        if max_jobs <= 0:
+            raise ValueError("max_jobs must be positive")
+
+        self.size = workers
+        self.max_jobs = max_jobs
+        self.argv = argv
+        self.workers: list[Worker] = []
+        self.restarts = 0
+        self._retired: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RasterClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        for _ in range(self.size):
+            self.workers.append(await self._spawn())
+
+    async def _spawn(self) -> Worker:
+        worker = Worker(self.argv, self.max_jobs)
+        await worker.start()
+        return worker
+
+    async def _acquire(self) -> Worker:
+        async with self._lock:
+            for i, worker in enumerate(self.workers):
+                if not worker.available:
+                    # let the old worker drain in the background
+                    task = asyncio.create_task(worker.close())
+                    self._retired.add(task)
+                    task.add_done_callback(self._retired.discard)
+
+                    self.workers[i] = await self._spawn()
+                    self.restarts += 1
+
+            return min(self.workers, key=lambda w: len(w.pending))
+
+    async def rasterize_bytes(
+        self, svg: bytes, background: str | None = None, quality: Quality = STANDARD
+    ) -> Raster:
+        """rasterize svg, already supersampled for quality (see rasterize)"""
+
+        worker = await self._acquire()
+        future = worker.submit(svg, background, quality.name)
+        await worker.drain()
+        return await future
+
+    async def rasterize(
+        self,
+        canvas: _Element,
+        background: str | None = None,
+        quality: Quality = STANDARD,
+    ) -> Raster:
+        with supersampled(canvas, quality.supersample):
+            svg = tostring(canvas)
+        return await self.rasterize_bytes(svg, background, quality)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(worker.close() for worker in self.workers))
+        await asyncio.gather(*self._retired)
+        self.workers.clear()
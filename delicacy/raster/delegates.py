@@ -0,0 +1,162 @@
+"""
+Detection and selection of the ImageMagick SVG reader used by materialize.
+
+Depending on how ImageMagick was built, SVG goes through its internal MSVG
+renderer, librsvg or an external delegate, with very different throughput.
+select_delegate checks which readers render a probe canvas correctly,
+times each on a reference canvas from every maker and pins the fastest.
+"""
+import logging
+from time import perf_counter
+from typing import NamedTuple
+
+from lxml.etree import tostring
+from wand import image as WandImage
+from wand.version import formats
+
+from delicacy import config
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import Canvas
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.elements.element import defs
+from delicacy.svglib.elements.element import group
+from delicacy.svglib.elements.peripheral.style import Fill
+from delicacy.svglib.elements.peripheral.style import Stroke
+from delicacy.svglib.elements.shapes import Circle
+from delicacy.svglib.elements.shapes import Path
+from delicacy.svglib.elements.shapes import Rectangle
+from delicacy.svglib.elements.use import Use
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.utils.utils import svg_format
+from delicacy.svglib.utils.utils import use_svg_format
+
+logger = logging.getLogger(__name__)
+
+# in order of preference when timings are equal
+CANDIDATES = ("rsvg", "msvg", "svg")
+
+PROBE_BACKGROUND = "#ffffff"
+# pixel -> expected (red, green, blue) on the probe canvas
+PROBE_PIXELS = {
+    (8, 8): (255, 0, 0),  # rect
+    (48, 48): (0, 0, 255),  # circle, drawn through <use>
+    (60, 4): (0, 255, 0),  # path
+    (4, 60): (255, 255, 255),  # background
+}
+PROBE_TOLERANCE = 16
+
+
+class DelegateReport(NamedTuple):
+    name: str
+    correct: bool
+    seconds: float
+
+
+def detect() -> tuple[str, ...]:
+    """SVG readers this ImageMagick build provides"""
+
+    supported = {fmt.lower() for fmt in formats("*SVG*")}
+    return tuple(name for name in CANDIDATES if name in supported)
+
+
+def probe_canvas() -> Canvas:
+    canvas = get_canvas(64, 64)
+
+    rect = Rectangle.make_rectangle(0, 0, 32, 32)
+    rect.apply_styles(Stroke("#ff0000"), Fill("#ff0000"))
+
+    circle = Circle.make_circle(8, 8, 8)
+    circle.apply_styles(Stroke("#0000ff"), Fill("#0000ff"))
+
+    path = Path().M(40, 0).L(64, 0).L(64, 24).Z()
+    path.apply_styles(Stroke("#00ff00"), Fill("#00ff00"))
+
+    canvas.append(rect.base)
+    canvas.append(defs(group(circle, id="probe")).base)
+    canvas.append(Use("probe", (40, 40)).base)  # type: ignore
+    canvas.append(path.base)
+    return canvas
+
+
+def _render(name: str, canvas: Canvas, background: str) -> WandImage.Image:
+    return WandImage.Image(blob=tostring(canvas), format=name, background=background)
+
+
+def renders_correctly(name: str) -> bool:
+    try:
+        with _render(name, probe_canvas(), PROBE_BACKGROUND) as img:
+            if img.size != (64, 64):
+                return False
+
+            for (x, y), expected in PROBE_PIXELS.items():
+                pixel = img[x, y]
+                actual = (pixel.red_int8, pixel.green_int8, pixel.blue_int8)
+                if any(abs(a - e) > PROBE_TOLERANCE for a, e in zip(actual, expected)):
+                    return False
+    except Exception:
+        return False
+
+    return True
+
+
+def reference_canvases(size: float = 256) -> list[Canvas]:
+    return [
+        BackgroundMaker(maker, seed=0).make(size, size) for maker in MakerDict.values()
+    ]
+
+
+def evaluate(name: str, canvases: list[Canvas]) -> DelegateReport:
+    if not renders_correctly(name):
+        return DelegateReport(name, False, float("inf"))
+
+    start = perf_counter()
+    for canvas in canvases:
+        _render(name, canvas, PROBE_BACKGROUND).close()
+
+    return DelegateReport(name, True, perf_counter() - start)
+
+
+def select_delegate(override: str | None = None) -> str:
+    """pin the SVG reader used by materialize and return its name
+
+    override defaults to config.SVG_DELEGATE; "auto" benchmarks the
+    available readers and pins the fastest one that renders correctly,
+    as does a reader this ImageMagick build does not provide.
+    """
+
+    override = (override or config.SVG_DELEGATE).lower()
+    available = detect()
+
+    if override in available:
+        use_svg_format(override)
+        logger.info("svg delegate: %s (pinned by DELICACY_SVG_DELEGATE)", override)
+        return override
+
+    if override != "auto":
+        logger.warning(
+            "svg delegate: %s (DELICACY_SVG_DELEGATE) is not available, "
+            "falling back to auto",
+            override,
+        )
+
+    canvases = reference_canvases()
+    reports = [evaluate(name, canvases) for name in available]
+    correct = [report for report in reports if report.correct]
+
+    summary = ", ".join(
+        f"{r.name}={r.seconds * 1000:.1f}ms" if r.correct else f"{r.name}=incorrect"
+        for r in reports
+    )
+
+    if not correct:
+        logger.warning("svg delegate: no reader passed the probe (%s)", summary)
+        return svg_format()
+
+    fastest = min(correct, key=lambda report: report.seconds)
+    use_svg_format(fastest.name)
+    logger.info("svg delegate: %s (%s)", fastest.name, summary)
+    return fastest.name
+
+
+def current_delegate() -> str:
+    return svg_format()
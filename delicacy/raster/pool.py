@@ -0,0 +1,141 @@
+"""
+A fixed number of rasterization slots per process.
+
+ImageMagick's thread pool and pixel cache limits are process-wide and
+default to the whole machine, so several uvicorn workers rasterizing at
+once oversubscribe the cores and spill large renders to disk. A pool
+sets those limits once, sized from its per-slot limits, and lets at most
+`slots` renders run at a time; the rest wait in line.
+"""
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cache
+from threading import BoundedSemaphore
+from time import perf_counter
+
+from attrs import field
+from attrs import frozen
+from attrs.validators import gt
+from lxml.etree import _Element
+from wand import image as WandImage
+from wand.resource import limits as resource_limits
+
+from delicacy import config
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
+from delicacy.metrics import Counter
+from delicacy.metrics import Gauge
+from delicacy.svglib.utils.compact import Compaction
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.utils import materialize
+
+
+logger = logging.getLogger(__name__)
+
+MiB = 1 << 20
+
+queue_depth = Gauge("delicacy_raster_queue_depth", "renders waiting for a slot")
+busy_slots = Gauge("delicacy_raster_busy_slots", "renders holding a slot")
+jobs_total = Counter("delicacy_raster_jobs_total", "renders run through the pool")
+wait_seconds_total = Counter(
+    "delicacy_raster_wait_seconds_total", "time renders spent waiting for a slot"
+)
+
+
+@frozen
+class SlotLimits:
+    """ImageMagick limits granted to each slot"""
+
+    threads: int = field(default=1, validator=gt(0))
+    memory: int = field(default=256 * MiB, validator=gt(0))
+    area: int = field(default=16_000_000, validator=gt(0))
+
+    @classmethod
+    def from_config(cls) -> "SlotLimits":
+        return cls(
+            threads=config.RASTER_THREADS,
+            memory=config.RASTER_MEMORY_MB * MiB,
+            area=config.RASTER_AREA_MP * 1_000_000,
+        )
+
+    def process_limits(self, slots: int) -> dict[str, int]:
+        # threads and area apply to each image being processed,
+        # memory and map are shared by every image in the process
+        return dict(
+            thread=self.threads,
+            area=self.area,
+            memory=self.memory * slots,
+            map=2 * self.memory * slots,
+        )
+
+
+class RasterPool:
+    """Run materialize in at most `slots` threads at a time
+
+    pool = RasterPool(slots=2)
+    with pool.materialize(canvas, "#09132b") as raster:
+        ...
+    """
+
+    def __init__(self, slots: int = 1, limits: SlotLimits = SlotLimits()) -> None:
+        if slots <= 0:
+            raise ValueError("number of slots must be positive")
+
+        self.slots = slots
+        self.limits = limits
+        self._semaphore = BoundedSemaphore(slots)
+
+    def configure(self) -> None:
+        """set ImageMagick's process-wide limits for this pool"""
+
+        for name, value in self.limits.process_limits(self.slots).items():
+            resource_limits[name] = value
+
+        logger.info(
+            "raster pool: %d slots, %d threads, %d MiB memory per slot",
+            self.slots,
+            self.limits.threads,
+            self.limits.memory // MiB,
+        )
+
+    @contextmanager
+    def slot(self, deadline: Deadline = NO_DEADLINE) -> Iterator[None]:
+        queue_depth.inc()
+        start = perf_counter()
+        try:
+            while not self._semaphore.acquire(timeout=config.DISCONNECT_POLL):
+                deadline.check()
+        finally:
+            queue_depth.dec()
+            wait_seconds_total.inc(amount=perf_counter() - start)
+
+        busy_slots.inc()
+        jobs_total.inc()
+        try:
+            yield
+        finally:
+            busy_slots.dec()
+            self._semaphore.release()
+
+    def materialize(
+        self,
+        canvas: _Element,
+        background: str | None = None,
+        deadline: Deadline = NO_DEADLINE,
+        compaction: Compaction | None = None,
+        quality: Quality = STANDARD,
+    ) -> WandImage.Image:
+        with self.slot(deadline):
+            deadline.check()
+            return materialize(canvas, background, deadline, compaction, quality)
+
+
+@cache
+def default_pool() -> RasterPool:
+    """the process-wide pool, configured on first use"""
+
+    pool = RasterPool(config.RASTER_SLOTS, SlotLimits.from_config())
+    pool.configure()
+    return pool
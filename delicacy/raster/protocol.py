@@ -0,0 +1,54 @@
+"""
+Framing between the rasterizer client and its worker processes.
+
+A request is a REQUEST header (SVG, background and quality lengths)
+followed by the SVG bytes, the UTF-8 background colour and the name of
+the quality tier (delicacy.svglib.utils.quality). A response is a RESPONSE header
+(status, width, height and payload length) followed by the payload: raw
+8-bit RGBA pixels on success, a UTF-8 error message otherwise.
+"""
+from struct import Struct
+from typing import BinaryIO
+from typing import NamedTuple
+
+from PIL import Image as PILImage
+
+REQUEST = Struct("!III")
+RESPONSE = Struct("!BIII")
+
+OK, ERROR = 0, 1
+
+
+class Raster(NamedTuple):
+    width: int
+    height: int
+    pixels: bytes
+
+    def to_pil(self) -> PILImage.Image:
+        size = (self.width, self.height)
+        return PILImage.frombuffer("RGBA", size, self.pixels, "raw", "RGBA", 0, 1)
+
+
+def encode_request(
+    svg: bytes, background: str | None = None, quality: str = "standard"
+) -> bytes:
+    bg = (background or "").encode("utf8")
+    tier = quality.encode("utf8")
+    return REQUEST.pack(len(svg), len(bg), len(tier)) + svg + bg + tier
+
+
+def encode_response(status: int, width: int, height: int, payload: bytes) -> bytes:
+    return RESPONSE.pack(status, width, height, len(payload)) + payload
+
+
+def read_exact(stream: BinaryIO, size: int) -> bytes | None:
+    """read exactly size bytes, or None if the stream ends first"""
+
+    chunks, remain = [], size
+    while remain:
+        chunk = stream.read(remain)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remain -= len(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,79 @@
+"""
+A long-lived rasterizer process: python -m delicacy.raster.worker
+
+It reads framed SVG requests from stdin and writes framed raw pixels
+to stdout, one response per request and in the same order. A request's
+SVG is already supersampled for its quality tier, the worker scales the
+raster back down.
+"""
+import os
+import sys
+from collections.abc import Callable
+from typing import BinaryIO
+
+from wand import image as WandImage
+
+from delicacy.raster.delegates import select_delegate
+from delicacy.raster.protocol import encode_response
+from delicacy.raster.protocol import ERROR
+from delicacy.raster.protocol import OK
+from delicacy.raster.protocol import Raster
+from delicacy.raster.protocol import read_exact
+from delicacy.raster.protocol import REQUEST
+from delicacy.svglib.utils.quality import get_quality
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.utils import svg_format
+
+RenderFunc = Callable[[bytes, str | None, Quality], Raster]
+
+
+def render(svg: bytes, background: str | None, quality: Quality) -> Raster:
+    with WandImage.Image() as img:
+        # anti-aliasing only applies if it is set before reading
+        img.antialias = quality.antialias
+        img.read(blob=svg, format=svg_format(), background=background)
+
+        if (factor := quality.supersample) > 1:
+            img.resize(img.width // factor, img.height // factor, filter=quality.filter)
+
+        img.depth = 8
+        return Raster(img.width, img.height, img.make_blob("RGBA"))
+
+
+def serve(stdin: BinaryIO, stdout: BinaryIO, render: RenderFunc = render) -> None:
+    while (header := read_exact(stdin, REQUEST.size)) is not None:
+        svg_len, bg_len, tier_len = REQUEST.unpack(header)
+        svg = read_exact(stdin, svg_len)
+        bg = read_exact(stdin, bg_len)
+        tier = read_exact(stdin, tier_len)
+
+        if svg is None or bg is None or tier is None:
+            break
+
+        try:
+            quality = get_quality(tier.decode("utf8"))
+            raster = render(svg, bg.decode("utf8") or None, quality)
+        except Exception as err:
+            response = encode_response(ERROR, 0, 0, str(err).encode("utf8"))
+        else:
+            response = encode_response(OK, *raster)
+
+        stdout.write(response)
+        stdout.flush()
+
+
+def main(render: RenderFunc = render) -> None:
+    # keep the protocol on a private descriptor and send anything else
+    # written to stdout (e.g. by native libraries) to stderr instead
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    # pin the reader the client passes in DELICACY_SVG_DELEGATE
+    select_delegate()
+
+    with channel:
+        serve(sys.stdin.buffer, channel, render)
+
+
+if __name__ == "__main__":
+    main()
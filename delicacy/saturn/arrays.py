@@ -0,0 +1,137 @@
+"""
+Array-based counterparts of the helpers in delicacy.saturn.helpers.
+
+Each helper produces a whole array of coordinates or parameters in a few
+NumPy calls instead of one Python-level random draw per point. Because the
+values are drawn from a NumPy generator, they do not match the output of the
+Random-based helpers; the stream is versioned by ARRAY_RNG_VERSION instead.
+"""
+from collections.abc import Sequence
+from random import Random
+
+import numpy as np
+
+from delicacy.saturn.helpers import generate_id
+from delicacy.svglib.elements.element import defs
+from delicacy.svglib.elements.element import ExtendedElement
+from delicacy.svglib.elements.element import group
+from delicacy.svglib.elements.element import WrappingElement
+from delicacy.svglib.elements.peripheral.point import Point
+from delicacy.svglib.elements.peripheral.style import Fill
+from delicacy.svglib.elements.peripheral.style import Stroke
+from delicacy.svglib.elements.peripheral.transform import Transform
+from delicacy.svglib.elements.use import Use
+from delicacy.svglib.utils.utils import linspace_array
+
+# bump whenever a change alters the values drawn by array-based makers,
+# so their output is versioned separately from the Random-based makers
+ARRAY_RNG_VERSION = 1
+
+
+def array_rng(rng: Random) -> np.random.Generator:
+    """derive a NumPy generator from a maker's rng, tagged by ARRAY_RNG_VERSION"""
+
+    return np.random.default_rng((ARRAY_RNG_VERSION, rng.getrandbits(128)))
+
+
+def sorted_randspace_array(
+    gen: np.random.Generator,
+    start: float = 0,
+    end: float = 512,
+    k: int | Sequence[int] | np.ndarray = 10,
+) -> np.ndarray:
+    """array-based sorted_randspace
+
+    When k is a sequence, one sorted space is drawn per item,
+    and the spaces are concatenated in order.
+    """
+
+    start, end = int(start), int(end)
+    ks = np.atleast_1d(np.asarray(k, dtype=np.int64))
+
+    if np.any(ks <= 0):
+        raise ValueError("k must be positive")
+
+    min_space = np.repeat((end - start) // ks, ks)
+    offsets = np.repeat(np.cumsum(ks) - ks, ks)
+    slots = np.arange(min_space.size) - offsets
+
+    lows = start + slots * min_space
+    return gen.integers(lows, lows + min_space, endpoint=True)
+
+
+def linear_plane_array(
+    xrange: tuple[int, int] = (0, 512),
+    yrange: tuple[int, int] = (0, 512),
+    xk: int = 10,
+    yk: int = 10,
+) -> np.ndarray:
+    """array-based linear_plane, an (xk * yk, 2) array in the same order"""
+
+    xspace = linspace_array(*xrange, n_samples=xk)
+    yspace = linspace_array(*yrange, n_samples=yk)
+    xs, ys = np.meshgrid(xspace, yspace, indexing="ij")
+    return np.column_stack((xs.ravel(), ys.ravel()))
+
+
+def rand_plane_array(
+    gen: np.random.Generator,
+    xrange: tuple[int, int] = (0, 512),
+    yrange: tuple[int, int] = (0, 512),
+    xk: int = 10,
+    yk: int = 10,
+    rate: float = 0.2,
+) -> np.ndarray:
+    """array-based rand_plane"""
+
+    if not 0 < rate <= 1:
+        raise ValueError("rate must be in range (0, 1]")
+
+    plane = linear_plane_array(xrange, yrange, xk, yk)
+    return plane[gen.random(len(plane)) < rate]
+
+
+def spreadit_array(
+    gen: np.random.Generator, spread: tuple[int, int], k: int = 3
+) -> np.ndarray:
+    """array-based spreadit, a (k, 2) array of offsets"""
+
+    direction = gen.choice((-1, 1), size=2)
+    deltas = gen.integers(*spread, size=(k, 2))
+    return np.arange(k)[:, np.newaxis] * direction * deltas
+
+
+def fade_array(
+    gen: np.random.Generator,
+    element: ExtendedElement,
+    color: str,
+    scale: float,
+    num: int = 3,
+    location: Point = Point(0, 0),
+    rotate: float | None = None,
+    spread: tuple[int, int] = (15, 25),
+    fading_scale: float = 0.8,
+) -> ExtendedElement:
+    """array-based fade, drawing every faded copy's parameters at once"""
+
+    rotate = int(gen.integers(0, 360, endpoint=True)) if rotate is None else rotate
+    decay = fading_scale ** np.arange(num)
+    widths = (10.0 if num <= 1 else 20.0) * decay
+    fill = Fill(color="none")
+
+    eid = generate_id(*location, gen.integers(1 << 62))
+
+    faded = WrappingElement("g")
+    faded.append(defs(group(element, id=eid)))
+
+    offsets = spreadit_array(gen, spread, k=num)
+
+    for (dx, dy), width, opacity in zip(offsets.tolist(), widths, decay):
+        use = Use(eid, (dx, dy))  # type: ignore
+        use.apply_styles(Stroke(color, float(opacity), float(width)), fill)
+        faded.append(use)
+
+    transform = Transform().translate(*location).scale(scale).rotate(rotate % 360)
+    faded.add_transform(transform)
+
+    return faded
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from collections.abc import Sequence
 from hashlib import sha3_512
 from itertools import product
@@ -6,10 +7,17 @@ from typing import Callable
 from typing import TypeAlias
 from typing import TypeVar
 
+import numpy as np
 from bitstring import BitArray
 from cytoolz.itertoolz import partition
 from lxml.etree import _Element
 
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
+from delicacy.saturn.arrays import array_rng
+from delicacy.saturn.arrays import fade_array
+from delicacy.saturn.arrays import rand_plane_array
+from delicacy.saturn.arrays import sorted_randspace_array
 from delicacy.saturn.helpers import fade
 from delicacy.saturn.helpers import generate_id
 from delicacy.saturn.helpers import make_shape
@@ -18,6 +26,7 @@ from delicacy.saturn.helpers import sorted_randspace
 from delicacy.svglib.colors.palette import PaletteFunc
 from delicacy.svglib.colors.palette import PaletteGenerator
 from delicacy.svglib.colors.palette import PREFERRED_PALETTES
+from delicacy.svglib.display import DisplayList
 from delicacy.svglib.elements.element import WrappingElement
 from delicacy.svglib.elements.peripheral.style import Fill
 from delicacy.svglib.elements.peripheral.style import Stroke
@@ -26,6 +35,9 @@ from delicacy.svglib.elements.shapes import Line
 from delicacy.svglib.elements.use import Use
 from delicacy.svglib.utils.utils import get_canvas
 from delicacy.svglib.utils.utils import linspace
+from delicacy.svglib.utils.utils import linspace_array
+from delicacy.svglib.utils.utils import wrap_tile
+from delicacy.svglib.writer import SVGWriter
 
 Canvas: TypeAlias = _Element
 MakerFunc: TypeAlias = Callable[..., Canvas]
@@ -39,34 +51,83 @@ def maker(func: MT) -> MT:
     return func
 
 
-@maker
-def Reah(
+def reah_lines(
     width: float,
     height: float,
     colors: Sequence[str],
     rng: Random,
     x_density: int = 8,
     y_density: int = 32,
-) -> Canvas:
-    canvas = get_canvas(width, height)
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> Iterator[tuple[float, float, float, float, Stroke]]:
+    """the lines of Reah, shared by its element and emit paths"""
 
     # proportional scale with respect to the standard frame of 512 x 512
     # so the patterns can appear nicely
     linewidth = height * 6.5 // 512
 
-    for y in linspace(0, height, y_density):
+    for y in linspace(0, height, y_density, endpoint=not periodic):
+        deadline.check()
         n_lines = rng.randint(1, x_density)
         x_space = sorted_randspace(rng, 0, width, n_lines * 2)
 
         for start, end in partition(2, x_space):
             stroke = Stroke(rng.choice(colors), width=linewidth, linecap="round")
-            line = Line.make_line(start, y, end, y)
-            line.add_style(stroke)
-            canvas.append(line.base)
+            yield start, y, end, y, stroke
+
+
+@maker
+def Reah(
+    width: float,
+    height: float,
+    colors: Sequence[str],
+    rng: Random,
+    x_density: int = 8,
+    y_density: int = 32,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> Canvas:
+    canvas = get_canvas(width, height)
+
+    for x1, y1, x2, y2, stroke in reah_lines(
+        width, height, colors, rng, x_density, y_density, deadline, periodic
+    ):
+        line = Line.make_line(x1, y1, x2, y2)
+        line.add_style(stroke)
+        canvas.append(line.base)
 
     return canvas
 
 
+def emit_reah(
+    writer: SVGWriter | DisplayList,
+    width: float,
+    height: float,
+    colors: Sequence[str],
+    rng: Random,
+    x_density: int = 8,
+    y_density: int = 32,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> None:
+    """Reah, emitted into writer rather than built as lxml elements
+
+    Both draw their lines from reah_lines, so an SVGWriter's bytes equal
+    the serialized canvas of Reah called with the same arguments, and a
+    DisplayList records the same scene as DisplayList.from_canvas.
+    """
+
+    for x1, y1, x2, y2, stroke in reah_lines(
+        width, height, colors, rng, x_density, y_density, deadline, periodic
+    ):
+        writer.line(x1, y1, x2, y2, stroke)
+
+
+# maker -> its emit path, which skips building lxml elements
+EMITTERS: dict[MakerFunc, Callable[..., None]] = {Reah: emit_reah}
+
+
 DIONE_OPTIONS = "rec tri cir xsh".split()
 
 
@@ -78,6 +139,8 @@ def Dione(
     rng: Random,
     x_density: int = 6,
     y_density: int = 12,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
 ) -> Canvas:
     canvas = get_canvas(width, height)
 
@@ -85,8 +148,9 @@ def Dione(
     # so the patterns can appear nicely
     scale_limit = width * 12 // 512, width * 24 // 512
 
-    for y in linspace(0, width, y_density):
+    for y in linspace(0, width, y_density, endpoint=not periodic):
         for x in sorted_randspace(rng, 0, height, x_density):
+            deadline.check()
             faded = fade(
                 rng=rng,
                 element=make_shape(option=rng.choice(DIONE_OPTIONS)),
@@ -109,6 +173,8 @@ def Tethys(
     rng: Random,
     x_density: int = 10,
     y_density: int = 10,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
 ) -> Canvas:
     side = min(width, height)
     canvas = get_canvas(side, side)
@@ -117,6 +183,7 @@ def Tethys(
     # so the patterns can appear nicely
     offset, measurement = side * 20 // 512, side * 6 // 512
 
+    # the grid keeps clear of the edges, so it needs no periodic spacing
     _range = (offset, (side // 2) - offset)
     plane = rand_plane(
         rng, _range, _range, x_density, y_density, rate=0.6  # type: ignore
@@ -126,6 +193,7 @@ def Tethys(
     grp = WrappingElement("g", id=cid)
 
     for x, y in plane:
+        deadline.check()
         color = rng.choice(colors)
         option = rng.choice(("rec", "cir", "tri"))
         shape = make_shape(measurement * 2, option, x, y)
@@ -134,6 +202,13 @@ def Tethys(
         grp.append(shape)
 
     canvas.append(grp.base)
+    mirror(canvas, cid, side)
+
+    return canvas
+
+
+def mirror(canvas: Canvas, cid: str, side: float) -> None:
+    """mirror the top-left quadrant, referenced by cid, to the other three"""
 
     flip = zip(product((0, side), repeat=2), product((1, -1), repeat=2))
     next(flip)
@@ -142,9 +217,152 @@ def Tethys(
         use = Use(cid)
         use.add_transform(Transform().translate(*translate).scale(*scale))
         canvas.append(use.base)
+
+
+# array-based makers draw their parameters from a NumPy generator
+# derived from rng (see delicacy.saturn.arrays.array_rng), so they are
+# reproducible but versioned separately from the Random-based makers above
+
+
+@maker
+def Mimas(
+    width: float,
+    height: float,
+    colors: Sequence[str],
+    rng: Random,
+    x_density: int = 8,
+    y_density: int = 32,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> Canvas:
+    """array-based Reah"""
+
+    canvas = get_canvas(width, height)
+    gen = array_rng(rng)
+
+    linewidth = height * 6.5 // 512
+
+    n_lines = gen.integers(1, x_density, endpoint=True, size=y_density)
+    ys = np.repeat(linspace_array(0, height, y_density, endpoint=not periodic), n_lines)
+    xs = sorted_randspace_array(gen, 0, width, n_lines * 2).reshape(-1, 2)
+    picks = gen.integers(len(colors), size=len(xs))
+
+    for (start, end), y, pick in zip(xs.tolist(), ys.tolist(), picks.tolist()):
+        deadline.check()
+        stroke = Stroke(colors[pick], width=linewidth, linecap="round")
+        line = Line.make_line(start, y, end, y)
+        line.add_style(stroke)
+        canvas.append(line.base)
+
+    return canvas
+
+
+@maker
+def Hyperion(
+    width: float,
+    height: float,
+    colors: Sequence[str],
+    rng: Random,
+    x_density: int = 6,
+    y_density: int = 12,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> Canvas:
+    """array-based Dione"""
+
+    canvas = get_canvas(width, height)
+    gen = array_rng(rng)
+
+    low, high = int(width * 12 // 512), int(width * 24 // 512)
+
+    ys = np.repeat(
+        linspace_array(0, width, y_density, endpoint=not periodic), x_density
+    )
+    xs = sorted_randspace_array(gen, 0, height, [x_density] * y_density)
+
+    size = len(xs)
+    options = gen.integers(len(DIONE_OPTIONS), size=size)
+    picks = gen.integers(len(colors), size=size)
+    scales = gen.integers(low, high, endpoint=True, size=size) / 100
+    nums = gen.choice((1, 3), size=size)
+    rotates = gen.integers(0, 360, endpoint=True, size=size)
+
+    params = zip(
+        xs.tolist(),
+        ys.tolist(),
+        options.tolist(),
+        picks.tolist(),
+        scales.tolist(),
+        nums.tolist(),
+        rotates.tolist(),
+    )
+
+    for x, y, option, pick, scale, num, rotate in params:
+        deadline.check()
+        faded = fade_array(
+            gen=gen,
+            element=make_shape(option=DIONE_OPTIONS[option]),
+            color=colors[pick],
+            scale=scale,
+            num=num,
+            location=(x, y),  # type: ignore
+            rotate=rotate,
+        )
+
+        canvas.append(faded.base)
+
     return canvas
 
 
+TETHYS_OPTIONS = ("rec", "cir", "tri")
+
+
+@maker
+def Enceladus(
+    width: float,
+    height: float,
+    colors: Sequence[str],
+    rng: Random,
+    x_density: int = 10,
+    y_density: int = 10,
+    deadline: Deadline = NO_DEADLINE,
+    periodic: bool = False,
+) -> Canvas:
+    """array-based Tethys"""
+
+    side = min(width, height)
+    canvas = get_canvas(side, side)
+    gen = array_rng(rng)
+
+    offset, measurement = side * 20 // 512, side * 6 // 512
+
+    _range = (offset, (side // 2) - offset)
+    plane = rand_plane_array(
+        gen, _range, _range, x_density, y_density, rate=0.6  # type: ignore
+    )
+    picks = gen.integers(len(colors), size=len(plane))
+    options = gen.integers(len(TETHYS_OPTIONS), size=len(plane))
+
+    cid = generate_id(rng.getstate())
+    grp = WrappingElement("g", id=cid)
+
+    for (x, y), pick, option in zip(plane.tolist(), picks.tolist(), options.tolist()):
+        deadline.check()
+        color = colors[pick]
+        shape = make_shape(measurement * 2, TETHYS_OPTIONS[option], x, y)
+        shape.apply_styles(Stroke(color), Fill(color))
+        grp.append(shape)
+
+    canvas.append(grp.base)
+    mirror(canvas, cid, side)
+
+    return canvas
+
+
+# makers scale their patterns relative to a 512 x 512 frame
+RECORD_SIZE = 512
+
+
 class BackgroundMaker:
     def __init__(
         self,
@@ -161,10 +379,50 @@ class BackgroundMaker:
         self.palette_gen = PaletteGenerator(palette, seed)
 
     def make(
-        self, width: float = 320, height: float = 320, n_colors: int = 4
+        self,
+        width: float = 320,
+        height: float = 320,
+        n_colors: int = 4,
+        deadline: Deadline = NO_DEADLINE,
+        tile: float | None = None,
     ) -> Canvas:
+        """In tile mode, width and height are ignored: the maker renders
+        one tile x tile canvas that wraps seamlessly, meant to be repeated
+        (see delicacy.svglib.utils.utils.tile_raster). Its rows are spaced
+        periodically, the row at 0 stands in for the one at tile.
+        """
+
+        colors = self.palette_gen.generate(n_colors, to_hex=True)
+
+        if tile is None:
+            return self.maker(width, height, colors, self.rng, deadline=deadline)
+
+        canvas = self.maker(
+            tile, tile, colors, self.rng, deadline=deadline, periodic=True
+        )
+        return wrap_tile(canvas, tile)
+
+    def record(
+        self,
+        n_colors: int = 4,
+        deadline: Deadline = NO_DEADLINE,
+        size: float = RECORD_SIZE,
+    ) -> DisplayList:
+        """run the maker once at size x size and record the scene,
+        which DisplayList.to_svg replays at any requested size
+
+        Makers with an emit path (see EMITTERS) draw straight into the
+        display list, the others are recorded from their canvas.
+        """
+
+        if (emit := EMITTERS.get(self.maker)) is None:
+            canvas = self.make(size, size, n_colors, deadline=deadline)
+            return DisplayList.from_canvas(canvas)
+
         colors = self.palette_gen.generate(n_colors, to_hex=True)
-        return self.maker(width, height, colors, self.rng)
+        display = DisplayList(size, size)
+        emit(display, size, size, colors, self.rng, deadline=deadline)
+        return display
 
     @classmethod
     def from_phrase(cls, phrase: str, maker: MakerFunc):
@@ -0,0 +1,87 @@
+"""
+Sampled scene complexity records, to correlate with rasterization time.
+
+A fraction (config.SCENE_SAMPLE_RATE) of maker calls is recorded: the
+scene's complexity (delicacy.svglib.utils.complexity) alongside how long
+the maker and the rasterizer took. Records are logged, kept in a short
+in-memory history and summed into per-maker counters.
+"""
+import logging
+from collections import deque
+from random import random
+from typing import NamedTuple
+
+from delicacy import config
+from delicacy.metrics import Counter
+from delicacy.svglib.utils.complexity import SceneStats
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 256
+
+sampled_total = Counter(
+    "delicacy_scene_samples_total", "maker calls sampled for complexity", "maker"
+)
+elements_total = Counter(
+    "delicacy_scene_elements_total", "elements in sampled scenes", "maker"
+)
+uses_total = Counter(
+    "delicacy_scene_uses_total", "<use> elements in sampled scenes", "maker"
+)
+svg_bytes_total = Counter(
+    "delicacy_scene_svg_bytes_total", "serialized size of sampled scenes", "maker"
+)
+raster_seconds_total = Counter(
+    "delicacy_scene_raster_seconds_total",
+    "rasterization time of sampled scenes",
+    "maker",
+)
+
+
+class SceneRecord(NamedTuple):
+    maker: str
+    stats: SceneStats
+    make_seconds: float
+    raster_seconds: float
+
+
+_history: deque[SceneRecord] = deque(maxlen=HISTORY_SIZE)
+
+
+def should_sample(rate: float | None = None) -> bool:
+    rate = config.SCENE_SAMPLE_RATE if rate is None else rate
+    return rate > 0 and random() < rate
+
+
+def record(
+    maker: str, stats: SceneStats, make_seconds: float, raster_seconds: float
+) -> SceneRecord:
+    entry = SceneRecord(maker, stats, make_seconds, raster_seconds)
+    _history.append(entry)
+
+    sampled_total.inc(maker)
+    elements_total.inc(maker, stats.total_elements)
+    uses_total.inc(maker, stats.uses)
+    svg_bytes_total.inc(maker, stats.serialized_bytes)
+    raster_seconds_total.inc(maker, raster_seconds)
+
+    logger.info(
+        "scene maker=%s elements=%d uses=%d fanout=%d depth=%d "
+        "attr_bytes=%d svg_bytes=%d make_ms=%.1f raster_ms=%.1f",
+        maker,
+        stats.total_elements,
+        stats.uses,
+        stats.max_fanout,
+        stats.max_depth,
+        stats.attribute_bytes,
+        stats.serialized_bytes,
+        make_seconds * 1000,
+        raster_seconds * 1000,
+    )
+
+    return entry
+
+
+def history() -> list[SceneRecord]:
+    """the most recent records, oldest first"""
+    return list(_history)
@@ -15,15 +15,25 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
+from collections.abc import Iterable
 from colorsys import hsv_to_rgb
+from functools import lru_cache
 from typing import TypeVar
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 T = TypeVar("T")
 
 HUE_MIN, HUE_MAX = HUE_RANGE = (0, 360)
 SAT_MIN, SAT_MAX = SATURATION_RANGE = (0, 100)
 VAL_MIN, VAL_MAX = VALUE_RANGE = (0, 100)
 
+# hex strings kept for distinct (hue, sat, val), out of 360 x 101 x 101
+HEX_CACHE_SIZE = 1 << 16
+
+_HEX_BYTES = tuple(f"{i:02x}" for i in range(256))
+
 
 # subclass namedtuple to override __new__,
 # which is not allowed with NamedTuple.
@@ -54,3 +64,66 @@ class HSVColor(namedtuple("HSVColor", ["hue", "sat", "val"])):
     def to_hex(self) -> str:
         # thanks to https://stackoverflow.com/a/3380754
         return "#{0:02x}{1:02x}{2:02x}".format(*self.to_rgb())
+
+
+@lru_cache(maxsize=HEX_CACHE_SIZE)
+def _hex(hue: int, sat: int, val: int) -> str:
+    return HSVColor(hue, sat, val).to_hex()
+
+
+def to_hex_many(colors: Iterable[HSVColor]) -> tuple[str, ...]:
+    """HSVColor.to_hex for several colors, through a lazily filled table"""
+
+    return tuple(_hex(*color) for color in colors)
+
+
+def hsv_array_to_rgb(hsv: ArrayLike) -> np.ndarray:
+    """convert an (n, 3) array of hue/sat/val to an (n, 3) uint8 RGB array
+
+    Values are normalized and validated like HSVColor, and the result
+    matches HSVColor.to_rgb() exactly (colorsys.hsv_to_rgb, vectorized).
+    """
+
+    hsv = np.asarray(hsv).reshape(-1, 3)
+    sat, val = hsv[:, 1], hsv[:, 2]
+
+    if np.any((sat < SAT_MIN) | (sat > SAT_MAX)):
+        raise ValueError("invalid saturation, must be in [0, 100]")
+    if np.any((val < VAL_MIN) | (val > VAL_MAX)):
+        raise ValueError("invalid value, must be in [0, 100]")
+
+    # same truncation as int() in HSVColor.__new__, all values are non-negative
+    hue = np.mod(hsv[:, 0], HUE_MAX).astype(np.int64)
+    h = hue / HUE_MAX
+    s = sat.astype(np.int64) / SAT_MAX
+    v = val.astype(np.int64) / VAL_MAX
+
+    # when s == 0, p, q and t all equal v, as in colorsys' special case
+    i = (h * 6.0).astype(np.int64)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+
+    choices = (
+        (v, t, p),
+        (q, v, p),
+        (p, v, t),
+        (p, q, v),
+        (t, p, v),
+        (v, p, q),
+    )
+    rgb = np.stack(
+        [np.choose(i, [choice[k] for choice in choices]) for k in range(3)], axis=1
+    )
+    return (rgb * 255).astype(np.uint8)
+
+
+def hsv_array_to_hex(hsv: ArrayLike) -> list[str]:
+    """convert an (n, 3) array of hue/sat/val to hex strings like HSVColor.to_hex"""
+
+    return [
+        f"#{_HEX_BYTES[r]}{_HEX_BYTES[g]}{_HEX_BYTES[b]}"
+        for r, g, b in hsv_array_to_rgb(hsv).tolist()
+    ]
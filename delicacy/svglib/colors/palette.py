@@ -29,6 +29,7 @@ from delicacy.svglib.colors.hsv import HUE_MAX
 from delicacy.svglib.colors.hsv import HUE_RANGE
 from delicacy.svglib.colors.hsv import SAT_MAX
 from delicacy.svglib.colors.hsv import SAT_MIN
+from delicacy.svglib.colors.hsv import to_hex_many
 from delicacy.svglib.colors.hsv import VAL_MAX
 from delicacy.svglib.colors.hsv import VAL_MIN
 from delicacy.svglib.utils.utils import linspace
@@ -197,5 +198,5 @@ class PaletteGenerator:
     ) -> tuple[HSVColor | str, ...]:
         colors = self.palette(num=num, rng=self.rng, *args, **kwds)
         if to_hex:
-            return tuple(c.to_hex() for c in colors)
+            return to_hex_many(colors)
         return tuple(colors)
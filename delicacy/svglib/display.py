@@ -0,0 +1,293 @@
+"""
+A display list: a flat, array-backed recording of a scene.
+
+Each primitive is one entry in a few parallel arrays (kind, four
+coordinates, a style index and a transform index), and styles and
+transforms live once in shared tables. <use> references and group
+transforms are resolved while recording, so replaying needs no tree.
+
+A display list keeps the frame it was recorded at and can be replayed
+at any size, which lets one recording per phrase and maker serve every
+requested size. Replays are serialized to SVG bytes, which any raster
+backend (materialize, RasterClient.rasterize_bytes) accepts.
+"""
+import re
+from array import array
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import numpy as np
+from lxml.etree import _Element
+from lxml.etree import Element
+from lxml.etree import fromstring
+from lxml.etree import QName
+
+from delicacy.svglib.elements.peripheral.style import Style
+from delicacy.svglib.elements.peripheral.transform import format_matrix
+from delicacy.svglib.elements.peripheral.transform import format_number
+from delicacy.svglib.elements.peripheral.transform import IDENTITY
+from delicacy.svglib.elements.peripheral.transform import Matrix
+from delicacy.svglib.elements.peripheral.transform import multiply
+from delicacy.svglib.elements.peripheral.transform import Transform
+from delicacy.svglib.writer import SVGWriter
+
+LINE, CIRCLE, RECT, PATH = range(4)
+KINDS = ("line", "circle", "rect", "path")
+
+# index used for primitives without a style or a transform
+NONE = -1
+
+# attributes holding the four coordinates of each kind
+COORDS = {
+    LINE: ("x1", "y1", "x2", "y2"),
+    CIRCLE: ("cx", "cy", "r"),
+    RECT: ("x", "y", "width", "height"),
+}
+
+_TRANSFORM_OP = re.compile(r"(\w+)\(([^)]*)\)")
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+class Primitive(NamedTuple):
+    kind: int
+    coords: tuple[float, float, float, float]
+    style: str | None
+    transform: Matrix | None
+    d: str | None = None
+
+
+def parse_transform(value: str) -> Matrix:
+    transform = Transform()
+    for name, args in _TRANSFORM_OP.findall(value):
+        params = [float(v) for v in re.split(r"[\s,]+", args.strip()) if v]
+        getattr(transform, name)(*params)
+    return transform.affine
+
+
+class DisplayList:
+    """A resolution-independent recording of a scene
+
+    display = DisplayList(512, 512)
+    display.line(0, 0, 512, 512, Stroke("red"))
+    svg = display.to_svg(128, 128)
+
+    Its line, circle, rect and path take the same arguments as
+    SVGWriter's, so a maker can emit into either.
+    """
+
+    def __init__(self, width: float = 512, height: float = 512) -> None:
+        self.width = width
+        self.height = height
+
+        self.kinds = array("B")
+        self.coords = array("d")
+        self.style_ids = array("i")
+        self.transform_ids = array("i")
+
+        self.styles: list[str] = []
+        self.transforms: list[Matrix] = []
+        self.paths: list[str] = []
+
+        self._style_index: dict[str, int] = {}
+        self._transform_index: dict[Matrix, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def nbytes(self) -> int:
+        """size of the primitive arrays, tables excluded"""
+        arrays: tuple[array, ...] = (
+            self.kinds,
+            self.coords,
+            self.style_ids,
+            self.transform_ids,
+        )
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def _style_id(self, style: str | None) -> int:
+        if not style:
+            return NONE
+        if (index := self._style_index.get(style)) is None:
+            index = self._style_index[style] = len(self.styles)
+            self.styles.append(style)
+        return index
+
+    def _transform_id(self, matrix: Matrix | None) -> int:
+        if matrix is None or matrix == IDENTITY:
+            return NONE
+        if (index := self._transform_index.get(matrix)) is None:
+            index = self._transform_index[matrix] = len(self.transforms)
+            self.transforms.append(matrix)
+        return index
+
+    def add(
+        self,
+        kind: int,
+        coords: tuple[float, float, float, float],
+        style: str | None = None,
+        transform: Matrix | None = None,
+    ) -> None:
+        self.kinds.append(kind)
+        self.coords.extend(coords)
+        self.style_ids.append(self._style_id(style))
+        self.transform_ids.append(self._transform_id(transform))
+
+    def _emit(
+        self,
+        kind: int,
+        coords: tuple[float, float, float, float],
+        styles: tuple[Style, ...],
+        transform: Transform | None,
+    ) -> None:
+        style = " ".join(str(style) for style in styles) or None
+        matrix = None if transform is None else transform.affine
+        self.add(kind, coords, style, matrix)
+
+    def line(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        *styles: Style,
+        transform: Transform | None = None,
+    ) -> None:
+        self._emit(LINE, (x1, y1, x2, y2), styles, transform)
+
+    def circle(
+        self,
+        radius: float,
+        cx: float,
+        cy: float,
+        *styles: Style,
+        transform: Transform | None = None,
+    ) -> None:
+        self._emit(CIRCLE, (cx, cy, radius, 0), styles, transform)
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        *styles: Style,
+        transform: Transform | None = None,
+    ) -> None:
+        self._emit(RECT, (x, y, width, height), styles, transform)
+
+    def path(self, d: str, *styles: Style, transform: Transform | None = None) -> None:
+        self.paths.append(d)
+        self._emit(PATH, (len(self.paths) - 1, 0, 0, 0), styles, transform)
+
+    def coords_array(self) -> np.ndarray:
+        """the coordinates as an (n, 4) array, without copying"""
+        return np.frombuffer(self.coords, dtype=np.float64).reshape(-1, 4)
+
+    def __iter__(self) -> Iterator[Primitive]:
+        coords = self.coords
+        for i, kind in enumerate(self.kinds):
+            values = tuple(coords[i * 4 : i * 4 + 4])
+            style_id, transform_id = self.style_ids[i], self.transform_ids[i]
+            yield Primitive(
+                kind,
+                values,  # type: ignore
+                None if style_id == NONE else self.styles[style_id],
+                None if transform_id == NONE else self.transforms[transform_id],
+                self.paths[int(values[0])] if kind == PATH else None,
+            )
+
+    def replay(self, writer: SVGWriter) -> None:
+        """write every primitive into writer"""
+
+        styles = self.styles
+        transforms = [format_matrix(m) for m in self.transforms]
+
+        for kind, coords, style_id, transform_id in zip(
+            self.kinds,
+            self.coords_array().tolist(),
+            self.style_ids,
+            self.transform_ids,
+        ):
+            if kind == PATH:
+                attrib = dict(d=self.paths[int(coords[0])])
+            else:
+                names = COORDS[kind]
+                attrib = dict(zip(names, map(format_number, coords)))
+
+            if style_id != NONE:
+                attrib["style"] = styles[style_id]
+            if transform_id != NONE:
+                attrib["transform"] = transforms[transform_id]
+
+            writer.element(KINDS[kind], attrib)
+
+    def to_svg(self, width: float | None = None, height: float | None = None) -> bytes:
+        """serialize the scene, scaled from its recorded frame to width x height"""
+
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        writer = SVGWriter(width, height)
+
+        if (width, height) == (self.width, self.height):
+            self.replay(writer)
+        else:
+            sx, sy = width / self.width, height / self.height
+            with writer.group(transform=Transform().scale(sx, sy)):
+                self.replay(writer)
+
+        return writer.getvalue()
+
+    def to_canvas(
+        self, width: float | None = None, height: float | None = None
+    ) -> _Element:
+        return fromstring(self.to_svg(width, height))
+
+    @classmethod
+    def from_canvas(cls, canvas: _Element) -> "DisplayList":
+        """record a canvas, resolving <use> references and group transforms"""
+
+        display = cls(float(canvas.get("width", 512)), float(canvas.get("height", 512)))
+        ids = {el.get("id"): el for el in canvas.iter() if el.get("id") is not None}
+
+        def visit(element: _Element, matrix: Matrix, style: str) -> None:
+            tag = QName(element).localname
+
+            if tag == "defs":
+                return  # only drawn through <use>
+
+            if (value := element.get("transform")) is not None:
+                matrix = multiply(matrix, parse_transform(value))
+
+            # later declarations win, so an element's own style
+            # overrides what it inherits from groups and <use>
+            if (own := element.get("style")) is not None:
+                style = f"{style} {own}".strip()
+
+            match tag:
+                case "svg" | "g":
+                    # elements only, skipping comments and processing instructions
+                    for child in element.iterchildren(Element):
+                        visit(child, matrix, style)
+                case "use":
+                    href = element.get("href") or element.get(XLINK_HREF) or ""
+                    if (ref := ids.get(href.lstrip("#"))) is None:
+                        raise ValueError(f"unresolved reference: {href}")
+                    x, y = float(element.get("x", 0)), float(element.get("y", 0))
+                    visit(ref, multiply(matrix, (1, 0, 0, 1, x, y)), style)
+                case "path":
+                    display.paths.append(element.get("d", ""))
+                    display.add(PATH, (len(display.paths) - 1, 0, 0, 0), style, matrix)
+                case "line" | "circle" | "rect":
+                    kind = KINDS.index(tag)
+                    values = [float(element.get(a, 0)) for a in COORDS[kind]]
+                    values += [0] * (4 - len(values))
+                    display.add(kind, tuple(values), style, matrix)  # type: ignore
+                case _:
+                    raise ValueError(f"unsupported element: {tag}")
+
+        # the root's own size attributes are not a transform
+        for child in canvas.iterchildren(Element):
+            visit(child, IDENTITY, "")
+
+        return display
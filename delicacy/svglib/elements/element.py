@@ -42,13 +42,13 @@ class SVGElement(ABC):
         return self._element
 
     def _element_repr(self) -> str:
-        return repr(self._element)
+        return repr(self.base)
 
     def __str__(self) -> str:
         return bytes(self).decode("utf8")
 
     def __bytes__(self) -> bytes:
-        return etree.tostring(self._element, pretty_print=True)
+        return etree.tostring(self.base, pretty_print=True)
 
     def __len__(self) -> int:
         return len(self._element)
@@ -87,8 +87,8 @@ class ExtendedElement(SVGElement):
         new = " ".join(str(style) for style in styles)
         super().set("style", new)
 
-    def add_transform(self, transform: Transform) -> None:
-        value = transform()
+    def add_transform(self, transform: Transform, verbose: bool = False) -> None:
+        value = transform(verbose)
         if value == "":
             raise ValueError("empty transform")
         super().set("transform", value)
@@ -110,7 +110,7 @@ class WrappingElement(ExtendedElement):
         return self
 
     def append(self, element: SVGElement) -> None:
-        self._element.append(element._element)
+        self._element.append(element.base)
 
 
 def wraps(tag, *childs, **kwds):
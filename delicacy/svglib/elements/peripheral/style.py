@@ -16,7 +16,10 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import re
 from abc import ABC
+from abc import ABCMeta
+from functools import lru_cache
 from typing import Any
+from typing import cast
 from typing import Iterator
 
 from attrs import asdict
@@ -39,8 +42,38 @@ def cast_float(item: str):
         return str(item)
 
 
-class Style(ABC):
-    __slots__: tuple[str] = tuple()  # type: ignore
+# number of distinct (class, arguments) combinations kept interned
+STYLE_CACHE_SIZE = 4096
+
+
+class StyleMeta(ABCMeta):
+    """Intern styles: the same class and arguments give the same instance
+
+    Styles are immutable, so makers that create one per element share a
+    handful of instances, and validation and serialization run once each.
+    """
+
+    def __call__(cls, *args, **kwds):
+        try:
+            hash((args, *kwds.items()))
+        except TypeError:
+            # unhashable arguments, build a style that is not interned
+            return super().__call__(*args, **kwds)
+
+        return _intern(cls, *args, **kwds)
+
+
+# typed so that 1 and 1.0, which serialize differently, are kept apart
+@lru_cache(maxsize=STYLE_CACHE_SIZE, typed=True)
+def _intern(cls: StyleMeta, *args, **kwds) -> "Style":
+    return cast(Style, ABCMeta.__call__(cls, *args, **kwds))
+
+
+class Style(ABC, metaclass=StyleMeta):
+    # caches of the serialized text and dict, filled on first use
+    __slots__: tuple[str, ...] = ("_text", "_dict")
+    _text: str
+    _dict: dict[str, Any]
 
     @classmethod
     def name(cls) -> str:
@@ -55,18 +88,32 @@ class Style(ABC):
         return (self.get_prop_name(prop) for prop in self.__slots__)
 
     def __str__(self) -> str:
+        try:
+            return self._text
+        except AttributeError:
+            pass
+
         values = tuple(getattr(self, attr) for attr in self.__slots__)
         output = (
             f"{prop}: {value};"
             for prop, value in zip(self.props, values)
             if value is not None
         )
-        return " ".join(output)
+        text = " ".join(output)
+        object.__setattr__(self, "_text", text)
+        return text
 
     def to_dict(self) -> dict[str, Any]:
+        try:
+            return dict(self._dict)
+        except AttributeError:
+            pass
+
         prop_map = keymap(self.get_prop_name)
         filter_none = valfilter(lambda x: x is not None)
-        return pipe(self, asdict, prop_map, filter_none)  # type: ignore
+        style_dict = pipe(self, asdict, prop_map, filter_none)
+        object.__setattr__(self, "_dict", style_dict)
+        return dict(style_dict)
 
     @staticmethod
     def parse(style_str: str, filter_by: str | None = None) -> dict[str, str]:
@@ -14,52 +14,122 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import Any
+from math import cos
+from math import radians
+from math import sin
+from math import tan
+from typing import TypeVar
 
 from delicacy.svglib.utils.chain import chainable
 
+# (a, b, c, d, e, f) as in SVG matrix(a,b,c,d,e,f)
+Matrix = tuple[float, float, float, float, float, float]
+IDENTITY: Matrix = (1, 0, 0, 1, 0, 0)
+
+# decimals kept when a chain is folded into matrix(...)
+MATRIX_PRECISION = 6
+
+N = TypeVar("N")
+
+
+def multiply(m: Matrix, n: Matrix) -> Matrix:
+    """m x n, the transform that applies n first and then m"""
+
+    ma, mb, mc, md, me, mf = m
+    na, nb, nc, nd, ne, nf = n
+    return (
+        ma * na + mc * nb,
+        mb * na + md * nb,
+        ma * nc + mc * nd,
+        mb * nc + md * nd,
+        ma * ne + mc * nf + me,
+        mb * ne + md * nf + mf,
+    )
+
+
+def format_number(value: float) -> str:
+    text = f"{value:.{MATRIX_PRECISION}f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def format_matrix(matrix: Matrix) -> str:
+    return "matrix({})".format(",".join(map(format_number, matrix)))
+
 
 class Transform:
+    """A chain of SVG transform operations
+
+    The operations are kept both as text and as one affine matrix.
+    Calling a transform returns the text of a single operation as is,
+    and folds a chain of several into one matrix(...) unless verbose.
+    """
+
     def __init__(self):
         self._storage = ""
+        self._ops = 0
+        self._matrix: Matrix = IDENTITY
 
     @chainable.updater
-    def _update(self, value: Any) -> None:
-        self._storage += value
+    def _update(self, value: tuple[str, Matrix]) -> None:
+        text, matrix = value
+        self._storage += text
+        self._ops += 1
+        self._matrix = multiply(self._matrix, matrix)
 
     @chainable
-    def translate(self, x: float, y: float | None = None) -> str:
+    def translate(self, x: float, y: float | None = None) -> tuple[str, Matrix]:
         y = 0 if y is None else y
-        return f" translate({x},{y})"
+        return f" translate({x},{y})", (1, 0, 0, 1, x, y)
 
     @chainable
     def rotate(
         self, angle: float, x: float | None = None, y: float | None = None
-    ) -> str:
+    ) -> tuple[str, Matrix]:
+        theta = radians(angle)
+        rotation = (cos(theta), sin(theta), -sin(theta), cos(theta), 0, 0)
+
         if x is None and y is None:
-            return f" rotate({angle})"
-        elif (x is None) ^ (y is None):
+            return f" rotate({angle})", rotation
+        elif x is None or y is None:
             msg = "x and y must either have values or be None simutanously"
             raise ValueError(msg)
         else:
-            return f" rotate({angle},{x},{y})"
+            # rotate around (x, y): translate(x, y) rotate(angle) translate(-x, -y)
+            around = multiply((1, 0, 0, 1, x, y), rotation)
+            around = multiply(around, (1, 0, 0, 1, -x, -y))
+            return f" rotate({angle},{x},{y})", around
 
     @chainable
-    def scale(self, x: float, y: float | None = None) -> str:
+    def scale(self, x: float, y: float | None = None) -> tuple[str, Matrix]:
         y = x if y is None else y
-        return f" scale({x},{y})"
+        return f" scale({x},{y})", (x, 0, 0, y, 0, 0)
 
     @chainable
-    def skewX(self, x: int) -> str:
-        return f" skewX({x})"
+    def skewX(self, x: int) -> tuple[str, Matrix]:
+        return f" skewX({x})", (1, 0, tan(radians(x)), 1, 0, 0)
 
     @chainable
-    def skewY(self, y: int) -> str:
-        return f" skewY({y})"
+    def skewY(self, y: int) -> tuple[str, Matrix]:
+        return f" skewY({y})", (1, tan(radians(y)), 0, 1, 0, 0)
 
     @chainable
-    def matrix(self, a: float, b: float, c: float, d: float, e: float, f: float) -> str:
-        return f" matrix({a},{b},{c},{d},{e},{f})"
+    def matrix(
+        self, a: float, b: float, c: float, d: float, e: float, f: float
+    ) -> tuple[str, Matrix]:
+        return f" matrix({a},{b},{c},{d},{e},{f})", (a, b, c, d, e, f)
+
+    @property
+    def affine(self) -> Matrix:
+        """the whole chain as (a, b, c, d, e, f)"""
+        return self._matrix
+
+    def apply(self, x: N, y: N) -> tuple[N, N]:
+        """map coordinates (numbers or NumPy arrays) through the transform"""
+
+        a, b, c, d, e, f = self._matrix
+        return a * x + c * y + e, b * x + d * y + f  # type: ignore
 
-    def __call__(self) -> str:
-        return self._storage.lstrip()
+    def __call__(self, verbose: bool = False) -> str:
+        if verbose or self._ops <= 1:
+            return self._storage.lstrip()
+        return format_matrix(self._matrix)
@@ -1,12 +1,16 @@
 from collections.abc import Callable
 from collections.abc import Iterable
+from collections.abc import Sequence
+from functools import wraps
 from itertools import chain
 from math import radians
 from math import tan
+from typing import Any
 from typing import cast
 
 from attrs import define
-from decorator import decorator
+from attrs import field
+from lxml.etree import _Element
 from lxml.etree import Element
 
 from delicacy.svglib.elements.element import ExtendedElement
@@ -48,17 +52,68 @@ class Line(ExtendedElement):
         return cls((x1, y1), (x2, y2))  # type: ignore
 
 
-@decorator
-def relative(func: Callable[..., str], *args, **kwds):
-    result = func(*args, **kwds)
-    return result.lower()
+def relative(func: Callable[..., str]) -> Callable[..., str]:
+    @wraps(func)
+    def wrapper(*args, **kwds) -> str:
+        return func(*args, **kwds).lower()
+
+    return wrapper
+
+
+PATH_COMMANDS = frozenset("MmLlQqCcAaZz")
 
 
 @define
 class Path(ExtendedElement):
+    """SVG path built from chained commands
+
+    Commands are buffered and written to the `d` attribute in one go
+    whenever the underlying element is read, so building a path
+    takes linear time in the number of commands. Once the element has
+    been handed out through `base`, e.g. to be appended to a canvas,
+    it may be serialized without this path, so later commands are
+    written straight away.
+    """
+
+    _commands: list[str] = field(factory=list, init=False, repr=False)
+    _exposed: bool = field(default=False, init=False, repr=False)
+
     def __attrs_post_init__(self) -> None:
         self._element = Element("path", d="")
 
+    @classmethod
+    def from_commands(cls, commands: Iterable[Sequence[Any]]) -> "Path":
+        """build a path from (command, *args) items in one call
+
+        Path.from_commands([("M", 0, 0), ("l", 10, 10), ("z",)])
+        """
+        path = cls()
+        for name, *args in commands:
+            if name not in PATH_COMMANDS:
+                raise ValueError(f"unknown path command: {name!r}")
+            path._commands.append(getattr(cls, name).target(path, *args))
+        return path
+
+    def _flush(self) -> None:
+        if self._commands:
+            d = self._element.get("d") or ""
+            self._element.set("d", (d + "".join(self._commands)).lstrip())
+            self._commands.clear()
+
+    @property
+    def base(self) -> _Element:
+        self._flush()
+        self._exposed = True
+        return self._element
+
+    def set(self, attr: str, value: Any) -> None:
+        self._flush()
+        self._element.set(attr, value)
+
+    def get(self, attr: str) -> str | None:
+        self._flush()
+        return self._element.get(attr)
+
     @property
     def d(self):
         """SVG Path defines path operations inside an attribute named `d`"""
@@ -66,7 +121,9 @@ class Path(ExtendedElement):
 
     @chainable.updater
     def _update(self, value: str) -> None:
-        self._element.set("d", (self.d + value).lstrip())
+        self._commands.append(value)
+        if self._exposed:
+            self._flush()
 
     @chainable
     def M(self, x: float, y: float) -> str:
@@ -15,6 +15,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from collections.abc import Callable
+from functools import update_wrapper
+from types import MethodType
 from typing import NoReturn
 from typing import TypeVar
 
@@ -48,6 +50,11 @@ class _updater:
         return self.target
 
 
+def _unmanaged(instance, *args, **kwds) -> NoReturn:
+    # stands in for the chained method until __set_name__ has run
+    raise AttributeError("chainable must be used in class definition")
+
+
 class chainable:
     """A descriptor to chain method calls"""
 
@@ -61,6 +68,7 @@ class chainable:
 
         self.target = target
         self.managed_updater = None
+        self._chained: Callable = _unmanaged
 
     def __set_name__(self, owner: type, name: str) -> None:
         ups: dict = valfilter(lambda x: isinstance(x, _updater), owner.__dict__)
@@ -71,6 +79,15 @@ class chainable:
 
         self.managed_updater = ups.values().__iter__().__next__()
 
+        # build the chained method once, so calls skip the descriptor lookups
+        target, update = self.target, self.managed_updater.target  # type: ignore
+
+        def chained_method(instance, *args, **kwds):
+            update(instance, target(instance, *args, **kwds))
+            return instance
+
+        self._chained = update_wrapper(chained_method, target)
+
     def __set__(self, instance, value) -> NoReturn:
         raise AttributeError("setter not available for chained methods")
 
@@ -78,26 +95,15 @@ class chainable:
         if instance is None:
             return self
 
-        # invoke self.__call__ to get a chainable method and return it
-        return self(instance)
+        # Binding allocates a method per access, as it does for a plain
+        # function; the descriptor adds the Python-level call around it.
+        # It stays a data descriptor, rather than installing the chained
+        # function on the owner in __set_name__, so chained methods remain
+        # read-only on instances, the class attribute keeps exposing the
+        # chainable (and its target), and _updater.__set_name__ still finds
+        # the chainables whatever order they are declared in.
+        return MethodType(self._chained, instance)
 
     def __call__(self, instance: T) -> Callable[..., T]:
         # this will replace the decorated target in chainable classes
-        def chained_method(*args, **kwds) -> T:
-            # prepend instance in self.target call
-            # because target is passed as a function
-            value = self.target(instance, *args, **kwds)
-
-            # use chainable in class definition allows __set_name__ to run
-            # __set_name__ is responisble for initialzing managed_updater
-            # otherwise managed_updater is None
-            if self.managed_updater is None:
-                msg = "chainable must be used in class definition"
-                raise AttributeError(msg)
-
-            # call __get__ to retrieve the underlying method
-            self.managed_updater.__get__(instance)(instance, value)  # type: ignore
-
-            return instance
-
-        return chained_method
+        return MethodType(self._chained, instance)
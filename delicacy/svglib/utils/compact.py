@@ -0,0 +1,146 @@
+"""
+Compact serialization of canvases.
+
+Makers write every float with full repr precision and repeat the same
+inline style string on every element. compact() rounds numbers, drops
+style properties that only restate an SVG default and moves repeated
+styles into a <style> block with short class names, so the rasterizer
+has fewer bytes to parse.
+"""
+import re
+from collections import Counter
+from copy import deepcopy
+from functools import partial
+
+from attrs import field
+from attrs import frozen
+from attrs.validators import ge
+from attrs.validators import optional
+from lxml.etree import _Element
+from lxml.etree import Element
+from lxml.etree import tostring
+
+# attributes made of numbers (and path commands) only
+NUMERIC_ATTRS = frozenset(
+    "x y x1 y1 x2 y2 cx cy r rx ry width height d points transform".split()
+)
+
+# values an element gets anyway when the property is not set at all
+DEFAULT_STYLES = {
+    "fill": "black",
+    "fill-opacity": "1",
+    "fill-rule": "nonzero",
+    "stroke-opacity": "1",
+    "stroke-width": "1",
+    "stroke-linecap": "butt",
+    "opacity": "1",
+}
+
+COLOR_PROPS = frozenset(("fill", "stroke", "color", "stop-color"))
+
+NUMBER = re.compile(r"-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+
+
+# decimals numbers are rounded to, None keeps them as written
+DEFAULT_PRECISION: int | None = 3
+
+
+@frozen
+class Compaction:
+    precision: int | None = field(default=DEFAULT_PRECISION, validator=optional(ge(0)))
+    drop_defaults: bool = True
+    hoist_styles: bool = True
+
+
+def _round(precision: int, match: re.Match) -> str:
+    text = f"{round(float(match.group()), precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _declarations(style: str) -> list[tuple[str, str]]:
+    items = (item.split(":", 1) for item in style.split(";") if ":" in item)
+    return [(prop.strip(), value.strip()) for prop, value in items]
+
+
+def _referenced(canvas: _Element) -> set[str]:
+    hrefs = (use.get("href") or "" for use in canvas.iter("use"))
+    return {href[1:] for href in hrefs if href.startswith("#")}
+
+
+def _short_name(index: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    name = ""
+    while True:
+        index, rem = divmod(index, len(digits))
+        name = digits[rem] + name
+        if index == 0:
+            return "s" + name
+
+
+def compact(canvas: _Element, options: Compaction = Compaction()) -> bytes:
+    """serialize a compacted copy of canvas, leaving canvas untouched"""
+
+    canvas = deepcopy(canvas)
+    number = None if options.precision is None else partial(_round, options.precision)
+    referenced = _referenced(canvas) if options.drop_defaults else set()
+
+    def visit(element: _Element, overridden: frozenset[str], shared: bool) -> None:
+        # overridden: properties an ancestor sets to a non-default value,
+        # shared: element is inside a subtree that <use> elements reference
+        shared = shared or element.get("id") in referenced
+
+        if number is not None:
+            for attr in NUMERIC_ATTRS.intersection(element.attrib):
+                element.set(attr, NUMBER.sub(number, element.get(attr, "")))
+
+        if (style := element.get("style")) is not None:
+            kept = []
+            for prop, value in _declarations(style):
+                if number is not None and prop not in COLOR_PROPS:
+                    value = NUMBER.sub(number, value)
+
+                is_default = DEFAULT_STYLES.get(prop) == value
+                if is_default and options.drop_defaults:
+                    if not shared and prop not in overridden:
+                        continue
+                elif not is_default:
+                    overridden = overridden | {prop}
+
+                kept.append(f"{prop}:{value}")
+
+            if kept:
+                element.set("style", ";".join(kept))
+            else:
+                del element.attrib["style"]
+
+        for child in element:
+            visit(child, overridden, shared)
+
+    visit(canvas, frozenset(), False)
+
+    if options.hoist_styles:
+        _hoist(canvas)
+
+    return tostring(canvas)
+
+
+def _hoist(canvas: _Element) -> None:
+    styled = [el for el in canvas.iter() if el.get("style") is not None]
+    counts = Counter(el.get("style") for el in styled)
+    repeated = [style for style, count in counts.most_common() if count > 1]
+
+    if not repeated:
+        return
+
+    names = {style: _short_name(i) for i, style in enumerate(repeated)}
+
+    for element in styled:
+        if (name := names.get(element.get("style"))) is not None:
+            del element.attrib["style"]
+            element.set("class", name)
+
+    rules = Element("style")
+    rules.text = "".join(f".{name}{{{style}}}" for style, name in names.items())
+    canvas.insert(0, rules)
@@ -0,0 +1,68 @@
+"""
+Scene complexity of a canvas.
+
+scene_stats walks a canvas once and reports what tends to drive
+rasterization cost: how many elements of each kind it holds, how many
+<use> elements re-draw referenced content, how deep the tree goes and
+how many bytes its attributes and serialized form take.
+"""
+from collections import Counter
+
+from attrs import frozen
+from lxml import etree
+from lxml.etree import _Element
+from lxml.etree import QName
+
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+@frozen
+class SceneStats:
+    elements: dict[str, int]
+    uses: int
+    # most <use> elements pointing at the same id
+    max_fanout: int
+    max_depth: int
+    attribute_bytes: int
+    serialized_bytes: int
+
+    @property
+    def total_elements(self) -> int:
+        return sum(self.elements.values())
+
+
+def scene_stats(canvas: _Element, serialized: bytes | None = None) -> SceneStats:
+    """walk canvas once; serialized, if given, saves serializing it again"""
+
+    tags: Counter[str] = Counter()
+    refs: Counter[str] = Counter()
+    depth = max_depth = attribute_bytes = 0
+
+    for event, element in etree.iterwalk(canvas, events=("start", "end")):
+        if event == "end":
+            depth -= 1
+            continue
+
+        depth += 1
+        max_depth = max(max_depth, depth)
+
+        tag = QName(element).localname
+        tags[tag] += 1
+
+        attrib = element.attrib
+        attribute_bytes += sum(len(k) + len(v) for k, v in attrib.items())
+
+        if tag == "use":
+            refs[attrib.get("href") or attrib.get(XLINK_HREF) or ""] += 1
+
+    if serialized is None:
+        serialized = etree.tostring(canvas)
+
+    return SceneStats(
+        elements=dict(tags),
+        uses=tags["use"],
+        max_fanout=max(refs.values(), default=0),
+        max_depth=max_depth,
+        attribute_bytes=attribute_bytes,
+        serialized_bytes=len(serialized),
+    )
@@ -0,0 +1,80 @@
+"""
+Named quality tiers for rasterizing canvases.
+
+A tier decides whether shapes are anti-aliased, how many times larger
+than requested the SVG is rasterized (supersampling, i.e. a higher
+rendering density) and which filter scales a supersampled raster back
+down. STANDARD is ImageMagick's default behaviour.
+
+Draft suits small list-view icons, high suits large avatars; run
+benchmarks.bench_quality for the latency and image difference of each
+tier with every maker, which depend on the ImageMagick build and the
+SVG reader it delegates to.
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from attrs import field
+from attrs import frozen
+from attrs.validators import ge
+from attrs.validators import in_
+from lxml.etree import _Element
+
+FILTERS = ("point", "triangle", "mitchell", "lanczos")
+
+
+@frozen
+class Quality:
+    name: str
+    antialias: bool = True
+    supersample: int = field(default=1, validator=ge(1))
+    filter: str = field(default="triangle", validator=in_(FILTERS))
+
+
+DRAFT = Quality("draft", antialias=False)
+STANDARD = Quality("standard")
+HIGH = Quality("high", supersample=2, filter="lanczos")
+
+QUALITIES = {quality.name: quality for quality in (DRAFT, STANDARD, HIGH)}
+
+
+def get_quality(name: str) -> Quality:
+    try:
+        return QUALITIES[name]
+    except KeyError:
+        raise ValueError(f"unknown quality: {name}") from None
+
+
+def canvas_size(canvas: _Element) -> tuple[int, int]:
+    return int(float(canvas.get("width", 512))), int(float(canvas.get("height", 512)))
+
+
+@contextmanager
+def supersampled(canvas: _Element, factor: int) -> Iterator[_Element]:
+    """temporarily enlarge canvas's viewport by factor, keeping its drawing
+
+    Scaling the viewport rather than the reader's density gives the same
+    result whichever SVG reader ImageMagick delegates to.
+    """
+
+    if factor == 1:
+        yield canvas
+        return
+
+    original = {key: canvas.get(key) for key in ("width", "height", "viewBox")}
+    width, height = canvas_size(canvas)
+
+    if original["viewBox"] is None:
+        canvas.set("viewBox", f"0 0 {original['width']} {original['height']}")
+    canvas.set("width", str(width * factor))
+    canvas.set("height", str(height * factor))
+
+    try:
+        yield canvas
+    finally:
+        for key, value in original.items():
+            if value is None:
+                if key in canvas.attrib:
+                    del canvas.attrib[key]
+            else:
+                canvas.set(key, value)
@@ -14,19 +14,44 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from collections.abc import Iterable
 from collections.abc import Iterator
-from io import BytesIO
 from itertools import count
+from itertools import product
 from typing import NamedTuple
 
+import numpy as np
 from cytoolz.itertoolz import take
 from lxml import etree
 from lxml.etree import _Element
 from lxml.etree import Element
+from lxml.etree import SubElement
 from lxml.etree import tostring
 from PIL import Image as PILImange
 from wand import image as WandImage
 
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
+from delicacy.svglib.utils.compact import compact
+from delicacy.svglib.utils.compact import Compaction
+from delicacy.svglib.utils.quality import canvas_size
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.quality import supersampled
+
+
+# ImageMagick reader used by materialize, see delicacy.raster.delegates
+_svg_format = "svg"
+
+
+def svg_format() -> str:
+    return _svg_format
+
+
+def use_svg_format(name: str) -> None:
+    global _svg_format
+    _svg_format = name.lower()
+
 
 class Size(NamedTuple):
     width: float
@@ -44,7 +69,32 @@ def get_canvas(width: float = 512, height: float = 512, **kwds: str) -> _Element
     return Element("svg", attrib=tag, nsmap=nsmap)
 
 
-def linspace(start: float, stop: float, n_samples: int) -> Iterator[float]:
+def wrap_tile(canvas: _Element, size: float, id: str = "tile") -> _Element:
+    """turn a size x size canvas into a seamlessly wrapping tile
+
+    The content is grouped and repeated in the 8 neighbouring tiles,
+    so primitives crossing an edge reappear on the opposite edge.
+    """
+
+    tile = Element("g", id=id)
+    tile.extend(list(canvas))
+    canvas.append(tile)
+
+    for x, y in product((-size, 0, size), repeat=2):
+        if x == y == 0:
+            continue
+        SubElement(canvas, "use", href=f"#{id}", x=str(x), y=str(y))
+
+    return canvas
+
+
+def linspace(
+    start: float, stop: float, n_samples: int, endpoint: bool = True
+) -> Iterator[float]:
+    """n_samples evenly spaced from start to stop, or up to but excluding
+    stop if not endpoint, which spaces samples periodically
+    """
+
     if start >= stop:
         raise ValueError("start must be less than stop")
     if n_samples < 0:
@@ -52,22 +102,108 @@ def linspace(start: float, stop: float, n_samples: int) -> Iterator[float]:
     elif n_samples == 0:
         return iter(())
 
-    step = (stop - start) / (n_samples - 1)
+    step = (stop - start) / (n_samples - 1 if endpoint else n_samples)
     space = take(n_samples, count(start, step))
 
     return (round(i, 3) for i in space)
 
 
+def linspace_array(
+    start: float, stop: float, n_samples: int, endpoint: bool = True
+) -> np.ndarray:
+    """array-based counterpart of linspace, rounded to the same precision"""
+
+    if start >= stop:
+        raise ValueError("start must be less than stop")
+    if n_samples < 0:
+        raise ValueError("number of samples, must be non-negative")
+
+    return np.linspace(start, stop, n_samples, endpoint=endpoint).round(3)
+
+
 def eprint(element: _Element, **kwds) -> None:
     msg = etree.tostring(element, pretty_print=True).decode("utf8")
     print(msg, **kwds)
 
 
-def materialize(canvas: _Element, background: str | None = None) -> WandImage.Image:
-    blob = tostring(canvas)
-    return WandImage.Image(blob=blob, format="svg", background=background)
+def materialize(
+    canvas: _Element,
+    background: str | None = None,
+    deadline: Deadline = NO_DEADLINE,
+    compaction: Compaction | None = None,
+    quality: Quality = STANDARD,
+) -> WandImage.Image:
+    with supersampled(canvas, quality.supersample):
+        blob = tostring(canvas) if compaction is None else compact(canvas, compaction)
+    deadline.check()
+
+    if quality == STANDARD:
+        return WandImage.Image(blob=blob, format=_svg_format, background=background)
+
+    image = WandImage.Image()
+    try:
+        # anti-aliasing only applies if it is set before reading
+        image.antialias = quality.antialias
+        image.read(blob=blob, format=_svg_format, background=background)
+
+        if quality.supersample > 1:
+            deadline.check()
+            image.resize(*canvas_size(canvas), filter=quality.filter)
+    except BaseException:
+        image.close()
+        raise
+
+    return image
+
+
+def materialize_many(
+    canvases: Iterable[_Element], background: str | None = None
+) -> list[WandImage.Image]:
+    """rasterize many canvases through a single ImageMagick image sequence,
+    paying the per-call setup once rather than once per canvas
+    """
+
+    with WandImage.Image() as batch:
+        for canvas in canvases:
+            batch.read(blob=tostring(canvas), format=_svg_format, background=background)
+
+        return [WandImage.Image(image=frame) for frame in batch.sequence]
+
+
+def tile_raster(tile: WandImage.Image, width: float, height: float) -> WandImage.Image:
+    """fill a width x height raster by repeating a tile raster"""
+
+    filled = WandImage.Image(width=int(width), height=int(height))
+    filled.texture(tile)
+    return filled
+
+
+def tile_image(tile: PILImange.Image, width: float, height: float) -> PILImange.Image:
+    """tile_raster, for a PIL image"""
+
+    filled = PILImange.new(tile.mode, (int(width), int(height)))
+    for y in range(0, filled.height, tile.height):
+        for x in range(0, filled.width, tile.width):
+            filled.paste(tile, (x, y))
+    return filled
+
+
+def wand_pixels(wand_image: WandImage.Image) -> tuple[str, bytes]:
+    """the PIL mode and raw 8-bit pixels of wand_image"""
+
+    mode = "RGBA" if wand_image.alpha_channel else "RGB"
+
+    if wand_image.depth == 8:
+        return mode, wand_image.make_blob(mode)
+
+    # export 8-bit samples without changing the caller's image
+    with wand_image.clone() as img:
+        img.depth = 8
+        return mode, img.make_blob(mode)
 
 
 def wand2pil(wand_image: WandImage.Image) -> PILImange.Image:
-    bytesio = BytesIO(wand_image.make_blob("png"))
-    return PILImange.open(bytesio)
+    """hand the raw pixels over to PIL, without a PNG encode and decode"""
+
+    mode, blob = wand_pixels(wand_image)
+    return PILImange.frombuffer(mode, wand_image.size, blob, "raw", mode, 0, 1)
@@ -0,0 +1,157 @@
+"""
+A streaming SVG writer.
+
+Makers can emit primitives straight into a text buffer instead of building
+an attrs object and an lxml element per primitive. The output is the same
+as serializing the equivalent SVGElement tree with lxml.etree.tostring.
+"""
+from collections.abc import Iterator
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from delicacy.svglib.elements.peripheral.style import Style
+from delicacy.svglib.elements.peripheral.transform import Transform
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "\n": "&#10;",
+        "\r": "&#13;",
+        "\t": "&#9;",
+    }
+)
+
+
+def _attrs(attrib: Mapping[str, Any]) -> str:
+    return "".join(
+        f' {key}="{str(value).translate(_ESCAPES)}"' for key, value in attrib.items()
+    )
+
+
+def _extras(styles: tuple[Style, ...], transform: Transform | None) -> dict[str, str]:
+    extras = {}
+    if styles:
+        extras["style"] = " ".join(str(style) for style in styles)
+    if transform is not None:
+        extras["transform"] = transform()
+    return extras
+
+
+class SVGWriter:
+    """Build SVG bytes incrementally
+
+    writer = SVGWriter(512, 512)
+    with writer.group(id="shapes"):
+        writer.circle(10, 20, 20, Stroke("red"))
+    svg = writer.getvalue()
+    """
+
+    def __init__(self, width: float = 512, height: float = 512, **kwds: str) -> None:
+        attrib = dict(width=width, height=height, xmlns=SVG_NS, **kwds)
+        # mirrors get_canvas, which lxml writes with the xlink namespace first
+        self._parts = [f'<svg xmlns:xlink="{XLINK_NS}"{_attrs(attrib)}>']
+        self._open: list[tuple[str, int]] = []
+
+    def element(self, tag: str, attrib: Mapping[str, Any]) -> None:
+        """write an element without children"""
+        self._parts.append(f"<{tag}{_attrs(attrib)}/>")
+
+    def start(self, tag: str, attrib: Mapping[str, Any]) -> None:
+        self._open.append((tag, len(self._parts)))
+        self._parts.append(f"<{tag}{_attrs(attrib)}>")
+
+    def end(self) -> None:
+        tag, index = self._open.pop()
+
+        if index == len(self._parts) - 1:
+            # no children were written, lxml self-closes empty elements
+            self._parts[index] = self._parts[index][:-1] + "/>"
+        else:
+            self._parts.append(f"</{tag}>")
+
+    @contextmanager
+    def wrap(self, tag: str, **kwds: Any) -> Iterator["SVGWriter"]:
+        self.start(tag, kwds)
+        try:
+            yield self
+        finally:
+            self.end()
+
+    def group(self, transform: Transform | None = None, **kwds: Any):
+        return self.wrap("g", **kwds, **_extras((), transform))
+
+    def defs(self, **kwds: Any):
+        return self.wrap("defs", **kwds)
+
+    def circle(
+        self,
+        radius: float,
+        cx: float,
+        cy: float,
+        *styles: Style,
+        transform: Transform | None = None,
+    ) -> None:
+        attrib = dict(cx=cx, cy=cy, r=radius)
+        self.element("circle", attrib | _extras(styles, transform))
+
+    def line(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        *styles: Style,
+        transform: Transform | None = None,
+    ) -> None:
+        attrib = dict(x1=x1, y1=y1, x2=x2, y2=y2)
+        self.element("line", attrib | _extras(styles, transform))
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        *styles: Style,
+        corner_radius: tuple[float, float] = (0, 0),
+        transform: Transform | None = None,
+    ) -> None:
+        rx, ry = corner_radius
+        attrib = dict(x=x, y=y, width=width, height=height, rx=rx, ry=ry)
+        self.element("rect", attrib | _extras(styles, transform))
+
+    def path(self, d: str, *styles: Style, transform: Transform | None = None) -> None:
+        self.element("path", dict(d=d) | _extras(styles, transform))
+
+    def use(
+        self,
+        href: str,
+        x: float = 0,
+        y: float = 0,
+        *styles: Style,
+        size: tuple[float, float] | None = None,
+        transform: Transform | None = None,
+    ) -> None:
+        attrib: dict[str, Any] = dict(href=f"#{href}", x=x, y=y)
+        if size is not None:
+            attrib.update(width=size[0], height=size[1])
+        self.element("use", attrib | _extras(styles, transform))
+
+    def getvalue(self) -> bytes:
+        if self._open:
+            raise ValueError(f"unclosed element: {self._open[-1][0]}")
+
+        if len(self._parts) == 1:
+            svg = self._parts[0][:-1] + "/>"
+        else:
+            svg = "".join(self._parts) + "</svg>"
+
+        # lxml.etree.tostring writes ASCII with character references
+        return svg.encode("ascii", "xmlcharrefreplace")
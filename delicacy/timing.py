@@ -0,0 +1,73 @@
+"""
+Per-stage wall-clock timings of a render.
+
+create() reports how long each stage of a request took (drawing the
+character, making and rasterizing the scene, compositing, encoding) so
+work moved or removed between stages shows up per request, in the
+Server-Timing header of /make, and in aggregate on /metrics.
+
+Some stages overlap: the character is drawn in another thread while the
+scene is made and rasterized, and the join stage measures how long the
+request then waited for it. Such stages are recorded as overlapped and
+left out of the total, which is the critical path of the request.
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+from delicacy.metrics import Counter
+
+stage_seconds_total = Counter(
+    "delicacy_stage_seconds_total",
+    "wall-clock seconds spent in each render stage",
+    label="stage",
+)
+
+
+class Timings:
+    """Seconds spent in each stage of one render
+
+    timings = Timings()
+    with timings.stage("encode"):
+        ...
+    timings.stages  # {"encode": 0.0021}
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        # stages run alongside the critical path
+        self.overlapped: set[str] = set()
+
+    @contextmanager
+    def stage(self, name: str, overlapped: bool = False) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start, overlapped)
+
+    def add(self, name: str, seconds: float, overlapped: bool = False) -> None:
+        self.stages[name] = self.stages.get(name, 0) + seconds
+        if overlapped:
+            self.overlapped.add(name)
+        stage_seconds_total.inc(name, seconds)
+
+    @property
+    def total(self) -> float:
+        """seconds on the critical path, overlapped stages left out"""
+        return sum(
+            seconds
+            for name, seconds in self.stages.items()
+            if name not in self.overlapped
+        )
+
+    def server_timing(self) -> str:
+        """the stages as a Server-Timing header value, in milliseconds;
+        overlapped stages are described as such, so they aren't summed
+        """
+
+        def metric(name: str, seconds: float) -> str:
+            desc = ';desc="overlapped"' if name in self.overlapped else ""
+            return f"{name};dur={seconds * 1000:.2f}{desc}"
+
+        return ", ".join(metric(name, seconds) for name, seconds in self.stages.items())
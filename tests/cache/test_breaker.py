@@ -0,0 +1,85 @@
+import pytest
+
+from delicacy.cache.breaker import CircuitBreaker
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=3, reset_after=10, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.failure()
+    assert breaker.state == "closed"
+
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_failures(clock):
+    breaker = CircuitBreaker(threshold=2, clock=clock)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_single_trial(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=10, clock=clock)
+    breaker.failure()
+
+    clock.now = 10
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=10, clock=clock)
+    breaker.failure()
+
+    clock.now = 15
+    assert breaker.allow()
+    breaker.failure()
+
+    assert breaker.state == "open"
+    clock.now = 24
+    assert not breaker.allow()
+    clock.now = 25
+    assert breaker.allow()
+
+
+def test_abandoned_trial_allows_another(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=10, clock=clock)
+    breaker.failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.abandon()
+
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker(threshold=0)
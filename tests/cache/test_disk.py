@@ -0,0 +1,149 @@
+import fcntl
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import sleep
+from time import time
+
+import pytest
+
+from delicacy.cache.disk import digest
+from delicacy.cache.disk import DiskCache
+from delicacy.cache.disk import STALE_TEMP
+from delicacy.cache.disk import TEMP_PREFIX
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path, 100, suffix=".png")
+
+
+def age(path, seconds):
+    stamp = time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_digest_is_stable():
+    assert digest((1, "phrase", None)) == digest((1, "phrase", None))
+    assert digest((1, "phrase", None)) != digest((1, "phrase", "None"))
+    assert digest(("ab", "c")) != digest(("a", "bc"))
+
+
+def test_put_get(cache, tmp_path):
+    assert cache.get(("a",)) is None
+
+    path = cache.put(("a",), b"data")
+    name = digest(("a",))
+
+    assert cache.get(("a",)) == path
+    assert path == tmp_path / "v1" / name[:2] / name[2:4] / f"{name}.png"
+    assert path.read_bytes() == b"data"
+    assert not [p for p in path.parent.iterdir() if p.name.startswith(TEMP_PREFIX)]
+
+
+def test_put_replaces(cache):
+    cache.put(("a",), b"old")
+    path = cache.put(("a",), b"new")
+
+    assert path.read_bytes() == b"new"
+
+
+def test_get_marks_used(cache):
+    path = cache.put(("a",), b"data")
+    age(path, 1000)
+
+    cache.get(("a",))
+
+    assert time() - path.stat().st_mtime < 100
+
+
+def test_evict_least_recently_used(cache):
+    paths = {key: cache.put((key,), b"x" * 40) for key in "abc"}
+    age(paths["a"], 300)
+    age(paths["b"], 100)
+    age(paths["c"], 200)
+
+    freed = cache.evict()
+
+    # 120 bytes over a budget of 100, down to at most 90
+    assert freed == 40
+    assert [key for key, path in paths.items() if path.exists()] == ["b", "c"]
+
+
+def test_evict_within_budget(cache):
+    cache.put(("a",), b"x" * 40)
+
+    assert cache.evict() == 0
+    assert cache.get(("a",)) is not None
+
+
+def test_evict_stale_temp_files(cache):
+    path = cache.put(("a",), b"data")
+    stale = path.parent / f"{TEMP_PREFIX}dead"
+    fresh = path.parent / f"{TEMP_PREFIX}writing"
+    stale.write_bytes(b"x" * 10)
+    fresh.write_bytes(b"x" * 10)
+    age(stale, STALE_TEMP + 1)
+
+    assert cache.evict() == 10
+    assert not stale.exists() and fresh.exists() and path.exists()
+
+
+def test_evict_skipped_while_locked(cache):
+    for key in "abcd":
+        cache.put((key,), b"x" * 40)
+
+    with open(cache.root / ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert cache.evict() == 0
+
+    assert cache.evict() > 0
+
+
+def test_eviction_thread(cache):
+    for key in "abcd":
+        cache.put((key,), b"x" * 40)
+
+    cache.start_eviction(0.01)
+    try:
+        deadline = time() + 5
+        while len(list(cache._files())) > 2 and time() < deadline:
+            sleep(0.01)
+    finally:
+        cache.stop_eviction()
+
+    assert len(list(cache._files())) == 2
+
+
+def test_invalid_capacity(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCache(tmp_path, 0)
+
+
+def write_and_evict(root, worker: int) -> int:
+    cache = DiskCache(root, 2000)
+    for i in range(50):
+        # workers share half of their keys
+        key = ("shared", i) if i % 2 else (worker, i)
+        data = bytes([worker]) * 100
+        cache.put(key, data)
+        if (path := cache.get(key)) is not None:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue  # evicted by another worker since, a miss
+            assert data in {bytes([w]) * 100 for w in range(4)}
+        cache.evict()
+    return worker
+
+
+def test_processes_share_store(tmp_path):
+    with ProcessPoolExecutor(4) as pool:
+        workers = pool.map(write_and_evict, [tmp_path] * 4, range(4))
+        assert sorted(workers) == [0, 1, 2, 3]
+
+    cache = DiskCache(tmp_path, 2000)
+    cache.evict()
+    sizes = [entry.stat().st_size for entry in cache._files()]
+
+    assert sum(sizes) <= 2000
+    assert all(size == 100 for size in sizes)
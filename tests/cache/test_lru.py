@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+from delicacy.cache.lru import hit_ratio
+from delicacy.cache.lru import hits_total
+from delicacy.cache.lru import LRUCache
+from delicacy.cache.lru import weight
+
+
+def test_get_put():
+    cache = LRUCache("test-get-put", 2)
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert "a" in cache and len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_ratio == 0.5
+    assert hit_ratio.value("test-get-put") == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache("test-evict", 2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_weighted_capacity():
+    cache = LRUCache("test-weighted", 10, weigh=len)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"x" * 4)
+    cache.put("c", b"x" * 4)
+
+    assert list(cache._entries) == ["b", "c"]
+    assert cache.weight == 8
+    assert weight.value("test-weighted") == 8
+
+    # heavier than the whole cache, never stored
+    cache.put("d", b"x" * 11)
+    assert "d" not in cache and cache.weight == 8
+
+
+def test_replace_updates_weight():
+    cache = LRUCache("test-replace", 10, weigh=len)
+    cache.put("a", b"x" * 4)
+    cache.put("a", b"x" * 6)
+
+    assert cache.get("a") == b"x" * 6
+    assert cache.weight == 6
+
+
+def test_disabled():
+    cache = LRUCache("test-disabled", 0)
+    cache.put("a", 1)
+
+    assert len(cache) == 0
+    assert cache.get_or_create("a", lambda: 2) == 2
+
+
+def test_negative_capacity():
+    with pytest.raises(ValueError):
+        LRUCache("test-negative", -1)
+
+
+def test_get_or_create():
+    cache = LRUCache("test-get-or-create", 4)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    before = hits_total.value("test-get-or-create")
+
+    assert cache.get_or_create("key", factory) == "value"
+    assert cache.get_or_create("key", factory) == "value"
+    assert len(calls) == 1
+    assert hits_total.value("test-get-or-create") == before + 1
+
+
+def test_get_or_create_error_not_cached():
+    cache = LRUCache("test-error", 4)
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("key", lambda: (_ for _ in ()).throw(RuntimeError()))
+
+    assert "key" not in cache
+
+
+def test_clear():
+    cache = LRUCache("test-clear", 4)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0 and cache.weight == 0
+    assert cache.hits == cache.misses == 0
+
+
+def test_concurrent_puts_stay_in_budget():
+    cache = LRUCache("test-concurrent", 50)
+
+    def fill(offset):
+        for i in range(1000):
+            cache.put(offset + i, i)
+            cache.get(offset + i // 2)
+
+    threads = [threading.Thread(target=fill, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == cache.weight == 50
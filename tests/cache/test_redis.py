@@ -0,0 +1,229 @@
+import asyncio
+import socket
+
+import pytest
+
+from delicacy.cache.backend import backend_from_url
+from delicacy.cache.backend import NullBackend
+from delicacy.cache.breaker import CircuitBreaker
+from delicacy.cache.redis import ConnectionPool
+from delicacy.cache.redis import failures_total
+from delicacy.cache.redis import RedisBackend
+from delicacy.cache.redis import skipped_total
+from delicacy.cache.resp import RESPError
+from delicacy.cache.standin import StandInServer
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def backend_for(server: StandInServer, **kwds) -> RedisBackend:
+    pool = ConnectionPool("127.0.0.1", server.port, size=kwds.pop("size", 2))
+    return RedisBackend(pool, **kwds)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_get_set():
+    async def main():
+        async with StandInServer() as server:
+            backend = backend_for(server)
+            missing = await backend.get("key")
+            await backend.set("key", b"\x89PNG")
+            found = await backend.get("key")
+            await backend.close()
+            return missing, found, server.data
+
+    missing, found, data = run(main())
+
+    assert missing is None
+    assert found == b"\x89PNG"
+    assert b"delicacy:key" in data
+
+
+def test_set_ttl():
+    clock = [0.0]
+
+    async def main():
+        async with StandInServer(clock=lambda: clock[0]) as server:
+            backend = backend_for(server)
+            await backend.set("key", b"value", ttl=1.5)
+            before = await backend.get("key")
+            clock[0] = 1.5
+            after = await backend.get("key")
+            await backend.close()
+            return before, after, server.commands
+
+    before, after, commands = run(main())
+
+    assert (before, after) == (b"value", None)
+    assert commands[0] == [b"SET", b"delicacy:key", b"value", b"PX", b"1500"]
+
+
+def test_get_many_pipelined():
+    async def main():
+        async with StandInServer() as server:
+            backend = backend_for(server)
+            await backend.set("a", b"1")
+            await backend.set("c", b"3")
+            values = await backend.get_many(["a", "b", "c"])
+            empty = await backend.get_many([])
+            await backend.close()
+            return values, empty, server.connections
+
+    values, empty, connections = run(main())
+
+    assert values == [b"1", None, b"3"]
+    assert empty == []
+    # every call went over the one pooled connection
+    assert connections == 1
+
+
+def test_pool_bounds_connections():
+    async def main():
+        async with StandInServer(delay=0.01) as server:
+            backend = backend_for(server, size=2, timeout=1)
+            await asyncio.gather(*(backend.get(f"k{i}") for i in range(10)))
+            await backend.close()
+            return server.connections
+
+    assert run(main()) == 2
+
+
+def test_select_db():
+    async def main():
+        async with StandInServer() as server:
+            pool = ConnectionPool("127.0.0.1", server.port, db=3)
+            backend = RedisBackend(pool)
+            await backend.get("key")
+            await backend.close()
+            return server.commands[0]
+
+    assert run(main()) == [b"SELECT", b"3"]
+
+
+def test_set_error_reply_is_a_failure():
+    before = failures_total.value("RESPError")
+
+    async def main():
+        async with StandInServer() as server:
+            server.handle = lambda request: RESPError("OOM out of memory")
+            breaker = CircuitBreaker(threshold=1, reset_after=60)
+            backend = backend_for(server, breaker=breaker)
+            await backend.set("key", b"value")
+            await backend.close()
+            return breaker.state
+
+    assert run(main()) == "open"
+    assert failures_total.value("RESPError") == before + 1
+
+
+def test_cancelled_trial_does_not_wedge_breaker():
+    async def main():
+        async with StandInServer(delay=0.2) as server:
+            breaker = CircuitBreaker(threshold=1, reset_after=0)
+            breaker.failure()
+            backend = backend_for(server, timeout=1, breaker=breaker)
+
+            # the half-open trial, cancelled while waiting for the server
+            trial = asyncio.create_task(backend.get("key"))
+            await asyncio.sleep(0.05)
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+            server.delay = 0
+            await backend.set("key", b"value")
+            value = await backend.get("key")
+            await backend.close()
+            return value, breaker.state
+
+    assert run(main()) == (b"value", "closed")
+
+
+def test_slow_server_opens_breaker():
+    before = skipped_total.value("shared")
+
+    async def main():
+        async with StandInServer(delay=0.2) as server:
+            breaker = CircuitBreaker(threshold=2, reset_after=60)
+            backend = backend_for(server, timeout=0.01, breaker=breaker)
+
+            start = asyncio.get_running_loop().time()
+            values = [await backend.get("key") for _ in range(5)]
+            elapsed = asyncio.get_running_loop().time() - start
+
+            await backend.close()
+            return values, elapsed, breaker.state
+
+    values, elapsed, state = run(main())
+
+    assert values == [None] * 5
+    assert state == "open"
+    # two timeouts, then the breaker answers at once
+    assert elapsed < 0.15
+    assert skipped_total.value("shared") == before + 3
+
+
+def test_unreachable_server():
+    async def main():
+        pool = ConnectionPool("127.0.0.1", free_port())
+        backend = RedisBackend(pool, timeout=0.5, breaker=CircuitBreaker(threshold=1))
+        value = await backend.get("key")
+        await backend.set("key", b"value")
+        return value, backend.breaker.state
+
+    assert run(main()) == (None, "open")
+
+
+def test_recovers_after_reset():
+    async def main():
+        async with StandInServer(delay=0.05) as server:
+            breaker = CircuitBreaker(threshold=1, reset_after=0.1)
+            backend = backend_for(server, timeout=0.01, breaker=breaker)
+            await backend.set("key", b"value")
+            assert await backend.get("key") is None
+
+            server.delay = 0
+            await asyncio.sleep(0.15)
+            value = await backend.get("key")
+            await backend.close()
+            return value, breaker.state
+
+    value, state = run(main())
+
+    # the timed out SET still reached the server
+    assert value == b"value"
+    assert state == "closed"
+
+
+def test_backend_from_url(monkeypatch):
+    monkeypatch.setattr("delicacy.config.CACHE_TIMEOUT", 0.2)
+
+    assert isinstance(backend_from_url(""), NullBackend)
+
+    backend = backend_from_url("redis://cache.internal:6380/2")
+    assert isinstance(backend, RedisBackend)
+    assert (backend.pool.host, backend.pool.port, backend.pool.db) == (
+        "cache.internal",
+        6380,
+        2,
+    )
+    assert backend.timeout == 0.2
+
+    with pytest.raises(ValueError):
+        backend_from_url("memcached://cache:11211")
+
+
+def test_null_backend():
+    async def main():
+        backend = NullBackend()
+        await backend.set("key", b"value")
+        return await backend.get("key"), await backend.get_many(["a", "b"])
+
+    assert run(main()) == (None, [None, None])
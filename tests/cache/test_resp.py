@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from delicacy.cache.resp import encode_command
+from delicacy.cache.resp import encode_reply
+from delicacy.cache.resp import ProtocolError
+from delicacy.cache.resp import read_reply
+from delicacy.cache.resp import RESPError
+
+
+def parse(data: bytes):
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_reply(reader)
+
+    return asyncio.run(main())
+
+
+def test_encode_command():
+    assert encode_command("SET", "key", b"v\r\n", 10) == (
+        b"*4\r\n$3\r\nSET\r\n$3\r\nkey\r\n$3\r\nv\r\n\r\n$2\r\n10\r\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "reply",
+    (None, b"", b"bulk\r\nwith newline", "OK", 42, -1, [b"a", None, [1, "OK"]], []),
+)
+def test_roundtrip(reply):
+    assert parse(encode_reply(reply)) == reply
+
+
+def test_error_reply():
+    error = parse(encode_reply(RESPError("ERR wrong")))
+
+    assert isinstance(error, RESPError)
+    assert str(error) == "ERR wrong"
+
+
+def test_null_array():
+    assert parse(b"*-1\r\n") is None
+
+
+@pytest.mark.parametrize("data", (b"?what\r\n", b"$abc\r\n", b":1.5\r\n"))
+def test_protocol_error(data):
+    with pytest.raises(ProtocolError):
+        parse(data)
+
+
+def test_truncated():
+    with pytest.raises(EOFError):
+        parse(b"$10\r\nshort")
+
+
+def test_encode_unsupported():
+    with pytest.raises(ValueError):
+        encode_reply(1.5)  # type: ignore
@@ -0,0 +1,191 @@
+import fcntl
+import os
+import select
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+
+import pytest
+
+from delicacy.cache.shm import HEADER_SIZE
+from delicacy.cache.shm import key_digest
+from delicacy.cache.shm import SharedTable
+from delicacy.cache.shm import SLOT
+
+
+@pytest.fixture
+def table(tmp_path):
+    table = SharedTable(tmp_path / "table", buckets=8, ways=2, slot_size=1024)
+    yield table
+    table.close()
+
+
+def value_for(key: int, version: int = 0) -> bytes:
+    # different lengths per key, content derived from both
+    seed = sha256(f"{key}-{version}".encode()).digest()
+    return seed * (1 + (key * 7 + version) % 20)
+
+
+def test_put_get(table):
+    assert table.get(("a",)) is None
+    assert table.put(("a",), b"value")
+    assert table.get(("a",)) == b"value"
+
+
+def test_overwrite(table):
+    table.put(("a",), b"old value")
+    table.put(("a",), b"new")
+
+    assert table.get(("a",)) == b"new"
+
+
+def test_too_large(table):
+    assert not table.put(("a",), b"x" * (table.max_value_size + 1))
+    assert table.put(("a",), b"x" * table.max_value_size)
+
+
+def test_shared_between_instances(tmp_path):
+    first = SharedTable(tmp_path / "table", buckets=8)
+    second = SharedTable(tmp_path / "table", buckets=8)
+
+    first.put(("a",), b"value")
+    assert second.get(("a",)) == b"value"
+
+    first.close()
+    second.close()
+
+
+def test_geometry_mismatch(tmp_path):
+    SharedTable(tmp_path / "table", buckets=8).close()
+
+    with pytest.raises(ValueError):
+        SharedTable(tmp_path / "table", buckets=16)
+
+
+@pytest.mark.parametrize(
+    "kwds", (dict(buckets=0), dict(buckets=1, ways=0), dict(buckets=1, slot_size=8))
+)
+def test_invalid_geometry(tmp_path, kwds):
+    with pytest.raises(ValueError):
+        SharedTable(tmp_path / "table", **kwds)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    table = SharedTable(tmp_path / "table", buckets=1, ways=2, slot_size=256)
+    table.put(("a",), b"a")
+    table.put(("b",), b"b")
+    table.get(("a",))
+    table.put(("c",), b"c")
+
+    assert table.get(("a",)) == b"a"
+    assert table.get(("b",)) is None
+    assert table.get(("c",)) == b"c"
+    table.close()
+
+
+def slot_of(table, key):
+    digest = key_digest(key)
+    for offset in range(HEADER_SIZE, table.size, table.slot_size):
+        if SLOT.unpack_from(table._map, offset)[2] == digest:
+            return offset
+    raise LookupError(key)
+
+
+def test_partial_write_is_a_miss(table):
+    table.put(("a",), b"complete value")
+    offset = slot_of(table, ("a",))
+
+    # a writer died after marking the slot and writing half the value
+    (seq,) = struct.unpack_from("<Q", table._map, offset)
+    struct.pack_into("<Q", table._map, offset, seq + 1)
+    table._map[offset + SLOT.size : offset + SLOT.size + 4] = b"XXXX"
+
+    assert table.get(("a",)) is None
+
+    # the next write reuses the slot and completes it
+    assert table.put(("a",), b"rewritten")
+    assert table.get(("a",)) == b"rewritten"
+    (after,) = struct.unpack_from("<Q", table._map, offset)
+    assert after % 2 == 0
+
+
+def test_corrupt_value_is_a_miss(table):
+    table.put(("a",), b"complete value")
+    offset = slot_of(table, ("a",))
+    table._map[offset + SLOT.size] ^= 0xFF
+
+    assert table.get(("a",)) is None
+
+
+def test_contended_bucket_is_skipped(table, tmp_path):
+    # another process holding every bucket, emulated by a child holding the lock;
+    # one pipe each way, so neither side reads back its own byte
+    locked_r, locked_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(locked_r)
+        os.close(release_w)
+        fd = os.open(table.path, os.O_RDWR)
+        fcntl.lockf(fd, fcntl.LOCK_EX, 0, HEADER_SIZE, os.SEEK_SET)
+        os.write(locked_w, b"1")
+        # returns empty as well if the parent goes away
+        os.read(release_r, 1)
+        os._exit(0)
+
+    os.close(locked_w)
+    os.close(release_r)
+    try:
+        ready, _, _ = select.select([locked_r], [], [], 10)
+        assert ready and os.read(locked_r, 1) == b"1", "child never took the lock"
+        assert not table.put(("a",), b"value")
+    finally:
+        os.write(release_w, b"1")
+        os.close(release_w)
+        os.close(locked_r)
+        os.waitpid(pid, 0)
+
+    # the lock went away with the process
+    assert table.put(("a",), b"value")
+
+
+KEYS = 24
+ROUNDS = 400
+
+
+def hammer(path, worker: int) -> tuple[int, int]:
+    table = SharedTable(path, buckets=4, ways=2, slot_size=1024)
+    hits = torn = 0
+
+    for i in range(ROUNDS):
+        key = (i * 7 + worker) % KEYS
+        version = i % 3
+        table.put((key,), value_for(key, version))
+
+        for other in range(KEYS):
+            value = table.get((other,))
+            if value is None:
+                continue
+            hits += 1
+            if value not in {value_for(other, v) for v in range(3)}:
+                torn += 1
+
+    table.close()
+    return hits, torn
+
+
+def test_processes_hammering_same_keys(tmp_path):
+    path = tmp_path / "table"
+    SharedTable(path, buckets=4, ways=2, slot_size=1024).close()
+
+    with ProcessPoolExecutor(4) as pool:
+        results = list(pool.map(hammer, [path] * 4, range(4)))
+
+    assert all(torn == 0 for _, torn in results)
+    assert all(hits > 0 for hits, _ in results)
+
+    table = SharedTable(path, buckets=4, ways=2, slot_size=1024)
+    for key in range(KEYS):
+        value = table.get((key,))
+        assert value is None or value in {value_for(key, v) for v in range(3)}
+    table.close()
@@ -0,0 +1,163 @@
+import asyncio
+import sys
+
+import pytest
+from PIL import ImageChops
+
+from delicacy.config import COLLECTION_DIR
+from delicacy.create import background_cache
+from delicacy.create import create
+from delicacy.create import create_remote
+from delicacy.igen.collection import Collection
+from delicacy.igen.igen import ImageGenerator
+from delicacy.raster.client import RasterClient
+from delicacy.raster.client import RasterError
+from delicacy.raster.client import RasterizerCrashed
+from delicacy.raster.protocol import Raster
+from delicacy.saturn.saturn import Reah
+from delicacy.svglib.utils.quality import HIGH
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.utils import get_canvas
+
+# a worker with a stand-in renderer: it answers with a width x height raster,
+# where width is the SVG length and height the quality's supersampling,
+# fails on b"fail" and crashes on b"crash"
+FAKE_WORKER = """
+import os
+from delicacy.raster.protocol import Raster
+from delicacy.saturn.saturn import Reah
+from delicacy.svglib.utils.quality import HIGH
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.raster import worker
+
+def render(svg, background, quality):
+    if svg == b"crash":
+        os._exit(3)
+    if svg == b"fail":
+        raise ValueError("cannot render")
+    width, height = len(svg), quality.supersample
+    return Raster(width, height, bytes(4 * width * height))
+
+worker.main(render)
+"""
+FAKE_ARGV = (sys.executable, "-c", FAKE_WORKER)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_rasterize():
+    async def main():
+        async with RasterClient(workers=1) as client:
+            return await client.rasterize(get_canvas(64, 32), "#09132b")
+
+    raster = run(main())
+
+    assert isinstance(raster, Raster)
+    assert (raster.width, raster.height) == (64, 32)
+    assert len(raster.pixels) == 64 * 32 * 4
+    assert raster.to_pil().size == (64, 32)
+
+
+def test_pipelining():
+    svgs = [b"x" * n for n in range(1, 33)]
+
+    async def main():
+        async with RasterClient(workers=2, argv=FAKE_ARGV) as client:
+            return await asyncio.gather(*(client.rasterize_bytes(s) for s in svgs))
+
+    rasters = run(main())
+
+    assert [r.width for r in rasters] == [len(s) for s in svgs]
+
+
+def test_render_error():
+    async def main():
+        async with RasterClient(workers=1, argv=FAKE_ARGV) as client:
+            with pytest.raises(RasterError) as err:
+                await client.rasterize_bytes(b"fail")
+            assert str(err.value) == "cannot render"
+
+            # the worker keeps serving after a failed render
+            return await client.rasterize_bytes(b"ok")
+
+    assert run(main()).width == 2
+
+
+def test_quality():
+    async def main():
+        async with RasterClient(workers=1, argv=FAKE_ARGV) as client:
+            high = await client.rasterize_bytes(b"x", quality=HIGH)
+            with pytest.raises(RasterError) as err:
+                await client.rasterize_bytes(b"x", quality=Quality("ultra"))
+            return high, str(err.value)
+
+    high, err = run(main())
+
+    assert high.height == HIGH.supersample
+    assert err == "unknown quality: ultra"
+
+
+def test_crash_isolation():
+    async def main():
+        async with RasterClient(workers=1, argv=FAKE_ARGV) as client:
+            jobs = [client.rasterize_bytes(s) for s in (b"a", b"crash", b"bc")]
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+
+            # the crashed worker is replaced on the next request
+            after = await client.rasterize_bytes(b"abc")
+            return results, after, client.restarts
+
+    (first, crashed, queued), after, restarts = run(main())
+
+    assert first.width == 1
+    assert isinstance(crashed, RasterizerCrashed)
+    # jobs queued behind the crashing one fail too, nothing else does
+    assert isinstance(queued, RasterizerCrashed)
+    assert after.width == 3
+    assert restarts == 1
+
+
+def test_restart_after_max_jobs():
+    async def main():
+        async with RasterClient(workers=1, max_jobs=2, argv=FAKE_ARGV) as client:
+            pids = []
+            for n in range(1, 6):
+                assert (await client.rasterize_bytes(b"x" * n)).width == n
+                pids.append(client.workers[0].proc.pid)
+            return pids, client.restarts
+
+    pids, restarts = run(main())
+
+    assert restarts == 2
+    assert len(set(pids)) == 3
+
+
+@pytest.mark.parametrize(("workers", "max_jobs"), ((0, 1), (1, 0)))
+def test_client_fail(workers, max_jobs):
+    with pytest.raises(ValueError):
+        RasterClient(workers, max_jobs)
+
+
+@pytest.mark.parametrize("tile", (None, 64))
+@pytest.mark.parametrize("quality", (STANDARD, HIGH))
+def test_create_remote(tile, quality):
+    gen = ImageGenerator(Collection("Cat", COLLECTION_DIR / "cat"))
+    options = dict(tile=tile, quality=quality)
+
+    async def main():
+        async with RasterClient(workers=1) as client:
+            return await create_remote("phrase", Reah, gen, client, 128, 128, **options)
+
+    background_cache.clear()
+    remote = run(main())
+    background_cache.clear()
+    local = create("phrase", Reah, gen, 128, 128, **options)
+
+    diff = ImageChops.difference(remote.convert("RGBA"), local.convert("RGBA"))
+
+    assert remote.size == (128, 128)
+    assert max(high for _, high in diff.getextrema()) <= 1
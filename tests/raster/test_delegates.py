@@ -0,0 +1,120 @@
+from unittest import mock
+
+import pytest
+
+from delicacy import config
+from delicacy.raster.delegates import CANDIDATES
+from delicacy.raster.delegates import current_delegate
+from delicacy.raster.delegates import DelegateReport
+from delicacy.raster.delegates import detect
+from delicacy.raster.delegates import evaluate
+from delicacy.raster.delegates import reference_canvases
+from delicacy.raster.delegates import renders_correctly
+from delicacy.raster.delegates import select_delegate
+from delicacy.raster.worker import render
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import use_svg_format
+
+
+@pytest.fixture(autouse=True)
+def restore_delegate():
+    yield
+    use_svg_format("svg")
+
+
+def test_detect():
+    found = detect()
+
+    assert found
+    assert set(found).issubset(CANDIDATES)
+
+
+def test_at_least_one_delegate_correct():
+    assert any(renders_correctly(name) for name in detect())
+
+
+def test_unknown_delegate_incorrect():
+    assert not renders_correctly("no-such-reader")
+
+
+def test_reference_canvases():
+    assert len(reference_canvases(64)) == len(MakerDict)
+
+
+def test_evaluate_incorrect():
+    report = evaluate("no-such-reader", [])
+
+    assert not report.correct
+    assert report.seconds == float("inf")
+
+
+def test_select_auto(monkeypatch):
+    monkeypatch.setattr(config, "SVG_DELEGATE", "auto")
+
+    selected = select_delegate()
+
+    assert selected in detect()
+    assert current_delegate() == selected
+
+
+def test_select_auto_prefers_fastest_correct():
+    reports = {
+        name: (name != "svg", float(i)) for i, name in enumerate(reversed(CANDIDATES))
+    }
+
+    def fake_evaluate(name, canvases):
+        correct, seconds = reports[name]
+        return DelegateReport(name, correct, seconds)
+
+    with (
+        mock.patch("delicacy.raster.delegates.detect", return_value=CANDIDATES),
+        mock.patch("delicacy.raster.delegates.evaluate", side_effect=fake_evaluate),
+        mock.patch("delicacy.raster.delegates.reference_canvases", return_value=[]),
+    ):
+        selected = select_delegate("auto")
+
+    correct = {n: s for n, (c, s) in reports.items() if c}
+    assert selected == min(correct, key=correct.get)
+
+
+@pytest.mark.parametrize("override", ("msvg", "MSVG"))
+def test_select_override(override):
+    with mock.patch("delicacy.raster.delegates.detect", return_value=CANDIDATES):
+        assert select_delegate(override) == "msvg"
+    assert current_delegate() == "msvg"
+
+
+def test_select_override_unavailable(caplog):
+    report = DelegateReport("svg", True, 1.0)
+
+    with (
+        mock.patch("delicacy.raster.delegates.detect", return_value=("svg",)),
+        mock.patch("delicacy.raster.delegates.evaluate", return_value=report),
+        mock.patch("delicacy.raster.delegates.reference_canvases", return_value=[]),
+    ):
+        selected = select_delegate("rsvg")
+
+    assert selected == current_delegate() == "svg"
+    assert "rsvg (DELICACY_SVG_DELEGATE) is not available" in caplog.text
+
+
+def test_materialize_uses_selected_delegate():
+    use_svg_format("msvg")
+
+    with mock.patch("delicacy.svglib.utils.utils.WandImage.Image") as image:
+        materialize(get_canvas())
+
+    assert image.call_args.kwargs["format"] == "msvg"
+
+
+def test_worker_uses_selected_delegate():
+    use_svg_format("msvg")
+
+    with mock.patch("delicacy.raster.worker.WandImage.Image") as image:
+        render(b"<svg/>", None, STANDARD)
+
+    img = image.return_value.__enter__.return_value
+    assert img.read.call_args.kwargs["format"] == "msvg"
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from delicacy.deadline import Deadline
+from delicacy.deadline import RenderCancelled
+from delicacy.metrics import exposition
+from delicacy.raster import pool as raster_pool
+from delicacy.raster.pool import MiB
+from delicacy.raster.pool import RasterPool
+from delicacy.raster.pool import SlotLimits
+from delicacy.svglib.utils.utils import get_canvas
+
+
+def test_process_limits():
+    limits = SlotLimits(threads=2, memory=64 * MiB, area=1000)
+
+    assert limits.process_limits(slots=3) == dict(
+        thread=2, area=1000, memory=192 * MiB, map=384 * MiB
+    )
+
+
+@pytest.mark.parametrize("field", ("threads", "memory", "area"))
+def test_invalid_limits(field):
+    with pytest.raises(ValueError):
+        SlotLimits(**{field: 0})
+
+
+def test_invalid_slots():
+    with pytest.raises(ValueError):
+        RasterPool(slots=0)
+
+
+def test_configure():
+    limits = {}
+    with mock.patch.object(raster_pool, "resource_limits", limits):
+        RasterPool(2, SlotLimits(threads=1, memory=MiB, area=10)).configure()
+
+    assert limits == dict(thread=1, area=10, memory=2 * MiB, map=4 * MiB)
+
+
+def test_slots_bound_concurrency():
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_materialize(*args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return args
+
+    pool = RasterPool(slots=2)
+    jobs = raster_pool.jobs_total.value()
+
+    with mock.patch.object(raster_pool, "materialize", fake_materialize):
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(lambda _: pool.materialize(get_canvas()), range(8))
+            )
+
+    assert len(results) == 8
+    assert peak == 2
+    assert raster_pool.jobs_total.value() == jobs + 8
+    assert raster_pool.queue_depth.value() == 0
+    assert raster_pool.busy_slots.value() == 0
+
+
+def test_deadline_while_waiting():
+    pool = RasterPool(slots=1)
+
+    with pool.slot():
+        with pytest.raises(RenderCancelled) as err:
+            with pool.slot(Deadline(0.05)):
+                pass  # pragma: no cover
+
+    assert err.value.reason == "timeout"
+    assert raster_pool.queue_depth.value() == 0
+
+    # the slot is free again
+    with pool.slot():
+        pass
+
+
+def test_pool_metrics_exposed():
+    text = exposition()
+
+    assert "# TYPE delicacy_raster_queue_depth gauge" in text
+    assert "# TYPE delicacy_raster_jobs_total counter" in text
@@ -0,0 +1,108 @@
+from itertools import product
+from random import Random
+
+import numpy as np
+import pytest
+
+from delicacy.saturn.arrays import array_rng
+from delicacy.saturn.arrays import fade_array
+from delicacy.saturn.arrays import linear_plane_array
+from delicacy.saturn.arrays import rand_plane_array
+from delicacy.saturn.arrays import sorted_randspace_array
+from delicacy.saturn.arrays import spreadit_array
+from delicacy.saturn.helpers import linear_plane
+from delicacy.saturn.helpers import make_shape
+from delicacy.svglib.elements.peripheral.transform import Transform
+
+
+def test_array_rng_reproducible():
+    first = array_rng(Random(0)).random(10)
+    second = array_rng(Random(0)).random(10)
+
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.parametrize(
+    ("seed", "start", "stop", "k"),
+    product((0, 1), (0, 32), (256, 512), range(5, 30, 10)),
+)
+def test_sorted_randspace_array(seed, start, stop, k):
+    s1 = sorted_randspace_array(np.random.default_rng(seed), start, stop, k)
+    s2 = sorted_randspace_array(np.random.default_rng(seed), start, stop, k)
+
+    # reproducibility
+    assert np.array_equal(s1, s2)
+    assert len(s1) == k
+    assert np.all(np.diff(s1) >= 0)
+    assert np.all((start <= s1) & (s1 <= stop))
+
+
+def test_sorted_randspace_array_segments():
+    ks = [2, 4, 6]
+    space = sorted_randspace_array(np.random.default_rng(0), 0, 512, ks)
+
+    assert len(space) == sum(ks)
+    for segment in np.split(space, np.cumsum(ks)[:-1]):
+        assert np.all(np.diff(segment) >= 0)
+
+
+@pytest.mark.parametrize("k", (0, -1, [2, 0]))
+def test_sorted_randspace_array_fail(k):
+    with pytest.raises(ValueError):
+        sorted_randspace_array(np.random.default_rng(0), k=k)
+
+
+@pytest.mark.parametrize(("x", "y", "range"), ((10, 20, (1, 256)), (20, 10, (2, 512))))
+class TestPlaneArray:
+    def test_linear_plane_array(self, x, y, range):
+        plane = linear_plane_array(range, range, x, y)
+        expected = tuple(linear_plane(range, range, x, y))
+
+        assert plane.shape == (x * y, 2)
+        assert tuple(map(tuple, plane.tolist())) == expected
+
+    @pytest.mark.parametrize("rate", (0.25, 0.75, 1))
+    def test_rand_plane_array(self, x, y, range, rate):
+        args = (range, range, x, y, rate)
+        first = rand_plane_array(np.random.default_rng(0), *args)
+        second = rand_plane_array(np.random.default_rng(0), *args)
+
+        assert np.array_equal(first, second)
+
+        plane = set(linear_plane(range, range, x, y))
+        assert set(map(tuple, first.tolist())).issubset(plane)
+
+        if rate == 1:
+            assert len(first) == x * y
+
+
+@pytest.mark.parametrize("rate", (-1, 0, 1.1))
+def test_rand_plane_array_fail(rate):
+    with pytest.raises(ValueError):
+        rand_plane_array(np.random.default_rng(0), rate=rate)
+
+
+@pytest.mark.parametrize(("k", "spread"), ((2, (5, 20)), (4, (10, 20)), (6, (15, 20))))
+def test_spreadit_array(k, spread):
+    spr = spreadit_array(np.random.default_rng(k), spread, k)
+
+    assert spr.shape == (k, 2)
+    assert np.all(spr[0] == 0)
+
+    steps = np.abs(spr[1:]) // np.arange(1, k)[:, np.newaxis]
+    assert np.all((spread[0] <= steps) & (steps < spread[1]))
+
+
+@pytest.mark.parametrize(
+    ("option", "num", "location"),
+    product(("rec", "cir", "tri", "xsh"), range(2, 4), product((0, 1), repeat=2)),
+)
+def test_fade_array(option, num, location):
+    elm = make_shape(option=option)
+    gen = np.random.default_rng(0)
+    faded = fade_array(gen, elm, "black", 0.2, num=num, location=location, rotate=90)
+
+    assert len(faded.base) == num + 1
+
+    expected = Transform().translate(*location).scale(0.2).rotate(90)
+    assert faded.base.attrib["transform"] == expected()
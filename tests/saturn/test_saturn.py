@@ -1,10 +1,17 @@
+from random import Random
+
 import pytest
 from cytoolz.functoolz import identity
 from lxml.etree import tostring
 
 from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import emit_reah
 from delicacy.saturn.saturn import MakerDict
+from delicacy.saturn.saturn import Mimas
+from delicacy.saturn.saturn import Reah
 from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import wand2pil
+from delicacy.svglib.writer import SVGWriter
 
 
 @pytest.mark.parametrize("maker", MakerDict.values())
@@ -25,11 +32,48 @@ class TestBGMakerReproducibility:
         assert tostring(first_bg) == tostring(second_bg)
         assert materialize(first_bg) == materialize(second_bg)
 
+    @pytest.mark.parametrize("tile", (64, 128))
+    def test_bgmaker_tile(self, maker, tile):
+        first_bg = BackgroundMaker(maker, seed=0).make(2048, 512, tile=tile)
+        second_bg = BackgroundMaker(maker, seed=0).make(2048, 512, tile=tile)
+
+        assert tostring(first_bg) == tostring(second_bg)
+        assert first_bg.get("width") == first_bg.get("height") == str(tile)
+
+        group, *uses = first_bg
+        assert group.tag == "g"
+        assert len(uses) == 8
+
     def test_bgmaker_from_phrase_fail(self, maker):
         with pytest.raises(ValueError):
             BackgroundMaker.from_phrase("*" * 33, maker)
 
 
+@pytest.mark.parametrize("maker", (Reah, Mimas))
+def test_bgmaker_tile_seam(maker):
+    tile = 256
+    canvas = BackgroundMaker(maker, seed=0).make(tile=tile)
+
+    with materialize(canvas, "#09132b") as raster:
+        image = wand2pil(raster)
+
+    # a row of lines straddles the seam, so the rows on either side match
+    top = image.crop((0, 0, tile, 1)).tobytes()
+    bottom = image.crop((0, tile - 1, tile, tile)).tobytes()
+    assert top == bottom
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("periodic", (False, True))
+def test_emit_reah(seed, periodic):
+    colors = ("#76f70c", "#09132b", "#ced5e5")
+    writer = SVGWriter(320, 200)
+    emit_reah(writer, 320, 200, colors, Random(seed), periodic=periodic)
+
+    canvas = Reah(320, 200, colors, Random(seed), periodic=periodic)
+    assert writer.getvalue() == tostring(canvas)
+
+
 def test_bgmaker_create_fail():
     with pytest.raises(ValueError):
         BackgroundMaker(identity)
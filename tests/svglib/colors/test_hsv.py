@@ -1,6 +1,13 @@
+from itertools import product
+from random import Random
+
+import numpy as np
 import pytest
 
+from delicacy.svglib.colors.hsv import hsv_array_to_hex
+from delicacy.svglib.colors.hsv import hsv_array_to_rgb
 from delicacy.svglib.colors.hsv import HSVColor
+from delicacy.svglib.colors.hsv import to_hex_many
 
 
 @pytest.mark.parametrize(
@@ -47,3 +54,53 @@ def test_create_hsv_fail(argument):
     with pytest.raises(ValueError) as err:
         HSVColor(0, 0, argument)
     assert str(err.value) == "invalid value, must be in [0, 100]"
+
+
+def reference_hex(colors):
+    return [HSVColor(*c).to_hex() for c in colors]
+
+
+def test_hsv_array_to_hex_grid():
+    # every hue, every 5th saturation and value, including both ends
+    grid = list(product(range(360), range(0, 101, 5), range(0, 101, 5)))
+    assert hsv_array_to_hex(grid) == reference_hex(grid)
+
+
+def test_hsv_array_unnormalized():
+    rng = Random(0)
+    floats = [
+        (rng.uniform(-1e6, 1e6), rng.uniform(0, 100), rng.uniform(0, 100))
+        for _ in range(100)
+    ]
+    huge = [(rng.getrandbits(256), rng.randint(0, 100), 100) for _ in range(100)]
+
+    assert hsv_array_to_hex(floats) == reference_hex(floats)
+    # hues beyond int64 stay Python ints in an object array
+    assert hsv_array_to_hex(np.array(huge, dtype=object)) == reference_hex(huge)
+
+
+def test_hsv_array_to_rgb():
+    colors = [(0, 0, 0), (120, 100, 100), (359, 37, 58)]
+    rgb = hsv_array_to_rgb(colors)
+
+    assert rgb.dtype == np.uint8
+    assert rgb.tolist() == [list(HSVColor(*c).to_rgb()) for c in colors]
+
+
+@pytest.mark.parametrize(
+    ("color", "msg"),
+    (
+        ((0, 101, 0), "invalid saturation, must be in [0, 100]"),
+        ((0, 0, -1), "invalid value, must be in [0, 100]"),
+    ),
+)
+def test_hsv_array_fail(color, msg):
+    with pytest.raises(ValueError) as err:
+        hsv_array_to_rgb([(0, 0, 0), color])
+    assert str(err.value) == msg
+
+
+def test_to_hex_many():
+    colors = [HSVColor(h, 50, 50) for h in range(0, 360, 7)]
+    assert to_hex_many(colors) == tuple(reference_hex(colors))
+    assert to_hex_many([]) == ()
@@ -166,3 +166,12 @@ def test_palette_fail():
         PaletteGenerator(identity, Random(0))
 
     assert str(err.value) == "not a valid palette function"
+
+
+@pytest.mark.parametrize("func", Palettes)
+@pytest.mark.parametrize("seed", range(3))
+def test_palette_gen_hex_matches_to_hex(func, seed):
+    colors = PaletteGenerator(func, seed).generate(8)
+    hexes = PaletteGenerator(func, seed).generate(8, to_hex=True)
+
+    assert hexes == tuple(c.to_hex() for c in colors)
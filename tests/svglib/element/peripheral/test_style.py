@@ -1,3 +1,4 @@
+import pickle
 from itertools import product
 
 import pytest
@@ -91,3 +92,53 @@ class TestInvalidOption:
     def test_fill_invalid_rule(self, option):
         with pytest.raises(ValueError):
             Fill(rule=option)
+
+
+@pytest.mark.parametrize("style", (Stroke, Fill))
+def test_style_interned(style):
+    assert style("red", 0.5) is style("red", 0.5)
+    assert style(color="red") is style(color="red")
+    assert style("red") is not style("blue")
+
+
+def test_style_interned_by_type():
+    # 1 and 1.0 are equal but serialize differently
+    assert (
+        str(Stroke(opacity=1)) == "stroke: black; stroke-opacity: 1; stroke-width: 1;"
+    )
+    assert str(Stroke(opacity=1.0)) == (
+        "stroke: black; stroke-opacity: 1.0; stroke-width: 1;"
+    )
+
+
+def test_style_unhashable_arguments():
+    color = ["red"]
+    stroke = Stroke(color)  # type: ignore
+    assert stroke.color is color
+    assert stroke is not Stroke(color)  # type: ignore
+
+
+def test_style_validator_error_propagates():
+    # hashable arguments a validator rejects are not retried uncached
+    with pytest.raises(TypeError) as err:
+        Stroke(opacity="opaque")  # type: ignore
+    assert err.value.__context__ is None
+
+
+def test_style_cached_serialization():
+    stroke = Stroke("red", width=2)
+    assert str(stroke) is str(stroke)
+
+    style_dict = stroke.to_dict()
+    style_dict["stroke"] = "blue"
+    # the cached dict is not exposed to callers
+    assert stroke.to_dict()["stroke"] == "red"
+
+
+def test_style_pickle():
+    stroke = Stroke("red", 0.5, 2, "round")
+    str(stroke)
+    restored = pickle.loads(pickle.dumps(stroke))
+
+    assert restored == stroke
+    assert str(restored) == str(stroke)
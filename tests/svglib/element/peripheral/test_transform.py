@@ -1,3 +1,9 @@
+from math import cos
+from math import radians
+from math import sin
+from math import tan
+
+import numpy as np
 import pytest
 
 from delicacy.svglib.elements.peripheral.transform import Transform
@@ -83,4 +89,82 @@ def test_chained_ops(transform):
     assert isinstance(transform, Transform)
 
     expected = "translate(5,0) rotate(45) scale(0.5,0.5) skewX(4) skewY(4) matrix(0,1,2,3,4,5)"  # noqa
-    assert transform() == expected
+    assert transform(verbose=True) == expected
+
+
+def reference(verbose: str) -> np.ndarray:
+    """the 3x3 matrix of a verbose transform, one operation at a time"""
+
+    result = np.identity(3)
+    for op in verbose.split():
+        name, args = op.rstrip(")").split("(")
+        vals = [float(v) for v in args.split(",")]
+
+        if name == "translate":
+            m = [[1, 0, vals[0]], [0, 1, vals[1]]]
+        elif name == "scale":
+            m = [[vals[0], 0, 0], [0, vals[1], 0]]
+        elif name == "rotate":
+            t = radians(vals[0])
+            cx, cy = vals[1:] or (0, 0)
+            c, s = cos(t), sin(t)
+            m = [[c, -s, cx - c * cx + s * cy], [s, c, cy - s * cx - c * cy]]
+        elif name == "skewX":
+            m = [[1, tan(radians(vals[0])), 0], [0, 1, 0]]
+        elif name == "skewY":
+            m = [[1, 0, 0], [tan(radians(vals[0])), 1, 0]]
+        else:
+            a, b, c, d, e, f = vals
+            m = [[a, c, e], [b, d, f]]
+
+        result = result @ np.vstack((m, (0, 0, 1)))
+    return result
+
+
+def folded(transform: Transform) -> np.ndarray:
+    text = transform()
+    assert text.startswith("matrix(")
+    a, b, c, d, e, f = map(float, text[len("matrix(") : -1].split(","))
+    return np.array([[a, c, e], [b, d, f], [0, 0, 1]])
+
+
+@pytest.mark.parametrize(
+    "build",
+    (
+        lambda t: t.translate(5).rotate(45).scale(0.5).skewX(4).skewY(4),
+        lambda t: t.translate(120, 48).scale(0.2).rotate(207),
+        lambda t: t.rotate(30, 10, 20).translate(-3, 7),
+        lambda t: t.scale(2, 3).matrix(*range(6)).translate(1),
+        lambda t: t.translate(256, 256).scale(1.5).rotate(-90).scale(-1, 1),
+    ),
+)
+def test_folded_matrix_equivalent(transform, build):
+    transform = build(transform)
+    expected = reference(transform(verbose=True))
+
+    np.testing.assert_allclose(folded(transform), expected, atol=1e-6)
+    np.testing.assert_allclose(
+        np.array(transform.affine)[[0, 2, 4, 1, 3, 5]].reshape(2, 3),
+        expected[:2],
+        atol=1e-9,
+    )
+
+
+def test_single_op_not_folded(transform):
+    assert transform.rotate(30, 1, 2)() == "rotate(30,1,2)"
+
+
+def test_empty_transform(transform):
+    assert transform() == ""
+    assert transform.affine == (1, 0, 0, 1, 0, 0)
+
+
+def test_apply(transform):
+    transform = transform.translate(10, 20).rotate(90).scale(2)
+
+    x, y = transform.apply(1, 0)
+    assert (x, y) == pytest.approx((10, 22))
+
+    xs, ys = transform.apply(np.array([0, 1]), np.array([0, 0]))
+    np.testing.assert_allclose(xs, (10, 10), atol=1e-9)
+    np.testing.assert_allclose(ys, (20, 22), atol=1e-9)
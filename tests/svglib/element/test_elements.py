@@ -130,6 +130,14 @@ def test_set_style_existing_stroke(toy):
 def test_add_transform(toy):
     transform = Transform().translate(5).rotate(45).scale(5)
     toy.add_transform(transform)
+    expected = "matrix(3.535534,3.535534,-3.535534,3.535534,5,0)"
+
+    assert toy.base.get("transform") == expected
+
+
+def test_add_transform_verbose(toy):
+    transform = Transform().translate(5).rotate(45).scale(5)
+    toy.add_transform(transform, verbose=True)
     expected = "translate(5,0) rotate(45) scale(5,5)"
 
     assert toy.base.get("transform") == expected
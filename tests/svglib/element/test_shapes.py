@@ -175,3 +175,54 @@ def test_create_xshape_with_style():
         style="stroke: black; stroke-opacity: 1; stroke-width: 1; fill: none; fill-opacity: 1;",  # noqa
     )
     assert str(x) == to_string(expected)
+
+
+def test_path_from_commands():
+    commands = [
+        ("M", 0, 0),
+        ("l", 10, 10),
+        ("Q", 1, 2, 3, 4),
+        ("a", 5, 5, 0, 1, 0, 1, 1),
+    ]
+    path = Path.from_commands([*commands, ("z",)])
+
+    expected = Path().M(0, 0).l(10, 10).Q(1, 2, 3, 4).a(5, 5, 0, 1, 0, 1, 1).z()
+
+    assert isinstance(path, Path)
+    assert str(path) == str(expected)
+    assert path.d == "M0,0 l10,10 Q1,2 3,4 a5,5 0 1,0 1,1 z"
+
+
+def test_path_from_commands_unknown():
+    with pytest.raises(ValueError):
+        Path.from_commands([("M", 0, 0), ("X", 1, 1)])
+
+
+def test_path_flush_on_read():
+    path = Path().M(0, 0)
+    base = path.base
+    assert base.get("d") == "M0,0"
+
+    # commands added after a read are appended to the same element
+    path.L(1, 1)
+    assert path.get("d") == "M0,0 L1,1"
+    assert base.get("d") == "M0,0 L1,1"
+
+
+def test_path_commands_after_attach():
+    group = Element("g")
+    path = Path().M(0, 0)
+    group.append(path.base)
+
+    # the group is serialized without going through path
+    path.L(1, 1).z()
+    assert tostring(group) == b'<g><path d="M0,0 L1,1 z"/></g>'
+
+
+def test_path_set_d():
+    path = Path().M(0, 0)
+    path.set("d", "M1,1")
+    assert path.d == "M1,1"
+
+    path.L(2, 2)
+    assert path.d == "M1,1 L2,2"
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.saturn.saturn import Reah
+from delicacy.svglib.display import CIRCLE
+from delicacy.svglib.display import DisplayList
+from delicacy.svglib.display import LINE
+from delicacy.svglib.display import PATH
+from delicacy.svglib.display import RECT
+from delicacy.svglib.elements.element import defs
+from delicacy.svglib.elements.element import group
+from delicacy.svglib.elements.peripheral.style import Fill
+from delicacy.svglib.elements.peripheral.style import Stroke
+from delicacy.svglib.elements.peripheral.transform import Transform
+from delicacy.svglib.elements.shapes import Circle
+from delicacy.svglib.elements.shapes import ETriangle
+from delicacy.svglib.elements.shapes import Line
+from delicacy.svglib.elements.shapes import Rectangle
+from delicacy.svglib.elements.use import Use
+from delicacy.svglib.utils.utils import get_canvas
+
+STROKE = "stroke: red; stroke-opacity: 1; stroke-width: 1;"
+
+
+def test_emit():
+    display = DisplayList(100, 50)
+    display.line(0, 1, 2, 3, Stroke("red"))
+    display.circle(5, 10, 10, Stroke("red"))
+    display.rect(1, 2, 3, 4, transform=Transform().translate(5, 5))
+    display.path("M0,0 L1,1 Z")
+
+    assert len(display) == 4
+    assert list(display.kinds) == [LINE, CIRCLE, RECT, PATH]
+    assert display.coords_array().shape == (4, 4)
+    # styles are stored once
+    assert display.styles == [STROKE]
+    assert list(display.style_ids) == [0, 0, -1, -1]
+    assert list(display.transform_ids) == [-1, -1, 0, -1]
+
+    svg = display.to_svg()
+    assert svg.startswith(
+        b'<svg xmlns:xlink="http://www.w3.org/1999/xlink" width="100"'
+    )
+    assert b'<line x1="0" y1="1" x2="2" y2="3" style="stroke: red;' in svg
+    assert b'<circle cx="10" cy="10" r="5"' in svg
+    assert (
+        b'<rect x="1" y="2" width="3" height="4" transform="matrix(1,0,0,1,5,5)"/>'
+        in svg
+    )
+    assert b'<path d="M0,0 L1,1 Z"/>' in svg
+
+
+def test_from_canvas_resolves_use():
+    canvas = get_canvas(64, 64)
+    circle = Circle.make_circle(4, 0, 0)
+    canvas.append(defs(group(circle, id="dot")).base)
+
+    use = Use("dot", (10, 20))  # type: ignore
+    use.apply_styles(Stroke("red"), Fill("blue"))
+    use.add_transform(Transform().scale(2))
+    canvas.append(use.base)
+
+    display = DisplayList.from_canvas(canvas)
+    (primitive,) = display
+
+    assert primitive.kind == CIRCLE
+    assert primitive.coords == (0, 0, 4, 0)
+    assert primitive.style == f"{Stroke('red')} {Fill('blue')}"
+    # scale(2) then the use's own x, y offset
+    assert primitive.transform == (2, 0, 0, 2, 20, 40)
+
+
+def test_from_canvas_nested_styles_and_transforms():
+    canvas = get_canvas(64, 64)
+    line = Line.make_line(0, 0, 1, 1)
+    line.apply_styles(Stroke("blue"))
+    outer = group(group(line))
+    outer.apply_styles(Stroke("red", width=3))
+    outer.add_transform(Transform().translate(5, 6))
+    canvas.append(outer.base)
+
+    (primitive,) = DisplayList.from_canvas(canvas)
+
+    # the element's own declarations come last, so they win
+    assert primitive.style == f"{Stroke('red', width=3)} {Stroke('blue')}"
+    assert primitive.transform == (1, 0, 0, 1, 5, 6)
+
+
+def test_from_canvas_unsupported():
+    canvas = get_canvas()
+    canvas.append(get_canvas())
+    canvas[0].tag = "text"
+
+    with pytest.raises(ValueError):
+        DisplayList.from_canvas(canvas)
+
+
+def test_round_trip():
+    canvas = get_canvas(128, 128)
+    for element in (
+        Line.make_line(0, 1.5, 2, 3),
+        Rectangle.make_rectangle(0, 0, 16, 8),
+        ETriangle(side=30, styless=False),
+    ):
+        canvas.append(element.base)
+
+    display = DisplayList.from_canvas(canvas)
+    again = DisplayList.from_canvas(display.to_canvas())
+
+    assert list(again) == list(display)
+    assert again.to_svg() == display.to_svg()
+
+
+def test_replay_scaled():
+    display = DisplayList(512, 256)
+    display.line(0, 0, 512, 256)
+
+    canvas = display.to_canvas(128, 128)
+
+    assert (canvas.get("width"), canvas.get("height")) == ("128", "128")
+    assert canvas[0].get("transform") == "scale(0.25,0.5)"
+    assert len(canvas[0]) == 1
+
+
+@pytest.mark.parametrize("name", MakerDict)
+def test_record_makers(name):
+    maker = MakerDict[name]
+    display = BackgroundMaker(maker, seed=0).record(size=256)
+    drawn = len(display)
+    assert drawn > 0
+    assert (display.width, display.height) == (256, 256)
+    # kind, four float64 coordinates, style and transform indices
+    assert display.nbytes == drawn * (1 + 4 * 8 + 4 + 4)
+
+    replayed = DisplayList.from_canvas(display.to_canvas(64, 64))
+    assert len(replayed) == drawn
+    np.testing.assert_array_equal(replayed.kinds, display.kinds)
+
+
+def test_record_emits_directly():
+    display = BackgroundMaker(Reah, seed=0).record(size=256)
+    canvas = BackgroundMaker(Reah, seed=0).make(256, 256)
+    expected = DisplayList.from_canvas(canvas)
+
+    assert len(display) == len(expected) > 0
+    np.testing.assert_array_equal(display.kinds, expected.kinds)
+    np.testing.assert_array_equal(display.coords_array(), expected.coords_array())
+    assert display.styles == expected.styles
+    np.testing.assert_array_equal(display.style_ids, expected.style_ids)
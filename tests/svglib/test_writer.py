@@ -0,0 +1,103 @@
+import pytest
+from lxml.etree import SubElement
+from lxml.etree import tostring
+
+from delicacy.svglib.elements.element import defs
+from delicacy.svglib.elements.element import group
+from delicacy.svglib.elements.element import WrappingElement
+from delicacy.svglib.elements.peripheral.style import Fill
+from delicacy.svglib.elements.peripheral.style import Stroke
+from delicacy.svglib.elements.peripheral.transform import Transform
+from delicacy.svglib.elements.shapes import Circle
+from delicacy.svglib.elements.shapes import ETriangle
+from delicacy.svglib.elements.shapes import Line
+from delicacy.svglib.elements.shapes import Rectangle
+from delicacy.svglib.elements.use import Use
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.writer import SVGWriter
+
+STYLES = (Stroke("#76f70c", 0.8, 2.5, "round"), Fill("none"))
+
+
+@pytest.mark.parametrize(
+    ("size", "kwds"),
+    (((512, 512), {}), ((320.5, 100), dict(background_color="black"))),
+    ids=["no-keywords", "with-keywords"],
+)
+def test_empty_canvas(size, kwds):
+    assert SVGWriter(*size, **kwds).getvalue() == tostring(get_canvas(*size, **kwds))
+
+
+def test_primitives():
+    transform = Transform().translate(3, 4).scale(0.5)
+
+    canvas = get_canvas(320, 320)
+    elements = (
+        Circle.make_circle(10, 1.5, 2),
+        Line.make_line(0, 1, 2.25, 3),
+        Rectangle.make_rectangle(0, 0, 120, 60),
+        ETriangle(side=30),
+        Use("shape", (23, 17)),  # type: ignore
+    )
+    for element in elements:
+        element.apply_styles(*STYLES)
+        canvas.append(element.base)
+
+    plain = Circle.make_circle(1, 2, 3)
+    plain.add_transform(transform)
+    canvas.append(plain.base)
+
+    writer = SVGWriter(320, 320)
+    writer.circle(10, 1.5, 2, *STYLES)
+    writer.line(0, 1, 2.25, 3, *STYLES)
+    writer.rect(0, 0, 120, 60, *STYLES)
+    writer.path(ETriangle(side=30).d, *STYLES)
+    writer.use("shape", 23, 17, *STYLES)
+    writer.circle(1, 2, 3, transform=transform)
+
+    assert writer.getvalue() == tostring(canvas)
+
+
+def test_nested_groups():
+    transform = Transform().translate(12, 0).rotate(207)
+
+    canvas = get_canvas()
+    faded = WrappingElement("g")
+    faded.append(defs(group(Circle.make_circle(60, 0, 0), id="cid")))
+    use = Use("cid", (23, 17), (10, 10))  # type: ignore
+    use.apply_styles(*STYLES)
+    faded.append(use)
+    faded.add_transform(transform)
+    canvas.append(faded.base)
+    canvas.append(WrappingElement("g", id="empty").base)
+    SubElement(canvas, "defs")
+
+    writer = SVGWriter()
+    with writer.group(transform=transform):
+        with writer.defs(), writer.group(id="cid"):
+            writer.circle(60, 0, 0)
+        writer.use("cid", 23, 17, *STYLES, size=(10, 10))
+    with writer.group(id="empty"):
+        pass
+    with writer.defs():
+        pass
+
+    assert writer.getvalue() == tostring(canvas)
+
+
+def test_escaping():
+    canvas = get_canvas()
+    SubElement(canvas, "text", note='a < b & "c" > d\n\té')
+
+    writer = SVGWriter()
+    writer.element("text", dict(note='a < b & "c" > d\n\té'))
+
+    assert writer.getvalue() == tostring(canvas)
+
+
+def test_unclosed_fail():
+    writer = SVGWriter()
+    writer.start("g", {})
+
+    with pytest.raises(ValueError):
+        writer.getvalue()
@@ -46,6 +46,14 @@ def test_chainable_result():
     assert test._storage == "starting_method_another"
 
 
+def test_chained_method_metadata():
+    test = Test()
+
+    assert test.method.__name__ == "method"
+    assert test.method.__self__ is test
+    assert test.method.__wrapped__ is Test.method.target
+
+
 def test_disallowed_patching_managed_class():
     # monkey-patch function to the Test class
     Test.patched = chainable(identity)
@@ -0,0 +1,149 @@
+from unittest import mock
+
+import pytest
+from lxml.etree import fromstring
+from lxml.etree import SubElement
+from lxml.etree import tostring
+
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.compact import compact
+from delicacy.svglib.utils.compact import Compaction
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.utils.utils import materialize
+
+KEEP_ALL = Compaction(precision=None, drop_defaults=False, hoist_styles=False)
+
+
+def parse(svg: bytes):
+    return fromstring(svg)
+
+
+@pytest.mark.parametrize(
+    ("precision", "d", "expected"),
+    (
+        (3, "m5,35.0 l2,0 l-1,1.7320508075688767 z", "m5,35 l2,0 l-1,1.732 z"),
+        (1, "M0.25,-0.04 L120,1e-05", "M0.2,0 L120,0"),
+        (0, "M100,10.5 L-0.4,2", "M100,10 L0,2"),
+    ),
+)
+def test_round_numbers(precision, d, expected):
+    canvas = get_canvas()
+    SubElement(canvas, "path", d=d, id="keep-1.23456")
+
+    options = Compaction(precision, drop_defaults=False, hoist_styles=False)
+    path = parse(compact(canvas, options))[0]
+
+    assert path.get("d") == expected
+    # only numeric attributes are rounded
+    assert path.get("id") == "keep-1.23456"
+
+
+def test_round_style_but_not_colors():
+    canvas = get_canvas()
+    style = "stroke: #76f70c; stroke-opacity: 0.6400000000000001; stroke-width: 12.0;"
+    SubElement(canvas, "line", style=style)
+
+    options = Compaction(3, drop_defaults=False, hoist_styles=False)
+    line = parse(compact(canvas, options))[0]
+
+    assert line.get("style") == "stroke:#76f70c;stroke-opacity:0.64;stroke-width:12"
+
+
+def test_drop_defaults():
+    canvas = get_canvas()
+    style = "stroke: red; stroke-opacity: 1; stroke-width: 1; fill: none; fill-opacity: 1.0;"
+    SubElement(canvas, "circle", style=style)
+    SubElement(canvas, "rect", style="fill-opacity: 1;")
+
+    options = Compaction(3, drop_defaults=True, hoist_styles=False)
+    circle, rect = parse(compact(canvas, options))
+
+    assert circle.get("style") == "stroke:red;fill:none"
+    assert rect.get("style") is None
+
+
+def test_keep_defaults_overriding_ancestors():
+    canvas = get_canvas()
+    group = SubElement(canvas, "g", style="stroke-opacity: 0.5;")
+    SubElement(group, "circle", style="stroke-opacity: 1;")
+
+    options = Compaction(3, drop_defaults=True, hoist_styles=False)
+    circle = parse(compact(canvas, options))[0][0]
+
+    assert circle.get("style") == "stroke-opacity:1"
+
+
+def test_keep_defaults_in_referenced_content():
+    canvas = get_canvas()
+    defs = SubElement(canvas, "defs")
+    group = SubElement(defs, "g", id="shape")
+    SubElement(group, "circle", style="stroke-width: 1;")
+    SubElement(canvas, "use", href="#shape", style="stroke-width: 5;")
+
+    options = Compaction(3, drop_defaults=True, hoist_styles=False)
+    circle = parse(compact(canvas, options))[0][0][0]
+
+    assert circle.get("style") == "stroke-width:1"
+
+
+def test_hoist_styles():
+    canvas = get_canvas()
+    for _ in range(3):
+        SubElement(canvas, "circle", style="stroke: red;")
+    for _ in range(2):
+        SubElement(canvas, "rect", style="stroke: blue;")
+    SubElement(canvas, "line", style="stroke: green;")
+
+    style, *circles, rect0, rect1, line = parse(compact(canvas))
+
+    assert style.tag.endswith("style")
+    assert style.text == ".s0{stroke:red}.s1{stroke:blue}"
+    assert all(c.get("class") == "s0" and c.get("style") is None for c in circles)
+    assert rect0.get("class") == rect1.get("class") == "s1"
+    # styles used once stay inline
+    assert line.get("class") is None
+    assert line.get("style") == "stroke:green"
+
+
+@pytest.mark.parametrize("maker", MakerDict.values())
+def test_compact_makers(maker):
+    canvas = BackgroundMaker(maker, seed=0).make()
+    original = tostring(canvas)
+
+    compacted = compact(canvas)
+
+    assert len(compacted) < len(original)
+    # the canvas itself is left untouched
+    assert tostring(canvas) == original
+    # structure is preserved, only a <style> block may be added
+    assert len(parse(compacted)) - len(canvas) in (0, 1)
+
+
+def test_keep_all():
+    canvas = BackgroundMaker(MakerDict["reah"], seed=0).make()
+    compacted = parse(compact(canvas, KEEP_ALL))
+
+    for original, element in zip(
+        canvas.iterdescendants(), compacted.iterdescendants(), strict=True
+    ):
+        # only the whitespace inside style declarations is dropped
+        style = original.get("style")
+        if style is not None:
+            assert element.get("style") == style.replace(" ", "").rstrip(";")
+        assert {**element.attrib, "style": style} == {**original.attrib, "style": style}
+
+
+def test_invalid_precision():
+    with pytest.raises(ValueError):
+        Compaction(precision=-1)
+
+
+def test_materialize_compaction():
+    canvas = get_canvas()
+    SubElement(canvas, "line", x1="0.123456")
+
+    with mock.patch("delicacy.svglib.utils.utils.WandImage.Image") as image:
+        materialize(canvas, compaction=Compaction(precision=2))
+
+    assert image.call_args.kwargs["blob"] == compact(canvas, Compaction(precision=2))
@@ -0,0 +1,63 @@
+import pytest
+from lxml.etree import fromstring
+from lxml.etree import SubElement
+from lxml.etree import tostring
+
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.complexity import scene_stats
+from delicacy.svglib.utils.utils import get_canvas
+
+
+@pytest.fixture
+def canvas():
+    canvas = get_canvas(64, 64)
+    defs = SubElement(canvas, "defs")
+    group = SubElement(defs, "g", id="a")
+    SubElement(group, "circle", r="1")
+    SubElement(canvas, "rect", width="2")
+    for href in ("#a", "#a", "#a", "#b"):
+        SubElement(canvas, "use", href=href)
+    return canvas
+
+
+def test_scene_stats(canvas):
+    stats = scene_stats(canvas)
+
+    assert stats.elements == dict(svg=1, defs=1, g=1, circle=1, rect=1, use=4)
+    assert stats.total_elements == 9
+    assert stats.uses == 4
+    assert stats.max_fanout == 3
+    # svg > defs > g > circle
+    assert stats.max_depth == 4
+    assert stats.serialized_bytes == len(tostring(canvas))
+
+    root = sum(len(k) + len(v) for k, v in canvas.attrib.items())
+    others = len("id") + 1 + len("r") + 1 + len("width") + 1 + 4 * (len("href") + 2)
+    assert stats.attribute_bytes == root + others
+
+
+def test_scene_stats_parsed(canvas):
+    # namespaced tags and xlink:href count the same
+    parsed = fromstring(tostring(canvas).replace(b"href=", b"xlink:href="))
+    stats = scene_stats(parsed, serialized=b"0123")
+
+    assert stats.elements["use"] == 4
+    assert stats.max_fanout == 3
+    assert stats.serialized_bytes == 4
+
+
+def test_scene_stats_empty():
+    stats = scene_stats(get_canvas())
+
+    assert stats.elements == dict(svg=1)
+    assert (stats.uses, stats.max_fanout, stats.max_depth) == (0, 0, 1)
+
+
+@pytest.mark.parametrize("maker", MakerDict.values())
+def test_scene_stats_makers(maker):
+    canvas = BackgroundMaker(maker, seed=0).make(128, 128)
+    stats = scene_stats(canvas)
+
+    assert stats.total_elements == len(list(canvas.iter()))
+    assert stats.serialized_bytes == len(tostring(canvas))
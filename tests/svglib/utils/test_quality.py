@@ -0,0 +1,113 @@
+from unittest import mock
+
+import pytest
+from lxml.etree import tostring
+
+from delicacy.svglib.utils import utils
+from delicacy.svglib.utils.quality import DRAFT
+from delicacy.svglib.utils.quality import get_quality
+from delicacy.svglib.utils.quality import HIGH
+from delicacy.svglib.utils.quality import Quality
+from delicacy.svglib.utils.quality import STANDARD
+from delicacy.svglib.utils.quality import supersampled
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.utils.utils import materialize
+
+
+def test_get_quality():
+    assert get_quality("draft") is DRAFT
+    assert get_quality("standard") is STANDARD
+    assert get_quality("high") is HIGH
+
+    with pytest.raises(ValueError):
+        get_quality("ultra")
+
+
+@pytest.mark.parametrize(
+    "kwds", (dict(supersample=0), dict(filter="gaussian-blur-of-doom"))
+)
+def test_invalid_quality(kwds):
+    with pytest.raises(ValueError):
+        Quality("custom", **kwds)
+
+
+def test_supersampled_restores_canvas():
+    canvas = get_canvas(320, 200)
+    before = tostring(canvas)
+
+    with supersampled(canvas, 3) as scaled:
+        assert scaled.get("width") == "960"
+        assert scaled.get("height") == "600"
+        assert scaled.get("viewBox") == "0 0 320 200"
+
+    assert tostring(canvas) == before
+
+
+def test_supersampled_keeps_view_box():
+    canvas = get_canvas(100, 100)
+    canvas.set("viewBox", "10 10 50 50")
+
+    with supersampled(canvas, 2) as scaled:
+        assert scaled.get("viewBox") == "10 10 50 50"
+
+    assert canvas.get("viewBox") == "10 10 50 50"
+
+
+def test_supersampled_noop():
+    canvas = get_canvas(100, 100)
+
+    with supersampled(canvas, 1) as scaled:
+        assert scaled.get("width") == "100"
+        assert scaled.get("viewBox") is None
+
+
+def test_materialize_standard_reads_directly():
+    canvas = get_canvas(64, 64)
+
+    with mock.patch.object(utils, "WandImage") as wand:
+        materialize(canvas, "#ffffff")
+
+    wand.Image.assert_called_once_with(
+        blob=tostring(canvas), format=utils.svg_format(), background="#ffffff"
+    )
+
+
+def test_materialize_high_supersamples():
+    canvas = get_canvas(64, 48)
+
+    with mock.patch.object(utils, "WandImage") as wand:
+        image = materialize(canvas, "#ffffff", quality=HIGH)
+
+    assert image is wand.Image.return_value
+    assert image.antialias is True
+
+    (_, kwds), *_ = image.read.call_args_list
+    assert b'width="128"' in kwds["blob"]
+    assert b'viewBox="0 0 64 48"' in kwds["blob"]
+    image.resize.assert_called_once_with(64, 48, filter="lanczos")
+
+    # the caller's canvas is left as it was
+    assert canvas.get("width") == "64"
+    assert canvas.get("viewBox") is None
+
+
+def test_materialize_draft_disables_antialias():
+    canvas = get_canvas(64, 64)
+
+    with mock.patch.object(utils, "WandImage") as wand:
+        image = materialize(canvas, quality=DRAFT)
+
+    assert image.antialias is False
+    image.resize.assert_not_called()
+
+
+def test_materialize_closes_on_error():
+    canvas = get_canvas(64, 64)
+
+    with mock.patch.object(utils, "WandImage") as wand:
+        wand.Image.return_value.read.side_effect = RuntimeError("bad svg")
+
+        with pytest.raises(RuntimeError):
+            materialize(canvas, quality=HIGH)
+
+    wand.Image.return_value.close.assert_called_once()
@@ -1,14 +1,23 @@
+from io import BytesIO
+
 import pytest
 from lxml import etree
 from lxml.etree import _Element
 from PIL import Image as PILImage
 from wand import image as WandImage
 
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
 from delicacy.svglib.utils.utils import eprint
 from delicacy.svglib.utils.utils import get_canvas
 from delicacy.svglib.utils.utils import linspace
+from delicacy.svglib.utils.utils import linspace_array
 from delicacy.svglib.utils.utils import materialize
+from delicacy.svglib.utils.utils import materialize_many
+from delicacy.svglib.utils.utils import tile_image
+from delicacy.svglib.utils.utils import tile_raster
 from delicacy.svglib.utils.utils import wand2pil
+from delicacy.svglib.utils.utils import wrap_tile
 
 STANDARD_CANVAS = {
     "width": "512",
@@ -41,6 +50,26 @@ def test_get_canvas(size, kwds):
     assert canvas.attrib == expected
 
 
+def test_wrap_tile():
+    canvas = get_canvas(64, 64)
+    etree.SubElement(canvas, "circle", cx="60", cy="60", r="8")
+    etree.SubElement(canvas, "line", x1="0", y1="0", x2="64", y2="64")
+
+    tile = wrap_tile(canvas, 64)
+    group, *uses = tile
+
+    assert group.tag == "g"
+    assert group.get("id") == "tile"
+    assert [child.tag for child in group] == ["circle", "line"]
+
+    assert len(uses) == 8
+    assert all(use.tag == "use" and use.get("href") == "#tile" for use in uses)
+
+    offsets = {(use.get("x"), use.get("y")) for use in uses}
+    assert ("0", "0") not in offsets
+    assert ("-64", "64") in offsets
+
+
 def test_linspace_empty():
     space = linspace(0, 100, 0)
     assert not list(space)
@@ -73,6 +102,35 @@ def test_linspace(args, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    (
+        ((0, 10, 4), (0.0, 2.5, 5.0, 7.5)),
+        ((1, 10, 3), (1.0, 4.0, 7.0)),
+        ((-1, 0, 1), (-1.0,)),
+    ),
+)
+def test_linspace_periodic(args, expected):
+    result = tuple(linspace(*args, endpoint=False))
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "args", ((1, 10, 5), (0.1, 1.0, 5), (-10, -1, 5), (-1, -0.1, 5), (0, 512, 32))
+)
+@pytest.mark.parametrize("endpoint", (True, False))
+def test_linspace_array(args, endpoint):
+    result = linspace_array(*args, endpoint=endpoint)
+    assert result.tolist() == list(linspace(*args, endpoint=endpoint))
+
+
+@pytest.mark.parametrize(("start", "stop"), ((0, 0), (1, 0)), ids=["equal", "greater"])
+def test_linspace_array_fail_start_stop(start, stop):
+    with pytest.raises(ValueError) as err:
+        linspace_array(start, stop, 10)
+    assert str(err.value) == "start must be less than stop"
+
+
 # use capsys fixture to capture standard output and error
 def test_eprint(capsys):
     root = etree.Element("root")
@@ -96,6 +154,43 @@ def test_materialize():
     assert img.height == int(STANDARD_CANVAS["height"])
 
 
+def test_materialize_many():
+    sizes = ((512, 512), (320, 320), (128, 256))
+    canvases = [get_canvas(*size) for size in sizes]
+    imgs = materialize_many(canvases, "#09132b")
+
+    assert len(imgs) == len(sizes)
+    for img, canvas, size in zip(imgs, canvases, sizes):
+        assert isinstance(img, WandImage.Image)
+        assert img.size == size
+        assert img == materialize(canvas, "#09132b")
+
+
+def test_materialize_many_empty():
+    assert materialize_many([]) == []
+
+
+def test_tile_raster():
+    with materialize(get_canvas(32, 32), "#09132b") as tile:
+        filled = tile_raster(tile, 100, 70)
+
+    assert isinstance(filled, WandImage.Image)
+    assert filled.size == (100, 70)
+
+
+def test_tile_image():
+    tile = PILImage.new("RGBA", (2, 2), "#09132b")
+    tile.putpixel((0, 0), (255, 0, 0, 255))
+    filled = tile_image(tile, 5, 3)
+
+    assert filled.size == (5, 3)
+    assert filled.mode == "RGBA"
+    red = {
+        (x, y) for x in range(5) for y in range(3) if filled.getpixel((x, y))[0] == 255
+    }
+    assert red == {(0, 0), (2, 0), (4, 0), (0, 2), (2, 2), (4, 2)}
+
+
 def test_wand2pil():
     canvas = get_canvas()
     wand_img = materialize(canvas)
@@ -104,3 +199,25 @@ def test_wand2pil():
     assert isinstance(pil_img, PILImage.Image)
     assert pil_img.width == int(STANDARD_CANVAS["width"])
     assert pil_img.height == int(STANDARD_CANVAS["height"])
+
+
+def png_roundtrip(wand_img):
+    # the former wand2pil, kept as the reference
+    return PILImage.open(BytesIO(wand_img.make_blob("png")))
+
+
+@pytest.mark.parametrize("maker", MakerDict.values())
+@pytest.mark.parametrize("background", (None, "#09132b"), ids=["transparent", "opaque"])
+def test_wand2pil_pixel_exact(maker, background):
+    canvas = BackgroundMaker(maker, seed=0).make(96, 64)
+
+    with materialize(canvas, background) as wand_img:
+        expected = png_roundtrip(wand_img).convert("RGBA")
+        depth = wand_img.depth
+        result = wand2pil(wand_img)
+        # the caller's image is left as it was
+        assert wand_img.depth == depth
+
+    assert result.mode in ("RGB", "RGBA")
+    assert result.size == expected.size
+    assert result.convert("RGBA").tobytes() == expected.tobytes()
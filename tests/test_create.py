@@ -0,0 +1,260 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import mock
+
+import pytest
+from PIL import Image as PILImage
+
+from delicacy import create as create_module
+from delicacy.create import combine
+from delicacy.create import create
+from delicacy.create import create_png
+from delicacy.create import InlineExecutor
+from delicacy.create import stage_executor
+from delicacy.deadline import Deadline
+from delicacy.deadline import RenderCancelled
+from delicacy.saturn.saturn import MakerDict
+from delicacy.timing import Timings
+
+SIZE = (32, 24)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    create_module.character_cache.clear()
+    create_module.background_cache.clear()
+
+
+class FakeWand:
+    """the parts of a wand image combine reads"""
+
+    def __init__(self, image: PILImage.Image) -> None:
+        self.image = image
+        self.size = image.size
+        self.alpha_channel = image.mode == "RGBA"
+        self.depth = 8
+        self.closed = False
+
+    def make_blob(self, mode: str) -> bytes:
+        return self.image.convert(mode).tobytes()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.closed = True
+
+
+def gradient(mode: str, size=SIZE) -> PILImage.Image:
+    img = PILImage.new(mode, size)
+    img.putdata(
+        [
+            tuple((x * 7 + y * 3 + band * 50) % 256 for band in range(len(mode)))
+            for y in range(size[1])
+            for x in range(size[0])
+        ]
+    )
+    return img
+
+
+def character(size=SIZE) -> PILImage.Image:
+    img = PILImage.new("RGBA", size)
+    img.paste((200, 10, 10, 128), (4, 4, 20, 16))
+    img.paste((10, 200, 10, 255), (8, 8, 12, 12))
+    return img
+
+
+@pytest.mark.parametrize("mode", ("RGB", "RGBA"))
+def test_combine_matches_paste(mode):
+    background = gradient(mode)
+    expected = background.copy()
+    expected.paste(character(), (0, 0), character())
+
+    result = combine(character(), FakeWand(background))
+
+    assert result.mode == mode
+    assert result.tobytes() == expected.tobytes()
+
+
+def test_combine_reuses_frame():
+    frame = combine(character(), FakeWand(gradient("RGB")))
+    other = gradient("RGB").transpose(PILImage.Transpose.FLIP_LEFT_RIGHT)
+
+    reused = combine(character(), FakeWand(other), frame)
+
+    expected = other.copy()
+    expected.paste(character(), (0, 0), character())
+    assert reused is frame
+    assert reused.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize(("mode", "size"), (("RGBA", SIZE), ("RGB", (16, 16))))
+def test_combine_replaces_mismatched_frame(mode, size):
+    frame = combine(character(), FakeWand(gradient("RGB")))
+
+    result = combine(character(size), FakeWand(gradient(mode, size)), frame)
+
+    assert result is not frame
+    assert (result.mode, result.size) == (mode, size)
+
+
+def test_create_png():
+    gen = mock.Mock()
+    gen.generate.side_effect = lambda *args, **kwds: character()
+    backgrounds = []
+
+    def make_background(*args):
+        backgrounds.append(FakeWand(gradient("RGB")))
+        return backgrounds[-1]
+
+    timings = Timings()
+    with mock.patch.object(create_module, "make_background", make_background):
+        first = create_png("phrase", MakerDict["reah"], gen, *SIZE, timings=timings)
+        second = create_png("phrase", MakerDict["reah"], gen, *SIZE)
+
+    expected = gradient("RGB")
+    expected.paste(character(), (0, 0), character())
+
+    assert first == second
+    with PILImage.open(BytesIO(first)) as img:
+        assert img.tobytes() == expected.tobytes()
+
+    assert all(background.closed for background in backgrounds)
+    assert {"character", "composite", "encode"} <= set(timings.stages)
+
+
+STAGE_SECONDS = 0.2
+
+
+def slow_gen(threads: list):
+    def generate(*args, **kwds):
+        threads.append(threading.current_thread())
+        time.sleep(STAGE_SECONDS)
+        return character()
+
+    return mock.Mock(generate=generate)
+
+
+def slow_background(threads: list, backgrounds: list | None = None):
+    def make_background(*args):
+        threads.append(threading.current_thread())
+        time.sleep(STAGE_SECONDS)
+        wand = FakeWand(gradient("RGB"))
+        if backgrounds is not None:
+            backgrounds.append(wand)
+        return wand
+
+    return make_background
+
+
+def test_create_runs_stages_concurrently():
+    threads: list = []
+
+    with (
+        ThreadPoolExecutor(1) as executor,
+        mock.patch.object(create_module, "make_background", slow_background(threads)),
+    ):
+        start = time.perf_counter()
+        img = create(
+            "phrase", MakerDict["reah"], slow_gen(threads), *SIZE, executor=executor
+        )
+        elapsed = time.perf_counter() - start
+
+    expected = gradient("RGB")
+    expected.paste(character(), (0, 0), character())
+
+    assert img.tobytes() == expected.tobytes()
+    assert len(set(threads)) == 2
+    assert elapsed < STAGE_SECONDS * 1.75
+
+
+def test_create_inline():
+    threads: list = []
+
+    with mock.patch.object(create_module, "make_background", slow_background(threads)):
+        create(
+            "phrase",
+            MakerDict["reah"],
+            slow_gen(threads),
+            *SIZE,
+            executor=InlineExecutor(),
+        )
+
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_stage_executor_config():
+    stage_executor.cache_clear()
+    try:
+        with mock.patch("delicacy.config.STAGE_WORKERS", 0):
+            assert isinstance(stage_executor(), InlineExecutor)
+    finally:
+        stage_executor.cache_clear()
+
+
+def test_character_error_closes_background():
+    backgrounds: list = []
+    gen = mock.Mock()
+    gen.generate.side_effect = RenderCancelled("timeout")
+
+    with (
+        ThreadPoolExecutor(1) as executor,
+        mock.patch.object(
+            create_module, "make_background", slow_background([], backgrounds)
+        ),
+        pytest.raises(RenderCancelled),
+    ):
+        create("phrase", MakerDict["reah"], gen, *SIZE, executor=executor)
+
+    assert backgrounds[0].closed
+
+
+def test_background_error_cancels_character():
+    executor = mock.Mock()
+    deadline = Deadline(10)
+
+    with (
+        mock.patch.object(
+            create_module, "make_background", side_effect=RenderCancelled("timeout")
+        ),
+        pytest.raises(RenderCancelled),
+    ):
+        create(
+            "phrase",
+            MakerDict["reah"],
+            mock.Mock(),
+            deadline=deadline,
+            executor=executor,
+        )
+
+    executor.submit.return_value.cancel.assert_called_once()
+
+
+def test_components_are_cached():
+    gen = mock.Mock()
+    gen.generate.side_effect = lambda *args, **kwds: character()
+    other_gen = mock.Mock()
+    other_gen.generate.side_effect = lambda *args, **kwds: character()
+    backgrounds: list = []
+
+    with mock.patch.object(
+        create_module, "make_background", slow_background([], backgrounds)
+    ):
+        first = create("phrase", MakerDict["reah"], gen, *SIZE)
+        # same phrase and collection, another maker
+        create("phrase", MakerDict["dione"], gen, *SIZE)
+        # same phrase and maker, another collection
+        create("phrase", MakerDict["reah"], other_gen, *SIZE)
+        again = create("phrase", MakerDict["reah"], gen, *SIZE)
+
+    assert gen.generate.call_count == 1
+    assert other_gen.generate.call_count == 1
+    assert len(backgrounds) == 2
+    assert again.tobytes() == first.tobytes()
+
+    character_cache = create_module.character_cache
+    background_cache = create_module.background_cache
+    assert (character_cache.hits, character_cache.misses) == (2, 2)
+    assert (background_cache.hits, background_cache.misses) == (2, 2)
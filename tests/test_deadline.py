@@ -0,0 +1,80 @@
+from random import Random
+
+import pytest
+
+from delicacy.config import COLLECTION_DIR
+from delicacy.deadline import Deadline
+from delicacy.deadline import NO_DEADLINE
+from delicacy.deadline import RenderCancelled
+from delicacy.igen.collection import Collection
+from delicacy.igen.igen import ImageGenerator
+from delicacy.saturn.saturn import BackgroundMaker
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.utils import get_canvas
+from delicacy.svglib.utils.utils import materialize
+
+
+@pytest.fixture
+def expired():
+    return Deadline(0)
+
+
+def test_no_deadline():
+    NO_DEADLINE.check()
+    assert NO_DEADLINE.remaining is None
+
+
+def test_deadline_within_budget():
+    deadline = Deadline(60)
+    deadline.check()
+    assert 0 < deadline.remaining <= 60
+
+
+def test_deadline_timeout(expired):
+    with pytest.raises(RenderCancelled) as err:
+        expired.check()
+    assert err.value.reason == "timeout"
+    assert expired.remaining == 0
+
+
+def test_deadline_cancel():
+    deadline = Deadline()
+    deadline.cancel("disconnected")
+    # the first reason wins
+    deadline.cancel("other")
+
+    with pytest.raises(RenderCancelled) as err:
+        deadline.check()
+    assert err.value.reason == "disconnected"
+
+
+@pytest.mark.parametrize("maker", MakerDict.values())
+def test_maker_cancelled(maker, expired):
+    with pytest.raises(RenderCancelled):
+        BackgroundMaker(maker, seed=0).make(deadline=expired)
+
+
+@pytest.mark.parametrize("maker", MakerDict.values())
+def test_maker_cancelled_midway(maker):
+    class Countdown(Deadline):
+        __slots__ = ("calls",)
+
+        def check(self):
+            self.calls = getattr(self, "calls", 0) + 1
+            if self.calls > 3:
+                self.cancel()
+            super().check()
+
+    with pytest.raises(RenderCancelled):
+        maker(320, 320, ["#000000"], Random(0), deadline=Countdown())
+
+
+def test_generate_cancelled(expired):
+    gen = ImageGenerator(Collection("Cat", COLLECTION_DIR / "cat"))
+    with pytest.raises(RenderCancelled):
+        gen.generate("phrase", deadline=expired)
+
+
+def test_materialize_cancelled(expired):
+    with pytest.raises(RenderCancelled):
+        materialize(get_canvas(), deadline=expired)
@@ -0,0 +1,169 @@
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from delicacy import config
+from delicacy import main
+from delicacy.cache.backend import CacheBackend
+from delicacy.cache.disk import DiskCache
+from delicacy.cache.shm import SharedTable
+from delicacy.main import app
+from delicacy.main import avatar_cache
+from delicacy.main import cancellations
+
+
+class DictBackend(CacheBackend):
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, float | None] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def get_many(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+
+@pytest.fixture
+def client():
+    avatar_cache.clear()
+    return TestClient(app)
+
+
+def test_make_over_budget(client, monkeypatch):
+    monkeypatch.setattr(config, "RENDER_BUDGET", 0)
+    before = cancellations.value("timeout")
+
+    response = client.get("/make/reah", params=dict(phrase="phrase"))
+
+    assert response.status_code == 503
+    assert cancellations.value("timeout") == before + 1
+
+    metrics = client.get("/metrics").text
+    assert 'delicacy_render_cancelled_total{reason="timeout"}' in metrics
+
+
+def test_make_unknown_quality(client):
+    response = client.get("/make/reah", params=dict(phrase="phrase", quality="ultra"))
+
+    assert response.status_code == 422
+
+
+def test_make_cached(client):
+    with mock.patch.object(main, "create_png", return_value=b"png") as create_png:
+        params = dict(phrase="phrase")
+        first = client.get("/make/reah", params=params)
+        second = client.get("/make/reah", params=params)
+        other = client.get("/make/reah", params=dict(params, theme="light"))
+
+    assert create_png.call_count == 2
+    assert first.content == second.content == b"png"
+    assert first.headers["x-cache"] == "miss"
+    assert second.headers["x-cache"] == "hit"
+    assert other.headers["x-cache"] == "miss"
+    assert "server-timing" not in second.headers
+    assert (avatar_cache.hits, avatar_cache.misses) == (1, 2)
+
+
+def test_make_cancelled_not_cached(client, monkeypatch):
+    monkeypatch.setattr(config, "RENDER_BUDGET", 0)
+
+    client.get("/make/reah", params=dict(phrase="phrase"))
+
+    assert len(avatar_cache) == 0
+
+
+def test_make_disk_cache(client, tmp_path, monkeypatch):
+    disk_cache = DiskCache(tmp_path, 2**20, suffix=".png")
+    monkeypatch.setattr(main, "disk_cache", disk_cache)
+    params = dict(phrase="phrase")
+
+    with mock.patch.object(main, "create_png", return_value=b"png") as create_png:
+        miss = client.get("/make/reah", params=params)
+        # as if another worker, or this one after a restart, got the request
+        avatar_cache.clear()
+        disk = client.get("/make/reah", params=params)
+
+    assert create_png.call_count == 1
+    assert miss.headers["x-cache"] == "miss"
+    assert disk.headers["x-cache"] == "disk"
+    assert disk.content == b"png"
+    assert disk.headers["content-type"] == "image/png"
+    # the hit was copied into the memory cache once sent
+    assert len(avatar_cache) == 1
+
+
+def test_make_disk_cache_evicted(client, tmp_path, monkeypatch):
+    disk_cache = DiskCache(tmp_path, 2**20, suffix=".png")
+    monkeypatch.setattr(main, "disk_cache", disk_cache)
+    # found, then evicted by another process before it is served
+    monkeypatch.setattr(disk_cache, "get", lambda key: tmp_path / "evicted.png")
+
+    with mock.patch.object(main, "create_png", return_value=b"png") as create_png:
+        response = client.get("/make/reah", params=dict(phrase="phrase"))
+
+    assert create_png.call_count == 1
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "miss"
+
+
+def test_make_shared_cache(client, monkeypatch):
+    shared = DictBackend()
+    monkeypatch.setattr(main, "shared_cache", shared)
+    monkeypatch.setattr(config, "CACHE_TTL", 60)
+    params = dict(phrase="phrase")
+
+    with mock.patch.object(main, "create_png", return_value=b"png") as create_png:
+        miss = client.get("/make/reah", params=params)
+        # as if another node got the request
+        avatar_cache.clear()
+        hit = client.get("/make/reah", params=params)
+        again = client.get("/make/reah", params=params)
+
+    assert create_png.call_count == 1
+    assert list(shared.data.values()) == [b"png"]
+    assert list(shared.ttls.values()) == [60]
+    assert [r.headers["x-cache"] for r in (miss, hit, again)] == [
+        "miss",
+        "shared",
+        "hit",
+    ]
+    assert hit.content == b"png"
+
+
+def test_make_shm_cache(client, tmp_path, monkeypatch):
+    shm_cache = SharedTable(tmp_path / "table", buckets=4, slot_size=1024)
+    monkeypatch.setattr(main, "shm_cache", shm_cache)
+    params = dict(phrase="phrase")
+
+    with mock.patch.object(main, "create_png", return_value=b"png") as create_png:
+        miss = client.get("/make/reah", params=params)
+        # as if another worker got the request
+        avatar_cache.clear()
+        hit = client.get("/make/reah", params=params)
+
+    shm_cache.close()
+
+    assert create_png.call_count == 1
+    assert (miss.headers["x-cache"], hit.headers["x-cache"]) == ("miss", "shm")
+    assert hit.content == b"png"
+
+
+def test_make_raster_workers(client, monkeypatch):
+    raster_client = object()
+    monkeypatch.setattr(main, "raster_client", raster_client)
+    remote = mock.AsyncMock(return_value=b"png")
+
+    with mock.patch.object(main, "create_remote_png", remote):
+        response = client.get("/make/reah", params=dict(phrase="phrase", tile=64))
+
+    assert response.content == b"png"
+    (phrase, maker, gen, passed), kwds = remote.call_args
+    assert passed is raster_client
+    assert kwds["tile"] == 64
+    assert kwds["quality"].name == "standard"
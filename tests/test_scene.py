@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+
+from delicacy import scene
+from delicacy.create import make_background
+from delicacy.saturn.saturn import MakerDict
+from delicacy.svglib.utils.complexity import SceneStats
+
+STATS = SceneStats(
+    elements=dict(svg=1, line=9, use=2),
+    uses=2,
+    max_fanout=2,
+    max_depth=2,
+    attribute_bytes=100,
+    serialized_bytes=400,
+)
+
+
+@pytest.mark.parametrize(("rate", "expected"), ((0, False), (1, True)))
+def test_should_sample(rate, expected):
+    assert all(scene.should_sample(rate) is expected for _ in range(100))
+
+
+def test_should_sample_config():
+    with mock.patch("delicacy.config.SCENE_SAMPLE_RATE", 1):
+        assert scene.should_sample()
+
+
+def test_record():
+    before = scene.elements_total.value("test-maker")
+    seconds = scene.raster_seconds_total.value("test-maker")
+
+    entry = scene.record("test-maker", STATS, 0.01, 0.25)
+
+    assert scene.history()[-1] == entry
+    assert scene.elements_total.value("test-maker") == before + 12
+    assert scene.raster_seconds_total.value("test-maker") == seconds + 0.25
+
+
+def test_make_background_sampled():
+    maker = MakerDict["reah"]
+    before = scene.sampled_total.value("reah")
+
+    with (
+        mock.patch("delicacy.config.SCENE_SAMPLE_RATE", 1),
+        mock.patch("delicacy.raster.pool.materialize") as materialize,
+    ):
+        make_background("phrase", maker, 64, 64)
+
+    canvas = materialize.call_args.args[0]
+    entry = scene.history()[-1]
+
+    assert scene.sampled_total.value("reah") == before + 1
+    assert entry.maker == "reah"
+    assert entry.stats.total_elements == len(list(canvas.iter()))
+
+
+def test_make_background_not_sampled():
+    before = scene.sampled_total.value("reah")
+
+    with (
+        mock.patch("delicacy.config.SCENE_SAMPLE_RATE", 0),
+        mock.patch("delicacy.raster.pool.materialize"),
+    ):
+        make_background("phrase", MakerDict["reah"], 64, 64)
+
+    assert scene.sampled_total.value("reah") == before
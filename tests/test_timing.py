@@ -0,0 +1,49 @@
+from delicacy.timing import stage_seconds_total
+from delicacy.timing import Timings
+
+
+def test_stage_accumulates():
+    timings = Timings()
+    before = stage_seconds_total.value("test-stage")
+
+    for _ in range(3):
+        with timings.stage("test-stage"):
+            pass
+    timings.add("other", 0.5)
+
+    assert list(timings.stages) == ["test-stage", "other"]
+    assert timings.stages["test-stage"] >= 0
+    assert timings.total == timings.stages["test-stage"] + 0.5
+    assert stage_seconds_total.value("test-stage") >= before
+    assert stage_seconds_total.value("other") >= 0.5
+
+
+def test_stage_records_on_error():
+    timings = Timings()
+
+    try:
+        with timings.stage("failing"):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert "failing" in timings.stages
+
+
+def test_server_timing():
+    timings = Timings()
+    timings.stages.update(raster=0.0125, encode=0.002)
+
+    assert timings.server_timing() == "raster;dur=12.50, encode;dur=2.00"
+
+
+def test_overlapped_stages():
+    timings = Timings()
+    timings.add("character", 0.03, overlapped=True)
+    timings.add("raster", 0.0125)
+    timings.add("join", 0.01)
+
+    assert timings.total == 0.0225
+    assert timings.server_timing() == (
+        'character;dur=30.00;desc="overlapped", raster;dur=12.50, join;dur=10.00'
+    )